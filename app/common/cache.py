@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from cachetools import TTLCache
+
+from app.common.constants import CACHE_STATS_LOG_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCacheBackend:
+    """워커 프로세스 안의 LRU + TTL 캐시. 값은 복사하지 않으므로 읽기 전용으로 다룬다."""
+
+    def __init__(self, maxsize, ttl):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+
+    def delete(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+
+class RemoteCacheBackend:
+    """
+    워커끼리 공유하는 캐시. get/set(ex=)/delete 를 지원하는 redis 호환 클라이언트를 받는다.
+    값은 JSON 으로 저장하므로 JSON 직렬화 가능한 값만 넣는다.
+    """
+
+    def __init__(self, client, ttl, namespace):
+        self.client = client
+        self.ttl = ttl
+        self.namespace = namespace
+
+    def _key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def get(self, key):
+        value = self.client.get(self._key(key))
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key, value):
+        self.client.set(self._key(key), json.dumps(value), ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+
+class ReadThroughCache:
+    """
+    캐시에 없으면 loader 로 읽어 채운다. hit/miss 횟수를 센다.
+    loader 가 None 을 돌려주면 캐시하지 않는다.
+    횟수는 워커마다 따로 세므로 stats_log_interval(초)마다 워커 로그에 남긴다. None 이면 남기지 않는다.
+    """
+
+    def __init__(self, backend, name='cache', stats_log_interval=CACHE_STATS_LOG_INTERVAL_SECONDS):
+        self.backend = backend
+        self.name = name
+        self.stats_log_interval = stats_log_interval
+        self.hits = 0
+        self.misses = 0
+        self._last_logged_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        value = self.backend.get(key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+
+        self._count(hit=False)
+        value = loader()
+        if value is not None:
+            self.backend.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        self.backend.delete(key)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0
+            }
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if not self._should_log_stats():
+                return
+            self._last_logged_at = time.monotonic()
+            hits, misses = self.hits, self.misses
+
+        logger.info(f'cache stats {self.name} (pid {os.getpid()}): hits={hits} misses={misses} '
+                    f'hit_ratio={hits / (hits + misses):.3f}')
+
+    def _should_log_stats(self):
+        if self.stats_log_interval is None:
+            return False
+        return time.monotonic() - self._last_logged_at >= self.stats_log_interval
+
+
+def build_cache_backend(namespace, maxsize, ttl):
+    """
+    CACHE_REDIS_URL 이 설정되어 있으면 워커끼리 공유하는 redis 캐시, 아니면 프로세스 로컬 캐시를 사용한다.
+    """
+    return build_shared_cache_backend(namespace, ttl) or LocalCacheBackend(maxsize=maxsize, ttl=ttl)
+
+
+def build_shared_cache_backend(namespace, ttl):
+    """
+    워커끼리 공유하는 redis 캐시. CACHE_REDIS_URL 이 없으면 None 을 반환한다.
+    무효화가 모든 워커에 바로 보여야 하는 값(폐기된 토큰 등)은 로컬 캐시 대신 이것만 쓴다.
+    """
+    redis_url = os.environ.get('CACHE_REDIS_URL')
+    if not redis_url:
+        return None
+
+    import redis
+    return RemoteCacheBackend(redis.Redis.from_url(redis_url), ttl=ttl, namespace=namespace)
@@ -0,0 +1,56 @@
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+
+from app.common.constants import NOTIFICATION_BATCH_SIZE, NOTIFICATION_WORKER_INTERVAL_SECONDS, \
+    SYNC_CHANGE_LOG_RETENTION_DAYS
+from app.repositories.repository_change_log import ChangeLogRepository
+from app.repositories.repository_trainer_day_occupancy import TrainerDayOccupancyRepository
+from app.services.service_factory import ServiceFactory
+from database import db
+
+
+def register_commands(app):
+    app.cli.add_command(backfill_trainer_day_occupancy)
+    app.cli.add_command(notification_worker)
+    app.cli.add_command(prune_change_log)
+
+
+# 사용법 : flask --app "app:create_app('dev')" backfill-occupancy [--trainer-id 1]
+@click.command('backfill-occupancy')
+@click.option('--trainer-id', type=int, default=None, help='특정 트레이너만 다시 집계')
+@with_appcontext
+def backfill_trainer_day_occupancy(trainer_id):
+    """schedule 테이블로부터 trainer_day_occupancy 를 다시 집계한다."""
+    count = TrainerDayOccupancyRepository(db=db).backfill(trainer_id)
+    click.echo(f'trainer_day_occupancy backfilled: {count} rows')
+
+
+# 사용법 : flask --app "app:create_app('dev')" notification-worker [--once] [--batch-size 500]
+@click.command('notification-worker')
+@click.option('--batch-size', type=int, default=NOTIFICATION_BATCH_SIZE, help='한 번에 발송할 최대 알림 수')
+@click.option('--interval', type=float, default=NOTIFICATION_WORKER_INTERVAL_SECONDS, help='대기열이 비었을 때 대기 시간(초)')
+@click.option('--once', is_flag=True, help='대기열을 한 번만 처리하고 종료')
+@with_appcontext
+def notification_worker(batch_size, interval, once):
+    """notification_outbox 의 대기 중인 푸쉬 알림을 발송한다."""
+    notification_service = ServiceFactory.message_service()
+    while True:
+        processed = notification_service.dispatch_pending(batch_size)
+        if once:
+            click.echo(f'notification dispatched: {processed}')
+            return
+        if processed < batch_size:
+            time.sleep(interval)
+
+
+# 사용법 : flask --app "app:create_app('dev')" prune-change-log [--days 30]
+@click.command('prune-change-log')
+@click.option('--days', type=int, default=SYNC_CHANGE_LOG_RETENTION_DAYS, help='보관 기간(일)')
+@with_appcontext
+def prune_change_log(days):
+    """보관 기간이 지난 change_log(/sync 변경 기록)를 지운다."""
+    count = ChangeLogRepository(db=db).delete_before(datetime.utcnow() - timedelta(days=days))
+    click.echo(f'change_log pruned: {count} rows')
@@ -44,3 +44,51 @@ class Const:
 
 
 const = Const()
+SLOT_MINUTES = 30
+PRESIGNED_URL_EXPIRES_IN = 3600
+# 캐시된 URL 이 만료 직전에 내려가지 않도록 URL 유효 기간보다 짧게 보관
+PRESIGNED_URL_CACHE_TTL = 3000
+PRESIGNED_URL_CACHE_MAXSIZE = 10000
+# 다른 워커에서 업로드된 이미지가 반영되도록 '없음' 결과는 짧게 보관
+IMAGE_MISSING_KEY_CACHE_TTL = 60
+IMAGE_HEAD_OBJECT_CONCURRENCY = 8
+NOTIFICATION_STATUS_PENDING = 'PENDING'
+NOTIFICATION_STATUS_SENT = 'SENT'
+NOTIFICATION_STATUS_FAILED = 'FAILED'
+# firebase send_each 한 번에 보낼 수 있는 최대 메시지 수
+NOTIFICATION_BATCH_SIZE = 500
+NOTIFICATION_MAX_ATTEMPTS = 5
+NOTIFICATION_RETRY_BASE_SECONDS = 30
+NOTIFICATION_WORKER_INTERVAL_SECONDS = 1
+CHANGE_TICKET_PAGE_SIZE = 10
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+# 프로필 이미지 presigned url 도 함께 캐시하므로 PRESIGNED_URL_CACHE_TTL 보다 짧아야 한다.
+TRAINER_PROFILE_CACHE_TTL = 300
+TRAINER_PROFILE_CACHE_MAXSIZE = 10000
+KAKAO_API_BASE_URL = 'https://kapi.kakao.com'
+KAKAO_CONNECT_TIMEOUT_SECONDS = 1
+KAKAO_READ_TIMEOUT_SECONDS = 3
+KAKAO_HTTP_POOL_SIZE = 10
+# 로그인/회원가입 재시도를 흡수할 정도로만 짧게 보관한다. (카카오에서 로그아웃/탈퇴한 토큰이 오래 남지 않도록)
+KAKAO_TOKEN_CACHE_TTL = 60
+KAKAO_TOKEN_CACHE_MAXSIZE = 10000
+# 현재 refresh token jti 캐시. CACHE_REDIS_URL 의 공유 캐시에만 두며, 없으면 매번 DB 를 읽는다.
+REFRESH_TOKEN_CACHE_TTL = 300
+RESOURCE_OWNER_TRAINER = 'trainer'
+RESOURCE_OWNER_USER = 'user'
+SYNC_ENTITY_SCHEDULE = 'schedule'
+SYNC_ENTITY_CHANGE_TICKET = 'change_ticket'
+SYNC_ENTITY_TRAINER_USER = 'trainer_user'
+SYNC_OPERATION_UPSERT = 'UPSERT'
+SYNC_OPERATION_DELETE = 'DELETE'
+SYNC_PAGE_SIZE = 500
+# 이보다 오래된 변경 기록은 prune-change-log 로 지운다. 그 전의 cursor 로 요청하면 410 을 응답한다.
+SYNC_CHANGE_LOG_RETENTION_DAYS = 30
+# /schedules/trainer/<id>/slots 로 한 번에 조회할 수 있는 최대 일수
+SLOT_RANGE_MAX_DAYS = 31
+# 정기 수업 신청(POST /schedules/recurring) 한 번에 만들 수 있는 최대 수업 수
+RECURRING_SCHEDULE_MAX_COUNT = 52
+# lesson_minutes 가 없는(NULL) 트레이너의 수업 시간. 가입 시 기본값과 같다.
+DEFAULT_LESSON_MINUTES = 60
+# ReadThroughCache 의 hit/miss 통계를 워커 로그에 남기는 주기(초)
+CACHE_STATS_LOG_INTERVAL_SECONDS = 600
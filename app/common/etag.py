@@ -0,0 +1,63 @@
+import hashlib
+import hmac
+from functools import wraps
+
+from flask import request, make_response, current_app
+from flask_jwt_extended import get_jwt_identity
+from flask_restx.utils import unpack
+
+from app.services.service_factory import ServiceFactory
+
+# 캐시는 하되 매번 ETag 로 재검증하도록 한다. (로그인한 사용자별 응답이므로 private)
+ETAG_CACHE_CONTROL = 'private, no-cache'
+
+
+def conditional_get(owner_type, id_arg):
+    """
+    트레이너/회원별 응답 버전(ResourceVersion)으로 ETag 를 만들어 If-None-Match 를 처리한다.
+
+    버전이 같으면 조회를 실행하지 않고 304 를 반환한다. (버전 행 하나만 읽는다)
+    ETag 에는 요청 경로와 쿼리 스트링, 토큰의 identity 가 함께 들어가므로 조회 조건이나 사용자가 다르면 맞지 않는다.
+    인증 확인은 하지 않으므로 @jwt_required() 아래에 둔다. 304 는 라우트 본문(소유자 확인)보다 먼저 응답하므로,
+    다른 사용자가 ETag 를 추측해 버전을 알아낼 수 없도록 digest 는 서버 비밀키로 서명한다.
+
+        @jwt_required()
+        @conditional_get(RESOURCE_OWNER_TRAINER, 'trainer_id')
+        def get(self, trainer_id):
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            owner_id = kwargs[id_arg]
+            version = ServiceFactory.resource_version_service().get_version(owner_type, owner_id)
+            etag = _make_etag(owner_type, owner_id, version)
+
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = ETAG_CACHE_CONTROL
+                return response
+
+            data, code, headers = unpack(func(*args, **kwargs))
+            # 실패 응답은 캐시되지 않도록 ETag 를 붙이지 않는다.
+            if code == 200:
+                headers = dict(headers, ETag=f'"{etag}"', **{'Cache-Control': ETAG_CACHE_CONTROL})
+            return data, code, headers
+
+        return wrapper
+
+    return decorator
+
+
+def _make_etag(owner_type, owner_id, version):
+    message = f'{owner_type}|{owner_id}|{version}|{request.full_path}|{_identity()}'
+    digest = hmac.new(current_app.config['JWT_SECRET_KEY'].encode(), message.encode(), hashlib.sha256).hexdigest()[:32]
+    return f'{owner_type}-{owner_id}-{version}-{digest}'
+
+
+def _identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:  # @jwt_required() 가 없는 조회
+        return None
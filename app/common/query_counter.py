@@ -0,0 +1,148 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+QUERY_TIME_HEADER = 'X-Query-Time-Ms'
+QUERY_MAX_REPEAT_HEADER = 'X-Query-Max-Repeat'
+
+# 현재 수집 중인 QueryStats 목록. 요청 단위 수집과 테스트의 query_budget 이 겹칠 수 있다.
+_active_stats = ContextVar('active_query_stats', default=())
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?|:\w+)\s*,?)+\)', re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(statement):
+    # 파라미터 값과 IN 목록 길이가 달라도 같은 쿼리로 묶는다.
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _IN_LIST.sub('IN (?)', statement)
+    return _LITERAL.sub('?', statement)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints = Counter()
+
+    @property
+    def total_time_ms(self):
+        return self.total_time * 1000
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.total_time += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def most_repeated(self):
+        # 반환값: (fingerprint, 실행 횟수). 쿼리가 없으면 (None, 0)
+        if not self.fingerprints:
+            return None, 0
+        return self.fingerprints.most_common(1)[0]
+
+    def summary(self):
+        lines = [f'{self.count} queries, {self.total_time_ms:.1f}ms']
+        for statement, count in self.fingerprints.most_common(5):
+            lines.append(f'  {count}x {statement[:200]}')
+        return '\n'.join(lines)
+
+
+def start_recording():
+    stats = QueryStats()
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    return stats, token
+
+
+def stop_recording(token):
+    _active_stats.reset(token)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_stats.get():
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active_stats = _active_stats.get()
+    if not active_stats:
+        return
+    start_times = conn.info.get('query_start_time')
+    elapsed = time.perf_counter() - start_times.pop() if start_times else 0.0
+    for stats in active_stats:
+        stats.record(statement, elapsed)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries):
+    """
+    블록 안에서 실행된 쿼리 수가 max_queries 를 넘으면 실패한다. 테스트에서 N+1 회귀를 막는 용도.
+
+        with query_budget(3):
+            self.client.get(...)
+    """
+    stats, token = start_recording()
+    try:
+        yield stats
+    finally:
+        stop_recording(token)
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(f'query budget {max_queries} exceeded: {stats.summary()}')
+
+
+def register_query_counter(app):
+    """
+    요청마다 쿼리 수, DB 시간, 반복 실행된 쿼리를 수집한다.
+    QUERY_COUNTER_HEADERS 가 켜져 있으면 응답 헤더로 내려주고, 임계값을 넘는 요청은 경고 로그를 남긴다.
+    """
+    app.config.setdefault('QUERY_COUNTER_HEADERS', False)
+    app.config.setdefault('QUERY_COUNT_WARN_THRESHOLD', 30)
+    app.config.setdefault('QUERY_TIME_WARN_MS', 500)
+    # 같은 쿼리가 이 횟수 이상 반복되면 N+1 로 판단
+    app.config.setdefault('QUERY_REPEAT_WARN_THRESHOLD', 5)
+
+    @app.before_request
+    def start_query_counter():
+        g.query_stats, g.query_stats_token = start_recording()
+
+    @app.after_request
+    def report_query_counter(response):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+
+        repeated_statement, repeat_count = stats.most_repeated()
+        if app.config['QUERY_COUNTER_HEADERS']:
+            response.headers[QUERY_COUNT_HEADER] = str(stats.count)
+            response.headers[QUERY_TIME_HEADER] = f'{stats.total_time_ms:.1f}'
+            response.headers[QUERY_MAX_REPEAT_HEADER] = str(repeat_count)
+
+        if repeat_count >= app.config['QUERY_REPEAT_WARN_THRESHOLD']:
+            logger.warning(f'possible N+1 query: {request.method} {request.path} '
+                           f'repeated {repeat_count}x: {repeated_statement[:200]}')
+        if (stats.count > app.config['QUERY_COUNT_WARN_THRESHOLD']
+                or stats.total_time_ms > app.config['QUERY_TIME_WARN_MS']):
+            logger.warning(f'slow request: {request.method} {request.path} {stats.summary()}')
+        return response
+
+    @app.teardown_request
+    def stop_query_counter(exception=None):
+        token = g.pop('query_stats_token', None)
+        if token is not None:
+            stop_recording(token)
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from database import db
+
+
+# 스케쥴, 변경 티켓, 수업(trainer_user) 변경 기록. /sync 의 cursor 는 change_id 이다.
+# 같은 트레이너/회원의 기록은 ResourceVersion 행 잠금 뒤에 쓰므로 change_id 순서가 커밋 순서와 같다.
+class ChangeLog(db.Model):
+    __table_args__ = (
+        db.Index('ix_change_log_trainer_id_change_id', 'trainer_id', 'change_id'),
+        db.Index('ix_change_log_user_id_change_id', 'user_id', 'change_id'),
+    )
+
+    change_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    trainer_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    entity_type = db.Column(db.String(20), nullable=False)  # SYNC_ENTITY_*
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)  # SYNC_OPERATION_UPSERT, SYNC_OPERATION_DELETE
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -5,6 +5,11 @@ from database import db
 
 
 class ChangeTicket(db.Model):
+    __table_args__ = (
+        # 트레이너/유저별 목록 조회: schedule 조인 후 상태 조건과 created_at 정렬을 인덱스로 처리
+        db.Index('ix_change_ticket_schedule_id_status_created_at', 'schedule_id', 'status', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     schedule_id = db.Column(db.Integer, db.ForeignKey('schedule.schedule_id'), nullable=False)
     change_from = db.Column(db.String(20), nullable=True)
@@ -15,6 +20,7 @@ class ChangeTicket(db.Model):
     as_is_date = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     reject_reason = db.Column(db.String(255), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __init__(self, schedule_id=None,
                  change_from=None,
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from app.common.constants import NOTIFICATION_STATUS_PENDING
+from database import db
+
+
+# 푸쉬 알림 발송 대기열. 비즈니스 변경과 같은 트랜잭션에서 저장되고 notification-worker 가 발송한다.
+class NotificationOutbox(db.Model):
+    __table_args__ = (
+        db.Index('ix_notification_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    notification_outbox_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    title = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.String(255), nullable=False)
+    token = db.Column(db.String(500), nullable=False)  # user/trainer_fcm_token.fcm_token 과 같은 길이
+    data = db.Column(db.Text, nullable=True)  # FCM data payload (JSON 문자열)
+    status = db.Column(db.String(20), nullable=False, default=NOTIFICATION_STATUS_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, title, body, token, data=None):
+        self.title = title
+        self.body = body
+        self.token = token
+        self.data = data
+        self.status = NOTIFICATION_STATUS_PENDING
+        self.attempts = 0
+        self.created_at = datetime.utcnow()
+        self.next_attempt_at = self.created_at
@@ -0,0 +1,9 @@
+from database import db
+
+
+# 트레이너/회원별 조회 응답의 버전. 스케쥴, 변경 티켓 등 조회 결과가 바뀌는 쓰기에서 1씩 올린다.
+# 폴링 조회의 ETag 를 만들 때 실제 조회 대신 이 행 하나만 읽는다.
+class ResourceVersion(db.Model):
+    owner_type = db.Column(db.String(10), primary_key=True)  # RESOURCE_OWNER_TRAINER, RESOURCE_OWNER_USER
+    owner_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
@@ -1,10 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app.common.constants import SCHEDULE_CANCELLED
 from database import db
 
 
 class Schedule(db.Model):
+    __table_args__ = (
+        # 캘린더 조회는 trainer_user 단위로 기간(schedule_start_time) 범위 검색을 한다.
+        db.Index('ix_schedule_trainer_user_id_schedule_start_time', 'trainer_user_id', 'schedule_start_time'),
+    )
+
     schedule_id = db.Column(db.Integer, primary_key=True)
     trainer_user_id = db.Column(db.Integer, db.ForeignKey('trainer_user.trainer_user_id'), nullable=False)
     schedule_start_time = db.Column(db.DateTime)
     schedule_status = db.Column(db.String(20))
     schedule_delete_flag = db.Column(db.Boolean, default=False)
-    change_ticket = db.relationship('ChangeTicket', backref='schedule', lazy=True)
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_ticket = db.relationship('ChangeTicket', backref='schedule', lazy=True)
+
+    # 트레이너의 시간을 차지하는 스케쥴. 충돌 검사와 예약 현황(trainer_day_occupancy) 집계가 같은 기준을 쓴다.
+    # 변경(MODIFIED)된 스케쥴도 옮겨 간 시간에 수업이 있으므로 포함하고, 취소되거나 삭제된 스케쥴만 제외한다.
+    def is_occupying(self):
+        return self.schedule_status != SCHEDULE_CANCELLED and not self.schedule_delete_flag
+
+    @classmethod
+    def occupying_condition(cls):
+        return and_(or_(cls.schedule_status.is_(None), cls.schedule_status != SCHEDULE_CANCELLED),
+                    cls.schedule_delete_flag == False)
@@ -1,8 +1,3 @@
-from sqlalchemy import and_, func, literal_column
-
-from app.entities.entity_trainer_user import TrainerUser
-from app.entities.entity_schedule import Schedule
-from app.common.constants import SCHEDULE_SCHEDULED
 from database import db
 
 
@@ -25,16 +20,3 @@ class Trainer(db.Model):
     center_number = db.Column(db.String(20), nullable=True)
     center_type = db.Column(db.String(20), nullable=True)
     trainer_users = db.relationship('TrainerUser', backref='trainer', lazy=True)
-
-    @staticmethod
-    def conflict_trainer_schedule(trainer_id, request_time):
-        conflict_schedule = db.session.query(Schedule). \
-            join(TrainerUser, and_(TrainerUser.trainer_user_id == Schedule.trainer_user_id,
-                                   Schedule.schedule_status == SCHEDULE_SCHEDULED)). \
-            join(Trainer, and_(Trainer.trainer_id == TrainerUser.trainer_id,
-                               Trainer.trainer_id == trainer_id)). \
-            filter(func.abs(func.timestampdiff(literal_column('MINUTE'), Schedule.schedule_start_time,
-                                               request_time)) < Trainer.lesson_minutes). \
-            first()
-
-        return conflict_schedule
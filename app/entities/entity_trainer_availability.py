@@ -1,8 +1,12 @@
 from database import db
 
 
-# todo.txt : (trainer_id, week_day)는 유니크 해야 함. (조인조건이 유니크 하지 않으면 중복 데이터 발생) 로직으로 막기 vs 디비 키 설정 하기.
 class TrainerAvailability(db.Model):
+    # (trainer_id, week_day) 는 유니크. 조인 조건이 유니크하지 않으면 중복 데이터가 발생한다.
+    __table_args__ = (
+        db.UniqueConstraint('trainer_id', 'week_day', name='uq_trainer_availability_trainer_id_week_day'),
+    )
+
     trainer_availability_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     trainer_id = db.Column(db.Integer, db.ForeignKey('trainer.trainer_id'), nullable=False)
     week_day = db.Column(db.Integer, nullable=False)  # 예: 월요일부터 0,1,2,3,4,5,6
@@ -0,0 +1,15 @@
+from database import db
+
+
+# 트레이너의 날짜별 예약 수. 월간 예약 가능 날짜 조회시 schedule 집계를 대신한다.
+class TrainerDayOccupancy(db.Model):
+    trainer_id = db.Column(db.Integer, db.ForeignKey('trainer.trainer_id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    booked_count = db.Column(db.Integer, nullable=False, default=0)
+    capacity = db.Column(db.Integer, nullable=False, default=0)  # 해당 요일의 possible_lesson_cnt
+
+    def __init__(self, trainer_id, date, booked_count=0, capacity=0):
+        self.trainer_id = trainer_id
+        self.date = date
+        self.booked_count = booked_count
+        self.capacity = capacity
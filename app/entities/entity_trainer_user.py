@@ -4,6 +4,11 @@ from database import db
 
 
 class TrainerUser(db.Model):
+    __table_args__ = (
+        db.Index('ix_trainer_user_trainer_id_user_id', 'trainer_id', 'user_id'),
+        db.Index('ix_trainer_user_user_id', 'user_id'),
+    )
+
     trainer_user_id = db.Column(db.Integer, primary_key=True)
     trainer_id = db.Column(db.Integer, db.ForeignKey('trainer.trainer_id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
@@ -11,7 +16,9 @@ class TrainerUser(db.Model):
     lesson_current_count = db.Column(db.Integer, default=0)
     trainer_user_delete_flag = db.Column(db.Boolean, default=False)
     schedules = db.relationship('Schedule', backref='lesson', lazy=True)
+    user = db.relationship('Users', lazy=True)
     exercise_days = db.Column(db.String(50), nullable=True)
     special_notes = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    deleted_at = db.Column(db.DateTime)
\ No newline at end of file
+    deleted_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -3,5 +3,7 @@ from database import db
 
 class UserRefreshToken(db.Model):
     refresh_token_id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
-    refresh_token = db.Column(db.String(500), nullable=False)
+    # 회원당 유효한 refresh token 은 하나. 교체는 user_id 기준 upsert 로 한다.
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False, unique=True)
+    # 토큰 원문 대신 jti claim 의 sha256 만 저장한다.
+    jti_hash = db.Column(db.String(64), nullable=False)
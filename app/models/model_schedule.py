@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import Optional
 
-from app.common.constants import SCHEDULE_MODIFIED
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.common.constants import SCHEDULE_MODIFIED, DATEFORMAT, RECURRING_SCHEDULE_MAX_COUNT
 from app.common.exceptions import BadRequestError
 from app.utils.util_time import validate_datetime
 
@@ -16,6 +19,47 @@ class ScheduleCreateRequest(BaseModel):
         return validate_datetime(v)
 
 
+class RecurringScheduleCreateRequest(BaseModel):
+    trainer_id: int = Field(description='trainer id')
+    user_id: int = Field(description='user id')
+    schedule_start_time: str = Field(description='first schedule start time')
+    week_days: list[int] = Field(description='week days (Monday=0 ~ Sunday=6)')
+    count: Optional[int] = Field(default=None, description='number of schedules')
+    end_date: Optional[str] = Field(default=None, description='last schedule date (inclusive)')
+
+    @field_validator('schedule_start_time')
+    @classmethod
+    def validate_schedule_start_time(cls, v):
+        return validate_datetime(v)
+
+    @field_validator('week_days')
+    @classmethod
+    def validate_week_days(cls, v):
+        if not v or any(week_day < 0 or week_day > 6 for week_day in v):
+            raise BadRequestError(message='week_days must be between 0 and 6')
+        return sorted(set(v))
+
+    @field_validator('count')
+    @classmethod
+    def validate_count(cls, v):
+        if v is not None and not 0 < v <= RECURRING_SCHEDULE_MAX_COUNT:
+            raise BadRequestError(message=f'count must be between 1 and {RECURRING_SCHEDULE_MAX_COUNT}')
+        return v
+
+    @field_validator('end_date')
+    @classmethod
+    def validate_end_date(cls, v):
+        if v is not None:
+            datetime.strptime(v, DATEFORMAT)
+        return v
+
+    @model_validator(mode='after')
+    def validate_count_or_end_date(self):
+        if (self.count is None) == (self.end_date is None):
+            raise BadRequestError(message='either count or end_date is required')
+        return self
+
+
 class ScheduleSetRequest(BaseModel):
     start_time: str = Field(description='schedule start time')
     status: str = Field(description='schedule status')
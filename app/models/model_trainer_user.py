@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field, field_validator
 
 from app.common.constants import const
 from app.common.exceptions import BadRequestError
+from app.utils.util_serializer import compile_serializer
 
 user_of_trainer = Model('UserOfTrainer', {
     'user_id': fields.Integer(readOnly=True, description='The user unique identifier'),
@@ -17,9 +18,9 @@ user_of_trainer = Model('UserOfTrainer', {
     'last_date': fields.String(description='종료 날짜')
 })
 
-users_of_trainer = {
+users_of_trainer = Model('UsersOfTrainer', {
     'results': fields.List(fields.Nested(user_of_trainer))
-}
+})
 
 
 class UserTrainer(BaseModel):
@@ -124,19 +125,17 @@ class UsersRelatedTrainerResponse:
     registered_date: str
     last_date: str
 
-    @staticmethod
-    def to_dict(trainer_user, user):
-        return {
-            "user_id": trainer_user.user_id,
-            "user_name": user.user_name,
-            "user_profile_img_url": user.user_profile_img_url,
-            "exercise_days": trainer_user.exercise_days,
-            "lesson_current_count": trainer_user.lesson_current_count,
-            "lesson_total_count": trainer_user.lesson_total_count,
-            "registered_date": trainer_user.created_at.strftime(const.DATETIMEFORMAT),
-            "last_date": trainer_user.deleted_at.strftime(
-                const.DATETIMEFORMAT) if trainer_user.deleted_at is not None else None
-        }
+    # 목록 응답용. (TrainerUser, Users) 행을 바로 변환한다. 날짜는 응답 인코더가 DATETIMEFORMAT 으로 바꾼다.
+    to_dict = staticmethod(compile_serializer({
+        "user_id": "TrainerUser.user_id",
+        "user_name": "Users.user_name",
+        "user_profile_img_url": "Users.user_profile_img_url",
+        "exercise_days": "TrainerUser.exercise_days",
+        "lesson_current_count": "TrainerUser.lesson_current_count",
+        "lesson_total_count": "TrainerUser.lesson_total_count",
+        "registered_date": "TrainerUser.created_at",
+        "last_date": "TrainerUser.deleted_at"
+    }))
 
 
 class TrainersRelatedUserResponse:
@@ -0,0 +1,32 @@
+"""
+MySQL(운영)과 SQLite(테스트, 벤치마크)에서 같은 쿼리를 쓰기 위한 방언별 표현.
+
+레포지토리는 방언 전용 함수(mysql.insert, func.weekday 등)를 직접 쓰지 않고 여기를 거친다.
+"""
+from sqlalchemy import Date, func
+from sqlalchemy.dialects import mysql, sqlite
+
+
+def dialect_name(session):
+    return session.get_bind().dialect.name
+
+
+def date_of(column):
+    # DATETIME -> DATE. SQLite 의 date() 는 문자열을 반환하므로 결과 타입을 지정해 date 로 받는다.
+    return func.date(column, type_=Date)
+
+
+def upsert(session, table, index_elements, update):
+    """
+    유니크 키(index_elements)가 겹치면 update 로 갱신하는 INSERT 문.
+
+    update 는 (넣으려던 값) -> {컬럼 이름: 값} 함수이다.
+        upsert(session, table, ['user_id'], lambda inserted: {'jti_hash': inserted.jti_hash})
+    값은 execute 에 넘긴다. 여러 행을 넘기면 한 문장(executemany)으로 처리된다.
+    """
+    if dialect_name(session) == 'sqlite':
+        statement = sqlite.insert(table)
+        return statement.on_conflict_do_update(index_elements=index_elements, set_=update(statement.excluded))
+
+    statement = mysql.insert(table)
+    return statement.on_duplicate_key_update(**update(statement.inserted))
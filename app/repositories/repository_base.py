@@ -2,6 +2,8 @@ from typing import Generic, TypeVar, Type, Optional, List
 
 from flask_sqlalchemy import SQLAlchemy
 
+from app.repositories.unit_of_work import in_unit_of_work
+
 T = TypeVar('T')
 
 
@@ -10,10 +12,22 @@ class BaseRepository(Generic[T]):
         self.model = model
         self.db = db
 
-    def create(self, obj: T) -> T:
+    # refresh: 커밋 후 DB 값으로 다시 읽어야 할 때만 사용. 기본은 추가 SELECT 를 하지 않는다.
+    def create(self, obj: T, refresh: bool = False) -> T:
         self.db.session.add(obj)
-        self.db.session.commit()
-        self.db.session.refresh(obj)
+        if in_unit_of_work(self.db):
+            # id 를 바로 쓸 수 있도록 flush 만 하고 커밋은 작업 단위가 끝날 때 한다.
+            self.db.session.flush()
+        else:
+            self.db.session.commit()
+        if refresh:
+            self.db.session.refresh(obj)
+        return obj
+
+    # 커밋하지 않고 flush 만 한다. 호출한 쪽의 트랜잭션에서 함께 커밋된다.
+    def add(self, obj: T) -> T:
+        self.db.session.add(obj)
+        self.db.session.flush()
         return obj
 
     def get(self, id: int) -> Optional[T]:
@@ -22,12 +36,18 @@ class BaseRepository(Generic[T]):
     def get_all(self) -> List[T]:
         return self.model.query.all()
 
-    def update(self, obj: T) -> T:
-        self.db.session.commit()
-        self.db.session.refresh(obj)
+    def update(self, obj: T, refresh: bool = False) -> T:
+        self.commit()
+        if refresh:
+            self.db.session.refresh(obj)
         return obj
 
     def delete(self, obj: T) -> bool:
         self.db.session.delete(obj)
-        self.db.session.commit()
+        self.commit()
         return True
+
+    # 작업 단위 안에서는 아무것도 하지 않는다. 변경 사항은 다음 쿼리나 작업 단위 종료시 flush 된다.
+    def commit(self):
+        if not in_unit_of_work(self.db):
+            self.db.session.commit()
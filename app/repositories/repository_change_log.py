@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func
+
+from app.common.constants import RESOURCE_OWNER_TRAINER
+from app.entities.entity_change_log import ChangeLog
+from app.repositories.repository_base import BaseRepository
+
+
+class ChangeLogRepository(BaseRepository[ChangeLog]):
+    def __init__(self, db: SQLAlchemy):
+        super().__init__(ChangeLog, db)
+
+    # changes: (entity_type, entity_id, operation) 목록. 한 문장으로 저장하고 커밋하지 않는다.
+    def add_changes(self, trainer_id, user_id, changes):
+        now = datetime.utcnow()
+        rows = [{'trainer_id': trainer_id, 'user_id': user_id, 'entity_type': entity_type,
+                 'entity_id': entity_id, 'operation': operation, 'created_at': now}
+                for entity_type, entity_id, operation in changes]
+        if rows:
+            self.db.session.execute(ChangeLog.__table__.insert(), rows)
+
+    # (trainer_id, change_id) / (user_id, change_id) 인덱스 범위 검색
+    def select_changes(self, owner_type, owner_id, cursor, limit):
+        return self.db.session.query(
+            ChangeLog.change_id,
+            ChangeLog.entity_type,
+            ChangeLog.entity_id,
+            ChangeLog.operation
+        ).filter(
+            self._owner_column(owner_type) == owner_id,
+            ChangeLog.change_id > cursor
+        ).order_by(
+            ChangeLog.change_id
+        ).limit(limit).all()
+
+    def select_last_change_id(self, owner_type, owner_id):
+        return self.db.session.query(func.max(ChangeLog.change_id)).filter(
+            self._owner_column(owner_type) == owner_id).scalar()
+
+    def select_first_change_id(self):
+        return self.db.session.query(func.min(ChangeLog.change_id)).scalar()
+
+    # 마지막 기록은 남겨서 select_first_change_id 로 지워진 구간을 알 수 있게 한다.
+    def delete_before(self, created_at):
+        last_change_id = self.db.session.query(func.max(ChangeLog.change_id)).scalar()
+        if last_change_id is None:
+            return 0
+        deleted = ChangeLog.query.filter(
+            ChangeLog.created_at < created_at,
+            ChangeLog.change_id < last_change_id
+        ).delete(synchronize_session=False)
+        self.commit()
+        return deleted
+
+    @staticmethod
+    def _owner_column(owner_type):
+        return ChangeLog.trainer_id if owner_type == RESOURCE_OWNER_TRAINER else ChangeLog.user_id
@@ -1,49 +1,54 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import or_, case, null, select
+from sqlalchemy.orm import contains_eager
 from sqlalchemy.sql.functions import coalesce
 
-from app.common.constants import CHANGE_FROM_USER, const
+from app.common.constants import CHANGE_FROM_USER, CHANGE_TICKET_PAGE_SIZE, const, CHANGE_TICKET_TYPE_MODIFY
 from app.entities.entity_change_ticket import ChangeTicket
 from app.entities.entity_schedule import Schedule
 from app.entities.entity_users import Users
 from app.entities.entity_trainer import Trainer
+from app.entities.entity_trainer_fcm_token import TrainerFcmToken
 from app.entities.entity_trainer_user import TrainerUser
+from app.entities.entity_user_fcm_token import UserFcmToken
 from app.repositories.repository_base import BaseRepository
+from app.utils.util_cursor import paginate
 
 
 class ChangeTicketRepository(BaseRepository[ChangeTicket]):
     def __init__(self, db: SQLAlchemy):
         super().__init__(ChangeTicket, db)
 
-    def select_change_tickets_by_trainer_id(self, trainer_id, status, page=1, per_page=10):
+    # 반환값: (rows, next_cursor). page 를 지정하면 OFFSET 방식으로 조회한다.
+    def select_change_tickets_by_trainer_id(self, trainer_id, statuses, cursor=None, page=None,
+                                            per_page=CHANGE_TICKET_PAGE_SIZE):
         change_tickets = (self.db.session.query(
             ChangeTicket.id.label('id'),
             Users.user_name.label('user_name'),
             ChangeTicket.change_type.label('change_ticket_type'),
             ChangeTicket.as_is_date.label('as_is_date'),
-            ChangeTicket.request_time.label('to_be_date'),
+            _to_be_date(),
             ChangeTicket.created_at.label('created_at'),
             ChangeTicket.status.label('change_ticket_status'),
-            ChangeTicket.description.label('user_message')
+            ChangeTicket.description.label('user_message'),
+            null().label('trainer_message')
         )
                           .join(Schedule, ChangeTicket.schedule_id == Schedule.schedule_id)
                           .join(TrainerUser, Schedule.trainer_user_id == TrainerUser.trainer_user_id)
                           .join(Users, TrainerUser.user_id == Users.user_id)
                           .filter(TrainerUser.trainer_id == trainer_id))
 
-        if status == const.CHANGE_TICKET_STATUS_RESOLVED:
-            change_tickets = change_tickets.filter(ChangeTicket.status != const.CHANGE_TICKET_STATUS_WAITING)
-        else:
-            change_tickets = change_tickets.filter(ChangeTicket.status == status)
-        change_tickets = change_tickets.paginate(page=page, per_page=per_page)
-        return change_tickets
+        change_tickets = change_tickets.filter(self._status_condition(statuses))
+        return paginate(change_tickets, ChangeTicket.created_at, ChangeTicket.id, cursor, page, per_page)
 
-    def select_change_tickets_by_user_id(self, user_id, status, page=1, per_page=10):
+    def select_change_tickets_by_user_id(self, user_id, statuses, cursor=None, page=None,
+                                         per_page=CHANGE_TICKET_PAGE_SIZE):
         change_tickets = (self.db.session.query(
             ChangeTicket.id.label('id'),
             Trainer.trainer_name.label('trainer_name'),
             ChangeTicket.change_type.label('change_ticket_type'),
             ChangeTicket.as_is_date.label('as_is_date'),
-            ChangeTicket.request_time.label('to_be_date'),
+            _to_be_date(),
             ChangeTicket.created_at.label('created_at'),
             ChangeTicket.status.label('change_ticket_status'),
             coalesce(ChangeTicket.description, '').label('user_message'),
@@ -54,16 +59,12 @@ class ChangeTicketRepository(BaseRepository[ChangeTicket]):
                           .join(Trainer, TrainerUser.trainer_id == Trainer.trainer_id)
                           .filter(TrainerUser.user_id == user_id))
 
-        if status == const.CHANGE_TICKET_STATUS_RESOLVED:
-            change_tickets = change_tickets.filter(ChangeTicket.status != const.CHANGE_TICKET_STATUS_WAITING)
-        else:
-            change_tickets = change_tickets.filter(ChangeTicket.status == status)
-        change_tickets = change_tickets.paginate(page=page, per_page=per_page)
-        return change_tickets
+        change_tickets = change_tickets.filter(self._status_condition(statuses))
+        return paginate(change_tickets, ChangeTicket.created_at, ChangeTicket.id, cursor, page, per_page)
 
     # 유저가 보낸 요청 조회
-    def select_user_change_tickets(self, user_id, page=1, per_page=10):
-        return (self.db.session.query(
+    def select_user_change_tickets(self, user_id, cursor=None, page=None, per_page=CHANGE_TICKET_PAGE_SIZE):
+        change_tickets = (self.db.session.query(
             ChangeTicket.id,
             Trainer.trainer_name,
             ChangeTicket.change_type,
@@ -77,8 +78,74 @@ class ChangeTicketRepository(BaseRepository[ChangeTicket]):
                 .join(Schedule)
                 .join(TrainerUser)
                 .join(Trainer)
-                .filter(TrainerUser.user_id == user_id, ChangeTicket.change_from == CHANGE_FROM_USER)
-                .paginate(page=page, per_page=per_page))
+                .filter(TrainerUser.user_id == user_id, ChangeTicket.change_from == CHANGE_FROM_USER))
+        return paginate(change_tickets, ChangeTicket.created_at, ChangeTicket.id, cursor, page, per_page)
+
+    # 티켓, 스케쥴, 트레이너-유저, 트레이너, 유저와 양쪽 FCM 토큰을 한 번에 조회한다.
+    # 반환값: (change_ticket, trainer_fcm_token, user_fcm_token) 또는 None. 토큰이 없으면 None.
+    # 토큰은 여러 개 등록될 수 있으므로 조인하지 않고 각자 가장 최근에 등록된 하나만 서브쿼리로 읽는다.
+    def select_change_ticket_with_lesson_by_id(self, change_ticket_id):
+        lesson = contains_eager(ChangeTicket.schedule).contains_eager(Schedule.lesson)
+        trainer_fcm_token = (select(TrainerFcmToken.fcm_token)
+                             .where(TrainerFcmToken.trainer_id == TrainerUser.trainer_id)
+                             .order_by(TrainerFcmToken.fcm_token_id.desc())
+                             .limit(1)
+                             .correlate(TrainerUser)
+                             .scalar_subquery())
+        user_fcm_token = (select(UserFcmToken.fcm_token)
+                          .where(UserFcmToken.user_id == TrainerUser.user_id)
+                          .order_by(UserFcmToken.fcm_token_id.desc())
+                          .limit(1)
+                          .correlate(TrainerUser)
+                          .scalar_subquery())
+        return (self.db.session.query(
+            ChangeTicket,
+            trainer_fcm_token.label('trainer_fcm_token'),
+            user_fcm_token.label('user_fcm_token')
+        )
+                .join(ChangeTicket.schedule)
+                .join(Schedule.lesson)
+                .join(TrainerUser.trainer)
+                .join(TrainerUser.user)
+                .options(lesson.contains_eager(TrainerUser.trainer),
+                         lesson.contains_eager(TrainerUser.user))
+                .filter(ChangeTicket.id == change_ticket_id)
+                .first())
 
     def select_change_ticket_by_schedule_id(self, schedule_id):
         return ChangeTicket.query.filter_by(schedule_id=schedule_id).first()
+
+    # /sync 응답용. 변경 기록의 id 로 현재 값을 한 번에 조회한다.
+    def select_change_tickets_by_ids(self, change_ticket_ids):
+        return self.db.session.query(
+            ChangeTicket.id,
+            ChangeTicket.schedule_id,
+            ChangeTicket.change_from,
+            ChangeTicket.change_type,
+            ChangeTicket.status,
+            ChangeTicket.description,
+            ChangeTicket.reject_reason,
+            ChangeTicket.as_is_date,
+            ChangeTicket.request_time,
+            ChangeTicket.created_at,
+            ChangeTicket.updated_at
+        ).filter(
+            ChangeTicket.id.in_(change_ticket_ids)
+        ).all()
+
+    @staticmethod
+    def _status_condition(statuses):
+        # 여러 상태를 한 번에 조회해야 하나의 cursor 로 이어서 조회할 수 있다.
+        conditions = []
+        for status in statuses:
+            if status == const.CHANGE_TICKET_STATUS_RESOLVED:
+                conditions.append(ChangeTicket.status != const.CHANGE_TICKET_STATUS_WAITING)
+            else:
+                conditions.append(ChangeTicket.status == status)
+        return or_(*conditions)
+
+
+# 변경 희망 날짜는 수정 요청일 때만 내려준다. 행 변환 없이 응답으로 쓸 수 있도록 쿼리에서 처리한다.
+def _to_be_date():
+    return case((ChangeTicket.change_type == CHANGE_TICKET_TYPE_MODIFY, ChangeTicket.request_time),
+                else_=null()).label('to_be_date')
@@ -0,0 +1,20 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from app.common.constants import NOTIFICATION_STATUS_PENDING
+from app.entities.entity_notification_outbox import NotificationOutbox
+from app.repositories.repository_base import BaseRepository
+
+
+class NotificationOutboxRepository(BaseRepository[NotificationOutbox]):
+    def __init__(self, db: SQLAlchemy):
+        super().__init__(NotificationOutbox, db)
+
+    # 여러 워커가 동시에 실행되어도 같은 알림을 중복 발송하지 않도록 잠긴 행은 건너뛴다.
+    def select_pending_for_update(self, now, limit):
+        return (NotificationOutbox.query
+                .filter(NotificationOutbox.status == NOTIFICATION_STATUS_PENDING,
+                        NotificationOutbox.next_attempt_at <= now)
+                .order_by(NotificationOutbox.notification_outbox_id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all())
@@ -0,0 +1,30 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from app.entities.entity_resource_version import ResourceVersion
+from app.repositories.dialect import upsert
+from app.repositories.repository_base import BaseRepository
+
+
+class ResourceVersionRepository(BaseRepository[ResourceVersion]):
+    def __init__(self, db: SQLAlchemy):
+        super().__init__(ResourceVersion, db)
+
+    # 행이 없으면 한 번도 바뀌지 않은 것으로 보고 0 을 반환한다.
+    def select_version(self, owner_type, owner_id):
+        version = self.db.session.query(ResourceVersion.version).filter_by(
+            owner_type=owner_type, owner_id=owner_id).scalar()
+        return version or 0
+
+    # owners: (owner_type, owner_id) 목록. 행이 없으면 1 로 만들고 있으면 1 올린다. 한 문장으로 처리한다.
+    # 커밋하지 않는다. 조회 결과를 바꾸는 쓰기와 같은 트랜잭션에서 커밋되어야 한다.
+    def bump(self, owners):
+        # 같은 순서로 잠가서 동시에 실행되는 bump 끼리 교착되지 않게 한다. (트레이너 -> 회원, id 순)
+        rows = [{'owner_type': owner_type, 'owner_id': owner_id, 'version': 1}
+                for owner_type, owner_id in sorted(set(owners))]
+        if not rows:
+            return
+
+        table = ResourceVersion.__table__
+        statement = upsert(self.db.session, table, [table.c.owner_type, table.c.owner_id],
+                           lambda inserted: {'version': table.c.version + 1})
+        self.db.session.execute(statement, rows)
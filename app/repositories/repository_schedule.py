@@ -1,16 +1,16 @@
 from datetime import datetime, timedelta
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func, and_, literal_column
+from sqlalchemy import insert
 from sqlalchemy.sql.functions import coalesce
 
-from app.common.constants import SCHEDULE_SCHEDULED
-from app.entities.entity_trainer_availability import TrainerAvailability
 from app.entities.entity_trainer import Trainer
 from app.entities.entity_trainer_user import TrainerUser
 from app.entities.entity_schedule import Schedule
 from app.entities.entity_users import Users
+from app.repositories.dialect import date_of
 from app.repositories.repository_base import BaseRepository
+from app.utils.util_time import get_day_range, get_month_range
 
 
 class ScheduleRepository(BaseRepository[Schedule]):
@@ -18,11 +18,7 @@ class ScheduleRepository(BaseRepository[Schedule]):
         super().__init__(Schedule, db)
 
     def select_schedule_day_by_tu_id_and_year_month(self, trainer_user_id, year, month, page=1, per_page=10):
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1)
-        else:
-            end_date = datetime(year, month + 1, 1)
+        start_date, end_date = get_month_range(year, month)
 
         schedules = Schedule.query.filter(
             Schedule.trainer_user_id == trainer_user_id,
@@ -33,16 +29,20 @@ class ScheduleRepository(BaseRepository[Schedule]):
         return schedules
 
     def select_month_schedule_time_by_user_id(self, user_id, year, month):
+        start_date, end_date = get_month_range(year, month)
+        schedule_date = date_of(Schedule.schedule_start_time).label('schedule_date')
         schedules = (
-            self.db.session.query(func.distinct(func.date(Schedule.schedule_start_time))).join(TrainerUser).filter(
+            self.db.session.query(schedule_date).join(TrainerUser).filter(
                 TrainerUser.user_id == user_id,
-                self.db.extract('year', Schedule.schedule_start_time) == year,
-                self.db.extract('month', Schedule.schedule_start_time) == month)
-            .order_by(func.date(Schedule.schedule_start_time).asc())
+                Schedule.schedule_start_time >= start_date,
+                Schedule.schedule_start_time < end_date)
+            .distinct()
+            .order_by(schedule_date.asc())
             .all())
         return schedules
 
     def select_day_schedule_by_user_id(self, user_id, year, month, day):
+        start_time, end_time = get_day_range(datetime(year, month, day))
         schedules = (self.db.session.query(
             Schedule.schedule_id,
             Trainer.trainer_id,
@@ -57,74 +57,95 @@ class ScheduleRepository(BaseRepository[Schedule]):
                      .join(TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id)
                      .join(Trainer, TrainerUser.trainer_id == Trainer.trainer_id)
                      .filter(TrainerUser.user_id == user_id,
-                             func.year(Schedule.schedule_start_time) == year,
-                             func.month(Schedule.schedule_start_time) == month,
-                             func.day(Schedule.schedule_start_time) == day)
+                             Schedule.schedule_start_time >= start_time,
+                             Schedule.schedule_start_time < end_time)
                      .all())
 
         return schedules
 
-    def select_conflict_schedule_by_trainer_id_and_request_time(self, trainer_id, request_time):
-        conflict_schedule = self.db.session.query(Schedule). \
-            join(TrainerUser, and_(TrainerUser.trainer_user_id == Schedule.trainer_user_id,
-                                   Schedule.schedule_status == SCHEDULE_SCHEDULED)). \
-            join(Trainer, and_(Trainer.trainer_id == TrainerUser.trainer_id,
-                               Trainer.trainer_id == trainer_id)). \
-            filter(func.abs(func.timestampdiff(literal_column('MINUTE'), Schedule.schedule_start_time,
-                                               request_time)) < Trainer.lesson_minutes). \
-            first()
-
-        return conflict_schedule
-
-    def select_full_date_by_trainer_id_and_year_month(self, trainer_id, year, month):
-        full_dates = self.db.session.query(
-            func.date(Schedule.schedule_start_time).label('date')
-        ).join(TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id
-               ).join(Trainer, Trainer.trainer_id == TrainerUser.trainer_id
-                      ).join(TrainerAvailability, and_(
-            Trainer.trainer_id == TrainerAvailability.trainer_id,
-            func.weekday(Schedule.schedule_start_time) == TrainerAvailability.week_day
-        )).filter(
-            Trainer.trainer_id == trainer_id,
-            func.year(Schedule.schedule_start_time) == year,
-            func.month(Schedule.schedule_start_time) == month
-        ).group_by(
-            func.date(Schedule.schedule_start_time)
-        ).having(
-            func.max(TrainerAvailability.possible_lesson_cnt) <= func.count()
-        ).all()
-
-        return full_dates
-
-    def select_conflict_trainer_schedule_by_time(self, trainer_id, start_time):
-        schedule = self.db.session.query(Schedule). \
-            join(TrainerUser, and_(TrainerUser.trainer_user_id == Schedule.trainer_user_id,
-                                   Schedule.schedule_status == SCHEDULE_SCHEDULED)). \
-            join(Trainer, and_(Trainer.trainer_id == TrainerUser.trainer_id,
-                               Trainer.trainer_id == trainer_id)). \
-            filter(func.abs(func.timestampdiff(literal_column('MINUTE'), Schedule.schedule_start_time,
-                                               start_time)) < Trainer.lesson_minutes). \
-            first()
-
-        return schedule
+    def select_conflict_schedule_by_trainer_id_and_time(self, trainer_id, start_time, lesson_minutes,
+                                                        for_update=False):
+        # 요청 시간과 수업 시간(lesson_minutes) 미만으로 차이나는 스케쥴은 충돌.
+        # 컬럼 범위 조건으로 바꿔 (trainer_user_id, schedule_start_time) 인덱스 범위만 읽는다.
+        # for_update: 잠금 읽기는 트랜잭션 스냅샷이 아닌 최신 커밋 데이터를 읽는다. 트레이너 행 잠금과 함께 사용.
+        lesson_duration = timedelta(minutes=lesson_minutes)
+        query = self.db.session.query(Schedule). \
+            join(TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id). \
+            filter(TrainerUser.trainer_id == trainer_id,
+                   Schedule.occupying_condition(),
+                   Schedule.schedule_start_time > start_time - lesson_duration,
+                   Schedule.schedule_start_time < start_time + lesson_duration)
+        if for_update:
+            query = query.with_for_update()
+        return query.first()
+
+    def select_conflict_schedule_times_by_trainer_id_and_range(self, trainer_id, start_time, end_time,
+                                                               lesson_minutes, for_update=False):
+        # 정기 수업 신청용. [start_time, end_time] 의 모든 신청 시간과 충돌할 수 있는 스케쥴 시간을 한 번에 조회한다.
+        lesson_duration = timedelta(minutes=lesson_minutes)
+        query = self.db.session.query(Schedule.schedule_start_time). \
+            join(TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id). \
+            filter(TrainerUser.trainer_id == trainer_id,
+                   Schedule.occupying_condition(),
+                   Schedule.schedule_start_time > start_time - lesson_duration,
+                   Schedule.schedule_start_time < end_time + lesson_duration). \
+            order_by(Schedule.schedule_start_time)
+        if for_update:
+            query = query.with_for_update()
+        return [row.schedule_start_time for row in query.all()]
+
+    # 커밋하지 않는다. 여러 행을 INSERT 한 문장으로 저장한다.
+    def insert_schedules(self, trainer_user_id, schedule_start_times, schedule_status):
+        rows = [{
+            'trainer_user_id': trainer_user_id,
+            'schedule_start_time': schedule_start_time,
+            'schedule_status': schedule_status
+        } for schedule_start_time in schedule_start_times]
+        self.db.session.execute(insert(Schedule).values(rows))
+
+    def select_schedule_ids_by_tu_id_and_times(self, trainer_user_id, schedule_start_times):
+        return [row.schedule_id for row in self.db.session.query(Schedule.schedule_id).filter(
+            Schedule.trainer_user_id == trainer_user_id,
+            Schedule.schedule_start_time.in_(schedule_start_times),
+            Schedule.schedule_delete_flag == False
+        ).order_by(Schedule.schedule_start_time)]
 
     def select_day_schedule_by_trainer_id(self, trainer_id, date):
+        start_time, end_time = get_day_range(date)
+        return self.db.session.query(
+            Schedule.schedule_start_time
+        ).join(TrainerUser, (TrainerUser.trainer_user_id == Schedule.trainer_user_id)
+               & (TrainerUser.trainer_id == trainer_id)
+               & (TrainerUser.trainer_user_delete_flag == False)
+               & (Schedule.schedule_delete_flag == False)
+               & (Schedule.schedule_start_time >= start_time)
+               & (Schedule.schedule_start_time < end_time)
+               ).all()
+
+    # select_day_schedule_by_trainer_id 와 같은 조건으로 [start_date, end_date] 기간을 한 번에 조회
+    def select_range_schedule_by_trainer_id(self, trainer_id, start_date, end_date):
+        start_time, _ = get_day_range(start_date)
+        _, end_time = get_day_range(end_date)
         return self.db.session.query(
             Schedule.schedule_start_time
         ).join(TrainerUser, (TrainerUser.trainer_user_id == Schedule.trainer_user_id)
                & (TrainerUser.trainer_id == trainer_id)
                & (TrainerUser.trainer_user_delete_flag == False)
                & (Schedule.schedule_delete_flag == False)
-               & (self.db.func.date(Schedule.schedule_start_time) == date)
+               & (Schedule.schedule_start_time >= start_time)
+               & (Schedule.schedule_start_time < end_time)
                ).all()
 
     def select_week_schedule_by_trainer_id(self, trainer_id, start_date, end_date):
+        # end_date 당일까지 포함해야 하므로 다음날 00:00 미만으로 조회
+        start_time, _ = get_day_range(start_date)
+        _, end_time = get_day_range(end_date)
         return self.db.session.query(Users.user_id, Users.user_name, Schedule.schedule_start_time) \
             .join(TrainerUser,
                   (TrainerUser.trainer_user_id == Schedule.trainer_user_id) \
                   & (TrainerUser.trainer_id == trainer_id) \
-                  & (self.db.func.date(Schedule.schedule_start_time) >= start_date) \
-                  & (self.db.func.date(Schedule.schedule_start_time) <= end_date)) \
+                  & (Schedule.schedule_start_time >= start_time) \
+                  & (Schedule.schedule_start_time < end_time)) \
             .join(Users, Users.user_id == TrainerUser.user_id) \
             .all()
 
@@ -132,10 +153,11 @@ class ScheduleRepository(BaseRepository[Schedule]):
         return self.db.session.query(
             Schedule.schedule_id,
             Schedule.schedule_start_time
-        ).join(TrainerUser, (TrainerUser.trainer_id == trainer_id)
+        ).join(TrainerUser, (TrainerUser.trainer_user_id == Schedule.trainer_user_id)
+               & (TrainerUser.trainer_id == trainer_id)
                & (TrainerUser.user_id == user_id)
-               & (self.db.func.date(Schedule.schedule_start_time) >= start_date)
-               & (self.db.func.date(Schedule.schedule_start_time) < end_date)
+               & (Schedule.schedule_start_time >= start_date)
+               & (Schedule.schedule_start_time < end_date)
                & (TrainerUser.trainer_user_delete_flag == False)
                & (Schedule.schedule_delete_flag == False)
                ).all()
@@ -162,6 +184,23 @@ class ScheduleRepository(BaseRepository[Schedule]):
 
         return result
 
+    # /sync 응답용. 변경 기록의 schedule_id 로 현재 값을 한 번에 조회한다.
+    def select_schedules_by_ids(self, schedule_ids):
+        return self.db.session.query(
+            Schedule.schedule_id,
+            Schedule.trainer_user_id,
+            TrainerUser.trainer_id,
+            TrainerUser.user_id,
+            Schedule.schedule_start_time,
+            Schedule.schedule_status,
+            Schedule.updated_at
+        ).join(
+            TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id
+        ).filter(
+            Schedule.schedule_id.in_(schedule_ids),
+            Schedule.schedule_delete_flag == False
+        ).all()
+
 
 # todo.txt: 스케쥴 조회시 스케쥴 상태 조건 추가
 '''
@@ -1,33 +1,25 @@
 from app.entities.entity_trainer_refresh_token import TrainerRefreshToken
 from app.entities.entity_user_refresh_token import UserRefreshToken
+from app.repositories.dialect import upsert
 from database import db
 
 
 class TokenRepository:
 
-    def select_user_refresh_token_by_user_id(self, user_id):
-        return UserRefreshToken.query.filter_by(user_id=user_id).first()
+    def select_user_jti_hash(self, user_id):
+        return db.session.query(UserRefreshToken.jti_hash).filter_by(user_id=user_id).scalar()
 
-    def select_trainer_refresh_token_by_trainer_id(self, trainer_id):
-        return TrainerRefreshToken.query.filter_by(trainer_id=trainer_id).first()
+    def select_trainer_jti_hash(self, trainer_id):
+        return db.session.query(TrainerRefreshToken.jti_hash).filter_by(trainer_id=trainer_id).scalar()
 
-    def insert_user_refresh_token(self, user_id, refresh_token):
-        user_token = UserRefreshToken(
-            user_id=user_id,
-            refresh_token=refresh_token
-        )
-        db.session.add(user_token)
-        db.session.commit()
+    def upsert_user_jti_hash(self, user_id, jti_hash):
+        self._upsert(UserRefreshToken, 'user_id', {'user_id': user_id, 'jti_hash': jti_hash})
 
-    def insert_trainer_refresh_token(self, trainer_id, refresh_token):
-        trainer_token = TrainerRefreshToken(
-            trainer_id=trainer_id,
-            refresh_token=refresh_token
-        )
-        db.session.add(trainer_token)
-        db.session.commit()
+    def upsert_trainer_jti_hash(self, trainer_id, jti_hash):
+        self._upsert(TrainerRefreshToken, 'trainer_id', {'trainer_id': trainer_id, 'jti_hash': jti_hash})
 
-    def update(self, token, refresh_token):
-        token.refresh_token = refresh_token
-        db.session.add(token)
-        db.session.commit()
+    # 조회 후 insert/update 대신 유니크 키(subject) 기준 한 문장으로 교체한다. 커밋하지 않는다.
+    @staticmethod
+    def _upsert(model, key, values):
+        statement = upsert(db.session, model.__table__, [key], lambda inserted: {'jti_hash': inserted.jti_hash})
+        db.session.execute(statement, values)
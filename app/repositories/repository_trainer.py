@@ -19,6 +19,20 @@ class TrainerRepository(BaseRepository[Trainer]):
                , (TrainerAvailability.week_day == date.weekday()))
                ).filter(Trainer.trainer_id == trainer_id, Trainer.trainer_delete_flag == False).first()
 
+    # 요일별 근무 시간 전체. 여러 날짜의 슬롯을 한 번에 계산할 때 사용한다.
+    def select_trainer_availabilities_by_id(self, trainer_id):
+        return self.db.session.query(
+            Trainer.lesson_minutes,
+            TrainerAvailability.week_day,
+            TrainerAvailability.start_time,
+            TrainerAvailability.end_time
+        ).join(TrainerAvailability, TrainerAvailability.trainer_id == Trainer.trainer_id
+               ).filter(Trainer.trainer_id == trainer_id, Trainer.trainer_delete_flag == False).all()
+
+    # 트레이너 단위로 예약/변경을 직렬화한다. 다른 트레이너의 예약은 막지 않는다.
+    def select_for_update(self, trainer_id):
+        return Trainer.query.filter_by(trainer_id=trainer_id).with_for_update().one_or_none()
+
     def select_trainer_by_social_id(self, trainer_social_id):
         return Trainer.query.filter_by(trainer_social_id=trainer_social_id).first()
 
@@ -1,10 +1,11 @@
 from datetime import datetime
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert
 
 from app.common.constants import TIMEFORMAT
+from app.common.exceptions import BadRequestError
 from app.entities.entity_trainer_availability import TrainerAvailability
-from app.entities.entity_trainer import Trainer
 from app.repositories.repository_base import BaseRepository
 from app.utils.util_time import calculate_lesson_slots
 
@@ -25,28 +26,39 @@ class TrainerAvailabilityRepository(BaseRepository[TrainerAvailability]):
 
         return available_week_days
 
-    def delete_availability_by_trainer(self, trainer_id):
-        availabilities = TrainerAvailability.query.filter_by(trainer_id=trainer_id).all()
-        for availability in availabilities:
-            self.db.session.delete(availability)
-
-        self.db.session.commit()
-
-    def insert_availabilities(self, trainer_id, availabilities):
-        trainer = Trainer.query.filter_by(trainer_id=trainer_id).first()
-        lesson_minutes = trainer.lesson_minutes
-        for availability in availabilities:
-            start_time = datetime.strptime(availability.start_time, TIMEFORMAT).time()
-            end_time = datetime.strptime(availability.end_time, TIMEFORMAT).time()
-            possible_lesson_cnt = calculate_lesson_slots(start_time, end_time, lesson_minutes)
-
-            trainer_availability = TrainerAvailability(
-                trainer_id=trainer_id,
-                week_day=availability.week_day,
-                start_time=start_time,
-                end_time=end_time,
-                possible_lesson_cnt=possible_lesson_cnt
-            )
-            self.db.session.add(trainer_availability)
-
-        self.db.session.commit()
+    def replace_availabilities(self, trainer_id, lesson_minutes, availabilities):
+        """
+        트레이너의 근무 요일을 통째로 교체한다. DELETE 1번 + 다중 행 INSERT 1번.
+        availabilities 는 요청 모델(속성 접근) 또는 JSON payload(dict) 모두 받는다.
+        """
+        rows = [self._to_row(trainer_id, lesson_minutes, availability) for availability in availabilities]
+        week_days = [row['week_day'] for row in rows]
+        if len(week_days) != len(set(week_days)):
+            raise BadRequestError(message="근무 요일이 중복되었습니다.")
+
+        TrainerAvailability.query.filter_by(trainer_id=trainer_id).delete(synchronize_session=False)
+        if rows:
+            self.db.session.execute(insert(TrainerAvailability), rows)
+
+        self.commit()
+
+    @staticmethod
+    def _to_row(trainer_id, lesson_minutes, availability):
+        if isinstance(availability, dict):
+            week_day = availability['week_day']
+            start_time = availability['start_time']
+            end_time = availability['end_time']
+        else:
+            week_day = availability.week_day
+            start_time = availability.start_time
+            end_time = availability.end_time
+
+        start_time = datetime.strptime(start_time, TIMEFORMAT).time()
+        end_time = datetime.strptime(end_time, TIMEFORMAT).time()
+        return {
+            'trainer_id': trainer_id,
+            'week_day': week_day,
+            'start_time': start_time,
+            'end_time': end_time,
+            'possible_lesson_cnt': calculate_lesson_slots(start_time, end_time, lesson_minutes)
+        }
@@ -0,0 +1,116 @@
+from collections import Counter
+from datetime import date as date_type
+
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func
+
+from app.entities.entity_schedule import Schedule
+from app.entities.entity_trainer_availability import TrainerAvailability
+from app.entities.entity_trainer_day_occupancy import TrainerDayOccupancy
+from app.entities.entity_trainer_user import TrainerUser
+from app.repositories.dialect import date_of, upsert
+from app.repositories.repository_base import BaseRepository
+
+
+class TrainerDayOccupancyRepository(BaseRepository[TrainerDayOccupancy]):
+    def __init__(self, db: SQLAlchemy):
+        super().__init__(TrainerDayOccupancy, db)
+
+    # 커밋하지 않는다. 스케쥴 변경과 같은 트랜잭션에서 커밋되어야 한다.
+    def update_booked_count(self, trainer_id, date, delta):
+        updated = self.db.session.query(TrainerDayOccupancy).filter(
+            TrainerDayOccupancy.trainer_id == trainer_id,
+            TrainerDayOccupancy.date == date
+        ).update({TrainerDayOccupancy.booked_count: TrainerDayOccupancy.booked_count + delta},
+                 synchronize_session=False)
+
+        if updated or delta < 0:
+            return
+
+        self.db.session.add(TrainerDayOccupancy(
+            trainer_id=trainer_id,
+            date=date,
+            booked_count=delta,
+            capacity=self._select_capacities_by_trainer_id(trainer_id).get(date.weekday(), 0)
+        ))
+
+    # 커밋하지 않는다. 날짜별 증가분(dates 의 등장 횟수)을 한 문장의 upsert 로 반영한다.
+    def increment_booked_counts(self, trainer_id, dates):
+        capacities = self._select_capacities_by_trainer_id(trainer_id)
+        table = TrainerDayOccupancy.__table__
+        rows = [{
+            'trainer_id': trainer_id,
+            'date': date,
+            'booked_count': booked_count,
+            'capacity': capacities.get(date.weekday(), 0)
+        } for date, booked_count in Counter(dates).items()]
+        statement = upsert(self.db.session, table, ['trainer_id', 'date'],
+                           lambda inserted: {'booked_count': table.c.booked_count + inserted.booked_count})
+        self.db.session.execute(statement, rows)
+
+    def select_full_dates_by_trainer_id_and_range(self, trainer_id, start_date, end_date):
+        return self.db.session.query(
+            TrainerDayOccupancy.date
+        ).filter(
+            TrainerDayOccupancy.trainer_id == trainer_id,
+            TrainerDayOccupancy.date >= start_date,
+            TrainerDayOccupancy.date < end_date,
+            TrainerDayOccupancy.booked_count >= TrainerDayOccupancy.capacity
+        ).all()
+
+    # 근무 시간이 바뀌면 오늘 이후 날짜의 capacity 를 다시 계산한다.
+    def update_capacity_by_trainer_id(self, trainer_id):
+        capacities = self._select_capacities_by_trainer_id(trainer_id)
+        occupancies = TrainerDayOccupancy.query.filter(
+            TrainerDayOccupancy.trainer_id == trainer_id,
+            TrainerDayOccupancy.date >= date_type.today()
+        ).all()
+        for occupancy in occupancies:
+            occupancy.capacity = capacities.get(occupancy.date.weekday(), 0)
+
+    def backfill(self, trainer_id=None):
+        schedule_date = date_of(Schedule.schedule_start_time)
+        booked_counts = self.db.session.query(
+            TrainerUser.trainer_id,
+            schedule_date.label('date'),
+            func.count().label('booked_count')
+        ).join(
+            TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id
+        ).filter(
+            Schedule.occupying_condition()
+        )
+        occupancies = TrainerDayOccupancy.query
+        if trainer_id is not None:
+            booked_counts = booked_counts.filter(TrainerUser.trainer_id == trainer_id)
+            occupancies = occupancies.filter(TrainerDayOccupancy.trainer_id == trainer_id)
+        booked_counts = booked_counts.group_by(TrainerUser.trainer_id, schedule_date).all()
+
+        occupancies.delete(synchronize_session=False)
+
+        capacities = {}
+        rows = []
+        for row in booked_counts:
+            if row.trainer_id not in capacities:
+                capacities[row.trainer_id] = self._select_capacities_by_trainer_id(row.trainer_id)
+            rows.append({
+                'trainer_id': row.trainer_id,
+                'date': row.date,
+                'booked_count': row.booked_count,
+                'capacity': capacities[row.trainer_id].get(row.date.weekday(), 0)
+            })
+
+        if rows:
+            self.db.session.execute(TrainerDayOccupancy.__table__.insert(), rows)
+        self.db.session.commit()
+        return len(rows)
+
+    def _select_capacities_by_trainer_id(self, trainer_id):
+        capacities = self.db.session.query(
+            TrainerAvailability.week_day,
+            func.max(TrainerAvailability.possible_lesson_cnt)
+        ).filter(
+            TrainerAvailability.trainer_id == trainer_id
+        ).group_by(
+            TrainerAvailability.week_day
+        ).all()
+        return {week_day: possible_lesson_cnt for week_day, possible_lesson_cnt in capacities}
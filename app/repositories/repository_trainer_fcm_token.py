@@ -8,5 +8,7 @@ class TrainerFcmTokenRepository(BaseRepository[TrainerFcmToken]):
     def __init__(self, db: SQLAlchemy):
         super().__init__(TrainerFcmToken, db)
 
+    # 토큰이 여러 개면 가장 최근에 등록된 것을 사용한다. (변경 티켓 상세 조회와 같은 기준)
     def get_by_trainer_id(self, trainer_id):
-        return TrainerFcmToken.query.filter_by(trainer_id=trainer_id).first()
+        return TrainerFcmToken.query.filter_by(trainer_id=trainer_id).order_by(
+            TrainerFcmToken.fcm_token_id.desc()).first()
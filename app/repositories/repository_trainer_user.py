@@ -24,5 +24,45 @@ class TrainerUserRepository(BaseRepository[TrainerUser]):
                 .filter(TrainerUser.user_id == user_id)
                 .all())
 
+    def select_user_ids_by_trainer_id(self, trainer_id):
+        return [user_id for user_id, in self.db.session.query(TrainerUser.user_id).filter(
+            TrainerUser.trainer_id == trainer_id)]
+
+    def select_trainer_ids_by_user_id(self, user_id):
+        return [trainer_id for trainer_id, in self.db.session.query(TrainerUser.trainer_id).filter(
+            TrainerUser.user_id == user_id)]
+
+    # /sync 응답용. 변경 기록의 id 로 현재 값을 한 번에 조회한다.
+    def select_trainer_users_by_ids(self, trainer_user_ids):
+        return self.db.session.query(
+            TrainerUser.trainer_user_id,
+            TrainerUser.trainer_id,
+            TrainerUser.user_id,
+            TrainerUser.lesson_total_count,
+            TrainerUser.lesson_current_count,
+            TrainerUser.exercise_days,
+            TrainerUser.special_notes,
+            TrainerUser.trainer_user_delete_flag,
+            TrainerUser.updated_at
+        ).filter(
+            TrainerUser.trainer_user_id.in_(trainer_user_ids)
+        ).all()
+
     def select_by_trainer_id_and_user_id(self, trainer_id, user_id):
         return TrainerUser.query.filter_by(trainer_id=trainer_id, user_id=user_id).first()
+
+    # 남은 수업이 있을 때만 차감한다. 동시에 요청되어도 음수가 되지 않는다. 커밋하지 않는다.
+    def decrement_lesson_count(self, trainer_user_id, count=1):
+        updated = TrainerUser.query.filter(
+            TrainerUser.trainer_user_id == trainer_user_id,
+            TrainerUser.lesson_current_count >= count
+        ).update({TrainerUser.lesson_current_count: TrainerUser.lesson_current_count - count},
+                 synchronize_session='evaluate')
+        return updated == 1
+
+    # 커밋하지 않는다.
+    def increment_lesson_count(self, trainer_user_id):
+        TrainerUser.query.filter(
+            TrainerUser.trainer_user_id == trainer_user_id
+        ).update({TrainerUser.lesson_current_count: TrainerUser.lesson_current_count + 1},
+                 synchronize_session='evaluate')
@@ -9,5 +9,6 @@ class UserFcmTokenRepository(BaseRepository[UserFcmToken]):
     def __init__(self, db: SQLAlchemy):
         super().__init__(UserFcmToken, db)
 
+    # 토큰이 여러 개면 가장 최근에 등록된 것을 사용한다. (변경 티켓 상세 조회와 같은 기준)
     def get_by_user_id(self, user_id):
-        return UserFcmToken.query.filter_by(user_id=user_id).first()
+        return UserFcmToken.query.filter_by(user_id=user_id).order_by(UserFcmToken.fcm_token_id.desc()).first()
@@ -0,0 +1,75 @@
+import functools
+
+_DEPTH_KEY = 'unit_of_work_depth'
+_AFTER_COMMIT_KEY = 'unit_of_work_after_commit'
+
+
+class UnitOfWork:
+    """
+    하나의 요청(서비스 메서드)을 하나의 트랜잭션으로 묶는다.
+
+        with UnitOfWork(db):
+            ...
+
+    블록 안에서 repository 의 create/update/delete 는 커밋하지 않고(create 는 id 를 위해 flush 만),
+    가장 바깥 블록이 끝날 때 한 번만 커밋한다. 예외가 나거나 커밋이 실패하면 롤백한다.
+    중첩되면 안쪽 블록은 바깥 블록의 트랜잭션에 참여한다.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        info = self.db.session.info
+        info[_DEPTH_KEY] = info.get(_DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        session = self.db.session
+        session.info[_DEPTH_KEY] -= 1
+        if session.info[_DEPTH_KEY] > 0:
+            return False
+
+        callbacks = session.info.pop(_AFTER_COMMIT_KEY, [])
+        if exc_type is not None:
+            session.rollback()
+            return False
+
+        try:
+            session.commit()
+        except Exception:
+            # 커밋 실패(IntegrityError, deadlock 등) 후 세션이 실패한 트랜잭션에 남지 않도록 롤백한다.
+            # 커밋되지 않았으므로 after_commit 콜백은 실행하지 않는다.
+            session.rollback()
+            raise
+        for callback in callbacks:
+            callback()
+        return False
+
+
+def in_unit_of_work(db):
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def after_commit(db, callback):
+    """
+    작업 단위가 커밋된 뒤에 실행할 함수를 등록한다. (캐시 무효화 등)
+    작업 단위 밖이면 바로 실행한다. 롤백되면 실행하지 않는다.
+    """
+    if in_unit_of_work(db):
+        db.session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
+
+
+def transactional(func):
+    """서비스 메서드를 하나의 UnitOfWork 로 실행한다."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        from database import db
+
+        with UnitOfWork(db):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -3,7 +3,7 @@ from http import HTTPStatus
 
 from flask import request
 from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required, \
-    create_refresh_token, decode_token
+    create_refresh_token, get_jwt
 from flask_pydantic import validate
 from flask_restx import Namespace, Resource
 
@@ -11,7 +11,6 @@ from app.common.exceptions import BadRequestError, UnAuthorizedError
 from app.models.model_auth import KakaoAuthRequest, KakaoUserRegisterRequest, KakaoTrainerRegisterRequest
 from app.services.service_auth import AuthService
 from app.services.service_factory import ServiceFactory
-from app.services.service_token import TokenService
 
 ns_auth = Namespace('auth', description='auth api', path='/auth')
 
@@ -21,7 +20,7 @@ class UserKakaoRegisterResource(Resource):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.token_service = TokenService()
+        self.token_service = ServiceFactory.token_service()
         self.auth_service = AuthService()
         self.user_service = ServiceFactory.user_service()
 
@@ -53,7 +52,7 @@ class UserKakaoRegisterResource(Resource):
 class TrainerKakaoAuthResource(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.token_service = TokenService()
+        self.token_service = ServiceFactory.token_service()
         self.auth_service = AuthService()
         self.trainer_service = ServiceFactory.trainer_service()
 
@@ -85,26 +84,24 @@ class TrainerKakaoAuthResource(Resource):
 class RefreshAuthResource(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.token_service = TokenService()
+        self.token_service = ServiceFactory.token_service()
 
     @jwt_required(refresh=True)
     def get(self):
         current_user = get_jwt_identity()
-        refresh_token = request.headers.get('Authorization').split()[1]
+        refresh_claims = get_jwt()
 
+        # 서명과 만료는 jwt_required 에서 검증됨. 교체된 토큰인지만 jti 로 확인한다.
         if 'trainer_id' in current_user:
-            trainer_token = self.token_service.get_trainer_token(current_user['trainer_id'])
-            if not trainer_token or trainer_token.refresh_token != refresh_token:
-                return {"message": "Invalid refresh token"}, HTTPStatus.UNAUTHORIZED,
+            is_valid = self.token_service.is_valid_trainer_token(current_user['trainer_id'], refresh_claims['jti'])
         elif 'user_id' in current_user:
-            user_token = self.token_service.get_user_token(current_user['user_id'])
-            if not user_token or user_token.refresh_token != refresh_token:
-                return {"message": "Invalid refresh token"}, HTTPStatus.UNAUTHORIZED
+            is_valid = self.token_service.is_valid_user_token(current_user['user_id'], refresh_claims['jti'])
         else:
+            is_valid = False
+        if not is_valid:
             return {"message": "Invalid refresh token"}, HTTPStatus.UNAUTHORIZED
 
-        decoded_token = decode_token(refresh_token)
-        token_expiry = datetime.utcfromtimestamp(decoded_token['exp'])
+        token_expiry = datetime.utcfromtimestamp(refresh_claims['exp'])
 
         new_access_token = create_access_token(identity=current_user)
 
@@ -116,7 +113,7 @@ class RefreshAuthResource(Resource):
             elif 'user_id' in current_user:
                 self.token_service.insert_user_token(current_user['user_id'], new_refresh_token)
 
-        response = {"access_token": new_access_token, "refresh_token": refresh_token}
+        response = {"access_token": new_access_token, "refresh_token": request.headers.get('Authorization').split()[1]}
         if new_refresh_token:
             response["refresh_token"] = new_refresh_token
 
@@ -147,7 +144,7 @@ class TokenTypeCheck(Resource):
 class UserKakaoLogin(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.token_service = TokenService()
+        self.token_service = ServiceFactory.token_service()
         self.auth_service = AuthService()
 
     @validate()
@@ -174,7 +171,7 @@ class UserKakaoLogin(Resource):
 class TrainerKakaoLogin(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.token_service = TokenService()
+        self.token_service = ServiceFactory.token_service()
         self.auth_service = AuthService()
 
     @validate()
@@ -1,10 +1,10 @@
-from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_pydantic import validate
 from flask_restx import Namespace, Resource
 from marshmallow import ValidationError
 
-from app.common.constants import const
+from app.common.constants import const, NEXT_CURSOR_HEADER, RESOURCE_OWNER_TRAINER, RESOURCE_OWNER_USER
+from app.common.etag import conditional_get
 from app.common.exceptions import ApplicationError, UnAuthorizedError, BadRequestError
 from app.models.model_change_ticket import ChangeTicketResponse
 from app.models.model_change_ticket import CreateChangeTicketRequest, UpdateChangeTicketRequest
@@ -12,6 +12,16 @@ from app.services.service_factory import ServiceFactory
 
 ns_change_ticket = Namespace('change-ticket', description='Change ticket related operations')
 
+# 목록 조회는 기본적으로 cursor 방식. 다음 페이지 cursor 는 X-Next-Cursor 헤더로 내려준다.
+change_ticket_list_parser = ns_change_ticket.parser()
+change_ticket_list_parser.add_argument('status', type=str, help='Status of the item')
+change_ticket_list_parser.add_argument('cursor', type=str, help='X-Next-Cursor header of the previous page')
+change_ticket_list_parser.add_argument('page', type=int, help='Page number of the item (offset mode)')
+
+
+def _next_cursor_header(next_cursor):
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
 
 @ns_change_ticket.route('')
 class ChangeTicket(Resource):
@@ -98,26 +108,21 @@ class ChangeTicketTrainer(Resource):
         super().__init__(*args, **kwargs)
         self.change_ticket_service = ServiceFactory.change_ticket_service()
 
-    @ns_change_ticket.marshal_list_with(ChangeTicketResponse.trainer_receive_change_ticket_list)
+    @ns_change_ticket.response(200, 'Success', [ChangeTicketResponse.trainer_receive_change_ticket_list])
     @jwt_required()
+    @conditional_get(RESOURCE_OWNER_TRAINER, 'trainer_id')
     def get(self, trainer_id):
         try:
             current_trainer = get_jwt_identity()
             if trainer_id != current_trainer['trainer_id']:
                 raise UnAuthorizedError(message="유효하지 않는 id입니다.")
 
-            parser = ns_change_ticket.parser()
-            parser.add_argument('status', type=str, help='Status of the item')
-            parser.add_argument('page', type=int, help='Page number of the item')
-            args = parser.parse_args()
-
-            change_ticket_list = []
-            for status in args.get('status').split(','):
-                result = self.change_ticket_service.get_change_ticket_list_by_trainer(
-                    trainer_id, status, args.get('page')
-                )
-                change_ticket_list.extend(result)
-            return change_ticket_list
+            args = change_ticket_list_parser.parse_args()
+
+            change_ticket_list, next_cursor = self.change_ticket_service.get_change_ticket_list_by_trainer(
+                trainer_id, args.get('status').split(','), args.get('cursor'), args.get('page')
+            )
+            return change_ticket_list, 200, _next_cursor_header(next_cursor)
         except ValidationError as e:
             return {'message': '입력 데이터가 올바르지 않습니다.', 'errors': e.messages}, 400
         except BadRequestError as e:
@@ -132,19 +137,18 @@ class ChangeTicketUser(Resource):
         super().__init__(*args, **kwargs)
         self.change_ticket_service = ServiceFactory.change_ticket_service()
 
-    @ns_change_ticket.marshal_list_with(ChangeTicketResponse.user_receive_change_ticket_list)
+    @ns_change_ticket.response(200, 'Success', [ChangeTicketResponse.user_receive_change_ticket_list])
     @jwt_required()
+    @conditional_get(RESOURCE_OWNER_USER, 'user_id')
     def get(self, user_id):
         try:
-            parser = ns_change_ticket.parser()
-            parser.add_argument('status', type=str, help='Status of the item')
-            parser.add_argument('page', type=int, help='Page number of the item')
-            args = parser.parse_args()
+            args = change_ticket_list_parser.parse_args()
 
-            change_ticket_list = self.change_ticket_service.get_change_ticket_list_by_user(
-                user_id, args.get('status'), args.get('page')
+            change_ticket_list, next_cursor = self.change_ticket_service.get_change_ticket_list_by_user(
+                user_id, args.get('status').split(',') if args.get('status') else [None],
+                args.get('cursor'), args.get('page')
             )
-            return change_ticket_list
+            return change_ticket_list, 200, _next_cursor_header(next_cursor)
         except ValidationError as e:
             return {'message': '입력 데이터가 올바르지 않습니다.', 'errors': e.messages}, 400
 
@@ -155,12 +159,14 @@ class UserChangeTicketHistory(Resource):
         super().__init__(*args, **kwargs)
         self.change_ticket_service = ServiceFactory.change_ticket_service()
 
-    @ns_change_ticket.marshal_list_with(ChangeTicketResponse.user_send_change_ticket_list)
+    @ns_change_ticket.response(200, 'Success', [ChangeTicketResponse.user_send_change_ticket_list])
     @jwt_required()
+    @conditional_get(RESOURCE_OWNER_USER, 'user_id')
     def get(self, user_id):
-        page = request.args.get('page')
-        result = self.change_ticket_service.get_user_change_ticket_history(user_id, page)
-        return result
+        args = change_ticket_list_parser.parse_args()
+        result, next_cursor = self.change_ticket_service.get_user_change_ticket_history(
+            user_id, args.get('cursor'), args.get('page'))
+        return result, 200, _next_cursor_header(next_cursor)
 
 # 컨트롤러의 역할 : 유효성 검사
 # todo.txt : 중앙집중식 에러 처리. 에러 헨들러 작성.
@@ -1,7 +1,8 @@
 from flask_restx import Namespace, Resource
 from flask import request
 
-from app.services.service_image import ImageService
+from app.common.exceptions import ApplicationError
+from app.services.service_factory import ServiceFactory
 
 ns_image = Namespace('images', description='Image API')
 
@@ -10,7 +11,8 @@ ns_image = Namespace('images', description='Image API')
 class ImagesResource(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.image_service = ImageService()
+        self.image_service = ServiceFactory.image_service()
+        self.trainer_service = ServiceFactory.trainer_service()
 
     def post(self):
         if 'file' not in request.files:
@@ -21,8 +23,12 @@ class ImagesResource(Resource):
         category = request.form['category']
         file = request.files['file']
 
-        s3_key = self.image_service.upload_image(entity, entity_id, file, category)
+        try:
+            s3_key = self.image_service.upload_image(entity, entity_id, file, category)
+        except ApplicationError as e:
+            return {'error': e.message}, e.status_code
         img_url = self.image_service.get_presigned_url(s3_key)
+        _invalidate_trainer_profile(self.trainer_service, s3_key)
 
         return {
             "img_url": img_url
@@ -33,11 +39,19 @@ class ImagesResource(Resource):
 class ImageResource(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.image_service = ImageService()
+        self.image_service = ServiceFactory.image_service()
+        self.trainer_service = ServiceFactory.trainer_service()
 
     def delete(self, s3_key):
         result = self.image_service.delete_image(s3_key=s3_key)
+        _invalidate_trainer_profile(self.trainer_service, s3_key)
         if result:
             return {"message": "success"}, 200
         else:
             return {"error": "File not found"}, 404
+
+
+# 트레이너 프로필 캐시에는 프로필 이미지 url 이 들어 있으므로 이미지가 바뀌면 함께 비운다.
+def _invalidate_trainer_profile(trainer_service, s3_key):
+    if isinstance(s3_key, str) and s3_key.startswith('trainer/'):
+        trainer_service.invalidate_trainer_profile(s3_key.split('/')[1])
@@ -6,9 +6,10 @@ from flask_pydantic import validate
 from flask_restx import Namespace, Resource, fields
 from marshmallow import ValidationError
 
-from app.common.constants import DATETIMEFORMAT, DATEFORMAT
+from app.common.constants import DATETIMEFORMAT, DATEFORMAT, RESOURCE_OWNER_USER, RESOURCE_OWNER_TRAINER
+from app.common.etag import conditional_get
 from app.common.exceptions import ApplicationError, UnAuthorizedError
-from app.models.model_schedule import ScheduleCreateRequest
+from app.models.model_schedule import ScheduleCreateRequest, RecurringScheduleCreateRequest
 from app.services.service_factory import ServiceFactory
 
 ns_schedule = Namespace('schedules', description='Schedules related operations', path='/schedules')
@@ -30,6 +31,20 @@ class Schedules(Resource):
         return result
 
 
+@ns_schedule.route('/recurring')
+class RecurringSchedules(Resource):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.schedule_service = ServiceFactory.schedule_service()
+
+    @validate()
+    def post(self, body: RecurringScheduleCreateRequest):
+        try:
+            return self.schedule_service.create_recurring_schedule(body=body)
+        except ApplicationError as e:
+            return {'message': e.message}, e.status_code
+
+
 @ns_schedule.route('/<int:schedule_id>')
 class Schedule(Resource):
     def __init__(self, *args, **kwargs):
@@ -62,6 +77,7 @@ class UserSchedule(Resource):
         super().__init__(*args, **kwargs)
         self.schedule_service = ServiceFactory.schedule_service()
 
+    @conditional_get(RESOURCE_OWNER_USER, 'user_id')
     def get(self, user_id):
         date_str = request.args.get('date')
         schedule_type = request.args.get('type').upper()
@@ -86,6 +102,7 @@ class TrainerSchedule(Resource):
         self.schedule_service = ServiceFactory.schedule_service()
 
     @jwt_required()
+    @conditional_get(RESOURCE_OWNER_TRAINER, 'trainer_id')
     def get(self, trainer_id):
         current_user = get_jwt_identity()
 
@@ -99,6 +116,33 @@ class TrainerSchedule(Resource):
                                                                  type=schedule_type)
 
 
+@ns_schedule.route('/trainer/<int:trainer_id>/slots')
+class TrainerSlots(Resource):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.schedule_service = ServiceFactory.schedule_service()
+
+    # 여러 날짜의 예약 가능 시간. 날짜마다 type=DAY 로 요청하는 대신 사용한다.
+    @jwt_required()
+    @conditional_get(RESOURCE_OWNER_TRAINER, 'trainer_id')
+    def get(self, trainer_id):
+        current_user = get_jwt_identity()
+
+        if 'trainer_id' not in current_user and 'user_id' not in current_user:
+            raise UnAuthorizedError(message="유효하지 않은 토큰입니다.")
+
+        try:
+            start_date = datetime.strptime(request.args['from'], DATEFORMAT).date()
+            end_date = datetime.strptime(request.args['to'], DATEFORMAT).date()
+        except (KeyError, ValueError):
+            return {'message': 'from, to 는 YYYY-MM-DD 형식이어야 합니다.'}, 400
+
+        try:
+            return self.schedule_service.get_trainer_slots(trainer_id, start_date, end_date)
+        except ApplicationError as e:
+            return {'message': e.message}, e.status_code
+
+
 @ns_schedule.route('/trainer/<int:trainer_id>/users/<int:user_id>')
 class TrainerAssignedUserSchedule(Resource):
     def __init__(self, *args, **kwargs):
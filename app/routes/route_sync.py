@@ -0,0 +1,56 @@
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_restx import Namespace, Resource
+
+from app.common.constants import RESOURCE_OWNER_TRAINER, RESOURCE_OWNER_USER
+from app.common.exceptions import ApplicationError, UnAuthorizedError
+from app.services.service_factory import ServiceFactory
+
+ns_sync = Namespace('sync', description='Delta sync of schedules and change tickets', path='/sync')
+
+sync_parser = ns_sync.parser()
+sync_parser.add_argument('cursor', type=int, help='이전 응답의 cursor. 없으면 현재 cursor 만 반환한다.')
+
+SYNC_DESCRIPTION = ('cursor 이후 변경된 스케쥴, 변경 티켓, 수업(trainer_user)을 현재 값으로, 삭제된 항목은 deleted 에 id 로 반환한다. '
+                    'has_more 가 true 이면 응답의 cursor 로 다시 요청한다. '
+                    '처음 동기화할 때와 410 을 받았을 때는 cursor 없이 요청해 cursor 를 먼저 받은 뒤 전체 데이터를 조회하고, '
+                    '그 cursor 부터 이어서 요청한다. (순서를 바꾸면 전체 조회와 cursor 사이의 변경이 누락된다)')
+
+
+@ns_sync.route('/trainer/<int:trainer_id>')
+class TrainerSync(Resource):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sync_service = ServiceFactory.sync_service()
+
+    @ns_sync.doc(description=SYNC_DESCRIPTION)
+    @ns_sync.expect(sync_parser)
+    @jwt_required()
+    def get(self, trainer_id):
+        try:
+            if get_jwt_identity().get('trainer_id') != trainer_id:
+                raise UnAuthorizedError(message="유효하지 않는 id입니다.")
+
+            args = sync_parser.parse_args()
+            return self.sync_service.get_changes(RESOURCE_OWNER_TRAINER, trainer_id, args.get('cursor'))
+        except ApplicationError as e:
+            return {'message': e.message}, e.status_code
+
+
+@ns_sync.route('/user/<int:user_id>')
+class UserSync(Resource):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sync_service = ServiceFactory.sync_service()
+
+    @ns_sync.doc(description=SYNC_DESCRIPTION)
+    @ns_sync.expect(sync_parser)
+    @jwt_required()
+    def get(self, user_id):
+        try:
+            if get_jwt_identity().get('user_id') != user_id:
+                raise UnAuthorizedError(message="유효하지 않는 id입니다.")
+
+            args = sync_parser.parse_args()
+            return self.sync_service.get_changes(RESOURCE_OWNER_USER, user_id, args.get('cursor'))
+        except ApplicationError as e:
+            return {'message': e.message}, e.status_code
@@ -46,7 +46,10 @@ class TrainerResource(Resource):
             raise UnAuthorizedError(message="유효하지 않는 id입니다.")
 
         data = ns_trainer.payload
-        return self.trainer_service.update_trainer(trainer_id, data)
+        try:
+            return self.trainer_service.update_trainer(trainer_id, data)
+        except BadRequestError as e:
+            return {'message': e.message}, 400
 
 
 trainer_user_model = ns_trainer.model('TrainingUser', {
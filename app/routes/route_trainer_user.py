@@ -18,7 +18,7 @@ class TrainerUsers(Resource):
         super().__init__(*args, **kwargs)
         self.tu_service = ServiceFactory.trainer_user_service()
 
-    @ns_trainer_user.marshal_with(users_of_trainer)
+    @ns_trainer_user.response(200, 'Success', users_of_trainer)
     @jwt_required()
     def get(self, trainer_id):
         current_trainer = get_jwt_identity()
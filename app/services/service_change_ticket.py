@@ -1,17 +1,56 @@
 from marshmallow import ValidationError
 
 from app.common.constants import CHANGE_TICKET_STATUS_APPROVED, CHANGE_TICKET_STATUS_REJECTED, \
-    CHANGE_TICKET_TYPE_MODIFY, CHANGE_TICKET_STATUS_CANCELED, DATETIMEFORMAT, SCHEDULE_MODIFIED, SCHEDULE_CANCELLED, \
-    CHANGE_TICKET_STATUS_WAITING, const, SCHEDULE_MODIFIED_WITHOUT_RANGE_VALIDATION
+    CHANGE_TICKET_STATUS_CANCELED, SCHEDULE_MODIFIED, SCHEDULE_CANCELLED, \
+    CHANGE_TICKET_STATUS_WAITING, const, SCHEDULE_MODIFIED_WITHOUT_RANGE_VALIDATION, SYNC_ENTITY_CHANGE_TICKET, \
+    SYNC_OPERATION_UPSERT, SYNC_OPERATION_DELETE
 from app.common.exceptions import ApplicationError, BadRequestError
 from app.entities.entity_change_ticket import ChangeTicket
 from app.models.model_change_ticket import CreateChangeTicketRequest, UpdateChangeTicketRequest
+from app.repositories.unit_of_work import transactional
+from app.utils.util_serializer import compile_serializer, serialize_rows
+from app.utils.util_time import to_datetime
+
+# 목록 응답 행 변환. 날짜는 응답 인코더가 DATETIMEFORMAT 으로 바꾼다.
+_trainer_change_ticket = compile_serializer({
+    'id': 'id',
+    'user_name': 'user_name',
+    'change_ticket_type': 'change_ticket_type',
+    'as_is_date': 'as_is_date',
+    'to_be_date': 'to_be_date',
+    'created_at': 'created_at',
+    'change_ticket_status': 'change_ticket_status',
+    'user_message': 'user_message',
+    'trainer_message': 'trainer_message'
+})
+_user_change_ticket = compile_serializer({
+    'id': 'id',
+    'trainer_name': 'trainer_name',
+    'change_ticket_type': 'change_ticket_type',
+    'as_is_date': 'as_is_date',
+    'to_be_date': 'to_be_date',
+    'created_at': 'created_at',
+    'change_ticket_status': 'change_ticket_status',
+    'user_message': 'user_message',
+    'trainer_message': 'trainer_message'
+})
+_user_change_ticket_history = compile_serializer({
+    'id': 'id',
+    'trainer_name': 'trainer_name',
+    'change_ticket_type': 'change_type',
+    'as_is_date': 'as_is_date',
+    'to_be_date': 'request_time',
+    'created_at': 'created_at',
+    'change_ticket_status': 'status',
+    'user_message': 'description',
+    'trainer_message': 'reject_reason'
+})
 
 
 class ChangeTicketService:
     def __init__(self, change_ticket_repository, schedule_repository, schedule_service, user_repository,
                  trainer_user_repository, trainer_repository, message_service, user_fcm_token_repository,
-                 trainer_fcm_token_repository):
+                 trainer_fcm_token_repository, resource_version_service):
         self.change_ticket_repository = change_ticket_repository
         self.schedule_repository = schedule_repository
         self.schedule_service = schedule_service
@@ -21,18 +60,21 @@ class ChangeTicketService:
         self.message_service = message_service
         self.user_fcm_token_repository = user_fcm_token_repository
         self.trainer_fcm_token_repository = trainer_fcm_token_repository
+        self.resource_version_service = resource_version_service
 
     def get_change_ticket_by_id(self, change_ticket_id) -> dict:
-        change_ticket: ChangeTicket = self.change_ticket_repository.get(change_ticket_id)
-        if not change_ticket:
+        row = self.change_ticket_repository.select_change_ticket_with_lesson_by_id(change_ticket_id)
+        if not row:
             raise BadRequestError(message=f"존재하지 않는 Change Ticket 입니다. {change_ticket_id}")
 
-        result = change_ticket.__dict__
+        change_ticket: ChangeTicket = row.ChangeTicket
+        result = dict(change_ticket.__dict__)
 
         result['user_id'] = change_ticket.schedule.lesson.user_id
         result['trainer_id'] = change_ticket.schedule.lesson.trainer_id
         return result
 
+    @transactional
     def create_change_ticket(self, data: CreateChangeTicketRequest):
         schedule = self.schedule_repository.get(data.schedule_id)
         if schedule is None:
@@ -49,11 +91,12 @@ class ChangeTicketService:
             change_from=data.change_from,
             change_type=data.change_type,
             description=data.change_reason,
-            request_time=data.start_time,
-            as_is_date=data.as_is_date
+            request_time=to_datetime(data.start_time),
+            as_is_date=to_datetime(data.as_is_date)
         )
 
-        change_ticket = self.change_ticket_repository.create(new_change_ticket)
+        # 알림 데이터에 티켓 id 가 필요하므로 flush 만 하고 커밋은 알림 저장 후에 한다.
+        self.change_ticket_repository.add(new_change_ticket)
 
         lesson = schedule.lesson
 
@@ -63,12 +106,14 @@ class ChangeTicketService:
         # 트레이너에게 전송
         if data.change_from == const.CHANGE_FROM_USER:
             sender_name = self.user_repository.get(lesson.user_id).user_name
-            receiver_fcm_token = self.trainer_fcm_token_repository.get_by_trainer_id(lesson.trainer_id).fcm_token
+            trainer_fcm_token = self.trainer_fcm_token_repository.get_by_trainer_id(lesson.trainer_id)
+            receiver_fcm_token = trainer_fcm_token.fcm_token if trainer_fcm_token else None
 
         # 유저에게 전송
         if data.change_from == const.CHANGE_FROM_TRAINER:
             sender_name = self.trainer_repository.get(lesson.trainer_id).trainer_name
-            receiver_fcm_token = self.user_fcm_token_repository.get_by_user_id(lesson.user_id).fcm_token
+            user_fcm_token = self.user_fcm_token_repository.get_by_user_id(lesson.user_id)
+            receiver_fcm_token = user_fcm_token.fcm_token if user_fcm_token else None
 
         # 푸쉬 알람 전송
         data = {
@@ -81,27 +126,38 @@ class ChangeTicketService:
                                           body=f'{sender_name}님이 수업 {change_type} 신청을 하였습니다.',
                                           token=receiver_fcm_token, data=data)
 
-        return change_ticket
+        self.resource_version_service.bump_lesson(lesson.trainer_id, lesson.user_id, [
+            (SYNC_ENTITY_CHANGE_TICKET, new_change_ticket.id, SYNC_OPERATION_UPSERT)
+        ])
+        return self.change_ticket_repository.update(new_change_ticket)
 
+    @transactional
     def handle_update_change_ticket(self, change_ticket_id, data: UpdateChangeTicketRequest):
-        change_ticket_to_update = self.change_ticket_repository.get(change_ticket_id)
-        if not change_ticket_to_update:
+        row = self.change_ticket_repository.select_change_ticket_with_lesson_by_id(change_ticket_id)
+        if not row:
             raise ApplicationError(f"존재하지 않는 change ticket {change_ticket_id}", 400)
+        change_ticket_to_update = row.ChangeTicket
         if change_ticket_to_update.status != CHANGE_TICKET_STATUS_WAITING:
             raise ApplicationError(f"이미 처리된 Change Ticket 입니다. {change_ticket_id}", 400)
 
+        start_time = to_datetime(data.start_time)
+
+        # 알림에 필요한 값은 함께 조회한 결과에서 미리 꺼내 둔다.
+        trainer_name = change_ticket_to_update.schedule.lesson.trainer.trainer_name
+        user_fcm_token = row.user_fcm_token
+
         # 요청 승인은 트레이너가 하는 것.
         if data.status == CHANGE_TICKET_STATUS_APPROVED:
             if change_ticket_to_update.change_type == const.CHANGE_TICKET_TYPE_CANCEL:
                 self.schedule_service.handle_change_user_schedule(
-                    change_ticket_to_update.schedule_id, data.start_time, SCHEDULE_CANCELLED)
+                    change_ticket_to_update.schedule_id, start_time, SCHEDULE_CANCELLED)
             elif change_ticket_to_update.change_type == const.CHANGE_TICKET_TYPE_MODIFY:
                 self.schedule_service.handle_change_user_schedule(
-                    change_ticket_to_update.schedule_id, data.start_time, SCHEDULE_MODIFIED_WITHOUT_RANGE_VALIDATION)
+                    change_ticket_to_update.schedule_id, start_time, SCHEDULE_MODIFIED_WITHOUT_RANGE_VALIDATION)
         # 요청 취소는 유저가 하는 것.
         elif data.status == CHANGE_TICKET_STATUS_CANCELED:
             self.schedule_service.handle_change_user_schedule(
-                change_ticket_to_update.schedule_id, data.start_time, SCHEDULE_CANCELLED)
+                change_ticket_to_update.schedule_id, start_time, SCHEDULE_CANCELLED)
         # 요청 거절은 트레이너가 하는 것.
         elif data.status == CHANGE_TICKET_STATUS_REJECTED:
             change_ticket_to_update.reject_reason = data.reject_reason
@@ -109,24 +165,26 @@ class ChangeTicketService:
         change_ticket_to_update.description = data.change_reason
         change_ticket_to_update.status = data.status
 
-        self.change_ticket_repository.update(change_ticket_to_update)
-
         # 유저에게 푸쉬알림 전송
         if data.status in [CHANGE_TICKET_STATUS_APPROVED, CHANGE_TICKET_STATUS_REJECTED]:
             change_ticket_result = '승인'
             if data.status == CHANGE_TICKET_STATUS_REJECTED:
                 change_ticket_result = '거절'
 
-            lesson = change_ticket_to_update.schedule.lesson
-            trainer = lesson.trainer
-            user_fcm_token = self.user_fcm_token_repository.get_by_user_id(user_id=lesson.user_id)
             data = {
                 'change_ticket': change_ticket_to_update
             }
             self.message_service.send_message(title=f'요청 {change_ticket_result}',
-                                              body=f'{trainer.trainer_name}님이 요청을 {change_ticket_result}하였습니다.',
-                                              token=user_fcm_token.fcm_token, data=data)
+                                              body=f'{trainer_name}님이 요청을 {change_ticket_result}하였습니다.',
+                                              token=user_fcm_token, data=data)
+
+        lesson = change_ticket_to_update.schedule.lesson
+        self.resource_version_service.bump_lesson(lesson.trainer_id, lesson.user_id, [
+            (SYNC_ENTITY_CHANGE_TICKET, change_ticket_id, SYNC_OPERATION_UPSERT)
+        ])
+        self.change_ticket_repository.update(change_ticket_to_update)
 
+    @transactional
     def delete_change_ticket(self, change_ticket_id):
         change_ticket = self.change_ticket_repository.get(change_ticket_id)
         if not change_ticket:
@@ -135,61 +193,28 @@ class ChangeTicketService:
         if change_ticket.status != CHANGE_TICKET_STATUS_WAITING:
             raise BadRequestError(message='이미 결정된 티켓은 철회할 수 없습니다.')
 
+        lesson = change_ticket.schedule.lesson
+        self.resource_version_service.bump_lesson(lesson.trainer_id, lesson.user_id, [
+            (SYNC_ENTITY_CHANGE_TICKET, change_ticket.id, SYNC_OPERATION_DELETE)
+        ])
         self.change_ticket_repository.delete(change_ticket)
 
-    def get_change_ticket_list_by_trainer(self, trainer_id, status, page):
+    # 반환값: (결과 목록, 다음 페이지 cursor)
+    def get_change_ticket_list_by_trainer(self, trainer_id, statuses, cursor=None, page=None):
         if not self.trainer_repository.get(trainer_id):
             raise BadRequestError("존재하지 않는 트레이너 입니다.")
-        change_tickets = self.change_ticket_repository.select_change_tickets_by_trainer_id(trainer_id, status,
-                                                                                           page=page)
-
-        results = []
-        for ticket in change_tickets:
-            result = {
-                'id': ticket.id,
-                'user_name': ticket.user_name,
-                'change_ticket_type': ticket.change_ticket_type,
-                'as_is_date': ticket.as_is_date,
-                'to_be_date': ticket.to_be_date if ticket.change_ticket_type == CHANGE_TICKET_TYPE_MODIFY else None,
-                'created_at': ticket.created_at,
-                'change_ticket_status': ticket.change_ticket_status,
-                'user_message': ticket.user_message,
-                'trainer_message': None
-            }
-            results.append(result)
-
-        return results
-
-    def get_change_ticket_list_by_user(self, user_id, status, page):
-        change_tickets = self.change_ticket_repository.select_change_tickets_by_user_id(user_id, status, page)
-
-        results = []
-        for ticket in change_tickets:
-            result = {
-                'id': ticket.id,
-                'trainer_name': ticket.trainer_name,
-                'change_ticket_type': ticket.change_ticket_type,
-                'as_is_date': ticket.as_is_date,
-                'to_be_date': ticket.to_be_date if ticket.change_ticket_type == CHANGE_TICKET_TYPE_MODIFY else None,
-                'created_at': ticket.created_at,
-                'change_ticket_status': ticket.change_ticket_status,
-                'user_message': ticket.user_message,
-                'trainer_message': ticket.trainer_message
-            }
-            results.append(result)
-
-        return results
-
-    def get_user_change_ticket_history(self, user_id, page=None):
-        change_tickets = self.change_ticket_repository.select_user_change_tickets(user_id, page)
-        return [{
-            "id": ticket.id,
-            "trainer_name": ticket.trainer_name,
-            "change_ticket_type": ticket.change_type,
-            "as_is_date": ticket.as_is_date.strftime(DATETIMEFORMAT),
-            "to_be_date": ticket.request_time.strftime(DATETIMEFORMAT),
-            "created_at": ticket.created_at.strftime(DATETIMEFORMAT),
-            "change_ticket_status": ticket.status,
-            "user_message": ticket.description,
-            "trainer_message": ticket.reject_reason
-        } for ticket in change_tickets]
+        change_tickets, next_cursor = self.change_ticket_repository.select_change_tickets_by_trainer_id(
+            trainer_id, statuses, cursor=cursor, page=page)
+
+        return serialize_rows(_trainer_change_ticket, change_tickets), next_cursor
+
+    def get_change_ticket_list_by_user(self, user_id, statuses, cursor=None, page=None):
+        change_tickets, next_cursor = self.change_ticket_repository.select_change_tickets_by_user_id(
+            user_id, statuses, cursor=cursor, page=page)
+
+        return serialize_rows(_user_change_ticket, change_tickets), next_cursor
+
+    def get_user_change_ticket_history(self, user_id, cursor=None, page=None):
+        change_tickets, next_cursor = self.change_ticket_repository.select_user_change_tickets(
+            user_id, cursor=cursor, page=page)
+        return serialize_rows(_user_change_ticket_history, change_tickets), next_cursor
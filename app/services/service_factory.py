@@ -1,9 +1,18 @@
+import threading
+
 import boto3
 
+from app.common.cache import ReadThroughCache, build_cache_backend, build_shared_cache_backend
+from app.common.constants import TRAINER_PROFILE_CACHE_MAXSIZE, TRAINER_PROFILE_CACHE_TTL, REFRESH_TOKEN_CACHE_TTL
+from app.repositories.repository_change_log import ChangeLogRepository
 from app.repositories.repository_change_ticket import ChangeTicketRepository
+from app.repositories.repository_notification_outbox import NotificationOutboxRepository
+from app.repositories.repository_resource_version import ResourceVersionRepository
 from app.repositories.repository_schedule import ScheduleRepository
+from app.repositories.repository_token import TokenRepository
 from app.repositories.repository_trainer import TrainerRepository
 from app.repositories.repository_trainer_availability import TrainerAvailabilityRepository
+from app.repositories.repository_trainer_day_occupancy import TrainerDayOccupancyRepository
 from app.repositories.repository_trainer_fcm_token import TrainerFcmTokenRepository
 from app.repositories.repository_trainer_user import TrainerUserRepository
 from app.repositories.repository_user_fcm_token import UserFcmTokenRepository
@@ -11,7 +20,12 @@ from app.repositories.repository_users import UserRepository
 from app.services.service_change_ticket import ChangeTicketService
 from app.services.service_fcm import FcmService
 from app.services.service_image import ImageService
+from app.services.service_kakao import KakaoService
+from app.services.service_notification import NotificationService
+from app.services.service_resource_version import ResourceVersionService
 from app.services.service_schedule import ScheduleService
+from app.services.service_sync import SyncService
+from app.services.service_token import TokenService
 from app.services.service_trainer import TrainerService
 from app.services.service_trainer_user import TrainerUserService
 from app.services.service_user import UserService
@@ -19,61 +33,153 @@ from database import db
 
 
 class ServiceFactory:
-    @staticmethod
-    def user_service():
-        return UserService(
-            user_repository=UserRepository(db=db),
-            user_fcm_repository=UserFcmTokenRepository(db=db)
-        )
-
-    @staticmethod
-    def change_ticket_service():
-        return ChangeTicketService(
-            change_ticket_repository=ChangeTicketRepository(db=db),
-            schedule_repository=ScheduleRepository(db=db),
-            schedule_service=ServiceFactory.schedule_service(),
-            user_repository=UserRepository(db=db),
-            trainer_user_repository=TrainerUserRepository(db=db),
-            trainer_repository=TrainerRepository(db=db),
-            message_service=FcmService(),
-            user_fcm_token_repository=UserFcmTokenRepository(db=db),
-            trainer_fcm_token_repository=TrainerFcmTokenRepository(db=db)
-        )
-
-    @staticmethod
-    def trainer_service():
-        return TrainerService(
-            trainer_repository=TrainerRepository(db=db),
-            trainer_availability_repository=TrainerAvailabilityRepository(db=db),
-            trainer_fcm_repository=TrainerFcmTokenRepository(db=db),
-            image_service=ServiceFactory.image_service(),
-            trainer_user_repository=TrainerUserRepository(db=db)
-        )
-
-    @staticmethod
-    def schedule_service():
-        return ScheduleService(
-            schedule_repository=ScheduleRepository(db=db),
-            trainer_availability_repository=TrainerAvailabilityRepository(db=db),
-            trainer_user_repository=TrainerUserRepository(db=db),
-            trainer_repository=TrainerRepository(db=db),
-            message_service=FcmService(),
-            trainer_fcm_token_repository=TrainerFcmTokenRepository(db=db),
-            user_repository=UserRepository(db=db)
-        )
-
-    @staticmethod
-    def image_service():
-        return ImageService(
-            s3=boto3.client('s3'),
+    """
+    워커 프로세스 단위의 서비스 컨테이너.
+
+    서비스와 레포지토리는 요청 상태를 갖지 않으므로(세션은 Flask-SQLAlchemy 의 scoped session 사용)
+    처음 요청될 때 한 번 만들어 재사용한다. boto3 client 도 스레드 안전하므로 하나만 만든다.
+    테스트에서는 override 로 인스턴스를 바꿔 끼우고 reset 으로 캐시를 비운다.
+    """
+    _instances = {}
+    # 서비스 생성 중 다른 서비스를 다시 요청하므로 재진입 가능한 락을 사용
+    _lock = threading.RLock()
+
+    @classmethod
+    def _get(cls, name, builder):
+        instance = cls._instances.get(name)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(name)
+                if instance is None:
+                    instance = builder()
+                    cls._instances[name] = instance
+        return instance
+
+    @classmethod
+    def _repository(cls, repository_class):
+        return cls._get(repository_class.__name__, lambda: repository_class(db=db))
+
+    @classmethod
+    def override(cls, name, instance):
+        with cls._lock:
+            cls._instances[name] = instance
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._instances.clear()
+
+    @classmethod
+    def s3_client(cls):
+        return cls._get('s3_client', lambda: boto3.client('s3'))
+
+    @classmethod
+    def message_service(cls):
+        return cls._get('message_service', lambda: NotificationService(
+            notification_outbox_repository=cls._repository(NotificationOutboxRepository),
+            sender=FcmService()
+        ))
+
+    @classmethod
+    def kakao_service(cls):
+        # 워커마다 keep-alive 세션을 하나씩 갖도록 post_fork 에서 reset 된 뒤 새로 만든다.
+        return cls._get('kakao_service', lambda: KakaoService())
+
+    @classmethod
+    def token_service(cls):
+        return cls._get('token_service', lambda: TokenService(
+            token_repository=cls._get('TokenRepository', lambda: TokenRepository()),
+            jti_hash_cache=build_shared_cache_backend(namespace='refresh_jti', ttl=REFRESH_TOKEN_CACHE_TTL)
+        ))
+
+    @classmethod
+    def resource_version_service(cls):
+        return cls._get('resource_version_service', lambda: ResourceVersionService(
+            resource_version_repository=cls._repository(ResourceVersionRepository),
+            trainer_user_repository=cls._repository(TrainerUserRepository),
+            change_log_repository=cls._repository(ChangeLogRepository)
+        ))
+
+    @classmethod
+    def sync_service(cls):
+        return cls._get('sync_service', lambda: SyncService(
+            change_log_repository=cls._repository(ChangeLogRepository),
+            schedule_repository=cls._repository(ScheduleRepository),
+            change_ticket_repository=cls._repository(ChangeTicketRepository),
+            trainer_user_repository=cls._repository(TrainerUserRepository)
+        ))
+
+    @classmethod
+    def user_service(cls):
+        return cls._get('user_service', lambda: UserService(
+            user_repository=cls._repository(UserRepository),
+            user_fcm_repository=cls._repository(UserFcmTokenRepository),
+            resource_version_service=cls.resource_version_service()
+        ))
+
+    @classmethod
+    def change_ticket_service(cls):
+        return cls._get('change_ticket_service', lambda: ChangeTicketService(
+            change_ticket_repository=cls._repository(ChangeTicketRepository),
+            schedule_repository=cls._repository(ScheduleRepository),
+            schedule_service=cls.schedule_service(),
+            user_repository=cls._repository(UserRepository),
+            trainer_user_repository=cls._repository(TrainerUserRepository),
+            trainer_repository=cls._repository(TrainerRepository),
+            message_service=cls.message_service(),
+            user_fcm_token_repository=cls._repository(UserFcmTokenRepository),
+            trainer_fcm_token_repository=cls._repository(TrainerFcmTokenRepository),
+            resource_version_service=cls.resource_version_service()
+        ))
+
+    @classmethod
+    def trainer_service(cls):
+        return cls._get('trainer_service', lambda: TrainerService(
+            trainer_repository=cls._repository(TrainerRepository),
+            trainer_availability_repository=cls._repository(TrainerAvailabilityRepository),
+            trainer_fcm_repository=cls._repository(TrainerFcmTokenRepository),
+            image_service=cls.image_service(),
+            trainer_user_repository=cls._repository(TrainerUserRepository),
+            trainer_day_occupancy_repository=cls._repository(TrainerDayOccupancyRepository),
+            trainer_profile_cache=cls.trainer_profile_cache(),
+            resource_version_service=cls.resource_version_service()
+        ))
+
+    @classmethod
+    def trainer_profile_cache(cls):
+        return cls._get('trainer_profile_cache', lambda: ReadThroughCache(build_cache_backend(
+            namespace='trainer_profile',
+            maxsize=TRAINER_PROFILE_CACHE_MAXSIZE,
+            ttl=TRAINER_PROFILE_CACHE_TTL
+        ), name='trainer_profile'))
+
+    @classmethod
+    def schedule_service(cls):
+        return cls._get('schedule_service', lambda: ScheduleService(
+            schedule_repository=cls._repository(ScheduleRepository),
+            trainer_availability_repository=cls._repository(TrainerAvailabilityRepository),
+            trainer_user_repository=cls._repository(TrainerUserRepository),
+            trainer_repository=cls._repository(TrainerRepository),
+            message_service=cls.message_service(),
+            trainer_fcm_token_repository=cls._repository(TrainerFcmTokenRepository),
+            user_repository=cls._repository(UserRepository),
+            trainer_day_occupancy_repository=cls._repository(TrainerDayOccupancyRepository),
+            resource_version_service=cls.resource_version_service()
+        ))
+
+    @classmethod
+    def image_service(cls):
+        return cls._get('image_service', lambda: ImageService(
+            s3=cls.s3_client(),
             bucket='gymming'
-        )
-
-    @staticmethod
-    def trainer_user_service():
-        return TrainerUserService(
-            tu_repository=TrainerUserRepository(db=db),
-            user_repository=UserRepository(db=db),
-            trainer_repository=TrainerRepository(db=db),
-            image_service=ServiceFactory.image_service()
-        )
+        ))
+
+    @classmethod
+    def trainer_user_service(cls):
+        return cls._get('trainer_user_service', lambda: TrainerUserService(
+            tu_repository=cls._repository(TrainerUserRepository),
+            user_repository=cls._repository(UserRepository),
+            trainer_repository=cls._repository(TrainerRepository),
+            image_service=cls.image_service(),
+            resource_version_service=cls.resource_version_service()
+        ))
@@ -4,19 +4,42 @@ from firebase_admin import messaging
 
 
 class FcmService:
+    # 테스트에서는 firebase_admin.messaging 과 같은 인터페이스의 모듈을 주입한다.
+    def __init__(self, messaging_module=messaging):
+        self.messaging = messaging_module
+
     def send_message(self, title, body, token, data=None):
         try:
-            message = messaging.Message(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body
-                ),
-                token=token
-            )
-            if data is not None:
-                message.data = data
-            response = messaging.send(message)
+            message = self._build_message(title, body, token, data)
+            response = self.messaging.send(message)
             return True, response
         except Exception as e:
             logging.error(f'fcm-error: {str(e)}')
             return False, None
+
+    def send_each(self, notifications):
+        """
+        (title, body, token, data) 목록을 한 번의 요청으로 발송한다.
+        반환값: 입력 순서대로 (성공 여부, 예외) 목록
+        """
+        messages = [self._build_message(title, body, token, data) for title, body, token, data in notifications]
+        response = self.messaging.send_each(messages)
+        return [(result.success, result.exception) for result in response.responses]
+
+    def is_permanent_error(self, exception):
+        # 삭제된 토큰은 재시도해도 실패하므로 바로 실패 처리한다.
+        permanent_errors = tuple(getattr(self.messaging, name) for name in ('UnregisteredError', 'SenderIdMismatchError')
+                                 if hasattr(self.messaging, name))
+        return isinstance(exception, permanent_errors)
+
+    def _build_message(self, title, body, token, data=None):
+        message = self.messaging.Message(
+            notification=self.messaging.Notification(
+                title=title,
+                body=body
+            ),
+            token=token
+        )
+        if data is not None:
+            message.data = data
+        return message
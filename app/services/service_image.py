@@ -1,42 +1,63 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from botocore.exceptions import ClientError
+from cachetools import TTLCache
+
+from app.common.constants import PRESIGNED_URL_EXPIRES_IN, PRESIGNED_URL_CACHE_TTL, PRESIGNED_URL_CACHE_MAXSIZE, \
+    IMAGE_MISSING_KEY_CACHE_TTL, IMAGE_HEAD_OBJECT_CONCURRENCY
+from app.common.exceptions import ApplicationError
 
 
 class ImageService:
     def __init__(self, s3, bucket):
         self.s3 = s3
         self.BUCKET_NAME = bucket
+        # s3_key -> presigned url. 존재가 확인된 키만 들어가므로 known-keys 인덱스 역할도 한다.
+        self._url_cache = TTLCache(maxsize=PRESIGNED_URL_CACHE_MAXSIZE, ttl=PRESIGNED_URL_CACHE_TTL)
+        # head_object 결과 404 였던 키
+        self._missing_keys = TTLCache(maxsize=PRESIGNED_URL_CACHE_MAXSIZE, ttl=IMAGE_MISSING_KEY_CACHE_TTL)
+        self._lock = threading.Lock()
 
     def upload_image(self, entity, id, file, prefix):
         s3_key = f'{entity}/{id}/{prefix}'
         try:
             self.s3.upload_fileobj(file, self.BUCKET_NAME, s3_key)
+            with self._lock:
+                self._missing_keys.pop(s3_key, None)
+                self._url_cache[s3_key] = self._generate_presigned_url(s3_key)
             return s3_key
         except Exception as e:
             print(f"Error uploading file: {e}")
-            return {'error': 'File upload failed'}, 500
+            raise ApplicationError('File upload failed', 500)
 
     def get_presigned_url(self, s3_key):
-        try:
-            # 파일 존재 여부 확인
-            self.s3.head_object(Bucket=self.BUCKET_NAME, Key=s3_key)
+        return self.get_presigned_urls([s3_key])[s3_key]
 
-            presigned_url = self.s3.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': self.BUCKET_NAME, 'Key': s3_key},
-                ExpiresIn=3600  # URL 유효 기간 (1시간)
-            )
-            return presigned_url
-        except ClientError as e:
-            if e.response['Error']['Code'] == '404':
-                return None
-            else:
-                logging.error(f"Error generating presigned URL: {e}")
-                return None
-        except Exception as e:
-            logging.error(f"Unexpected error: {e}")
-            return None
+    def get_presigned_urls(self, s3_keys):
+        """
+        여러 키의 presigned url 을 한 번에 조회한다. 존재하지 않는 키는 None.
+        캐시에 없는 키만 head_object 로 존재 여부를 확인하고, 확인은 병렬로 수행한다.
+        """
+        results = {}
+        unknown_keys = []
+        with self._lock:
+            for s3_key in dict.fromkeys(s3_keys):
+                if s3_key in self._url_cache:
+                    results[s3_key] = self._url_cache[s3_key]
+                elif s3_key in self._missing_keys:
+                    results[s3_key] = None
+                else:
+                    unknown_keys.append(s3_key)
+
+        if len(unknown_keys) == 1:
+            results[unknown_keys[0]] = self._load_presigned_url(unknown_keys[0])
+        elif unknown_keys:
+            with ThreadPoolExecutor(max_workers=min(IMAGE_HEAD_OBJECT_CONCURRENCY, len(unknown_keys))) as executor:
+                results.update(zip(unknown_keys, executor.map(self._load_presigned_url, unknown_keys)))
+
+        return results
 
     def delete_image(self, entity=None, id=None, prefix=None, s3_key=None):
         try:
@@ -44,9 +65,40 @@ class ImageService:
                 s3_key = f'{entity}/{id}/{prefix}'
 
             self.s3.delete_object(Bucket=self.BUCKET_NAME, Key=s3_key)
+            with self._lock:
+                self._url_cache.pop(s3_key, None)
+                self._missing_keys[s3_key] = True
             return True
         except ClientError as e:
             if e.response['Error']['Code'] == "NoSuchKey":
                 return False
             else:
                 raise e
+
+    def _load_presigned_url(self, s3_key):
+        try:
+            # 파일 존재 여부 확인
+            self.s3.head_object(Bucket=self.BUCKET_NAME, Key=s3_key)
+            presigned_url = self._generate_presigned_url(s3_key)
+        except ClientError as e:
+            if e.response['Error']['Code'] == '404':
+                with self._lock:
+                    self._missing_keys[s3_key] = True
+            else:
+                logging.error(f"Error generating presigned URL: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"Unexpected error: {e}")
+            return None
+
+        with self._lock:
+            self._url_cache[s3_key] = presigned_url
+        return presigned_url
+
+    def _generate_presigned_url(self, s3_key):
+        # 서명은 로컬에서 계산되므로 네트워크 요청이 없다.
+        return self.s3.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.BUCKET_NAME, 'Key': s3_key},
+            ExpiresIn=PRESIGNED_URL_EXPIRES_IN  # URL 유효 기간 (1시간)
+        )
@@ -0,0 +1,66 @@
+import hashlib
+import logging
+import threading
+from http import HTTPStatus
+
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+
+from app.common.constants import KAKAO_API_BASE_URL, KAKAO_CONNECT_TIMEOUT_SECONDS, KAKAO_READ_TIMEOUT_SECONDS, \
+    KAKAO_HTTP_POOL_SIZE, KAKAO_TOKEN_CACHE_TTL, KAKAO_TOKEN_CACHE_MAXSIZE
+from app.common.exceptions import BadRequestError
+
+
+class KakaoService:
+    """
+    카카오 로그인 토큰을 social_id 로 바꾼다.
+
+    /v2/user/me 는 유효하지 않은 토큰에 401 을 주므로 토큰 검증(access_token_info)과 사용자 조회를 한 번의 요청으로 처리한다.
+    워커 프로세스 안에서 keep-alive 세션을 재사용하고, 검증된 토큰은 짧게 캐시해
+    로그인/회원가입 재시도에서 다시 카카오를 호출하지 않는다. 캐시 키는 토큰의 sha256 이다.
+    """
+
+    def __init__(self, session=None, base_url=KAKAO_API_BASE_URL):
+        self.base_url = base_url
+        self.session = session or self._create_session()
+        self.timeout = (KAKAO_CONNECT_TIMEOUT_SECONDS, KAKAO_READ_TIMEOUT_SECONDS)
+        self._social_ids = TTLCache(maxsize=KAKAO_TOKEN_CACHE_MAXSIZE, ttl=KAKAO_TOKEN_CACHE_TTL)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_session():
+        session = requests.Session()
+        # 연결 실패만 한 번 재시도한다. (max_retries 정수는 읽기 실패는 재시도하지 않는다)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=KAKAO_HTTP_POOL_SIZE, max_retries=1)
+        session.mount('https://', adapter)
+        return session
+
+    def get_social_id(self, token):
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        with self._lock:
+            social_id = self._social_ids.get(cache_key)
+        if social_id is not None:
+            return social_id
+
+        kakao_user_info = self._get_user_info(token)
+        social_id = f'kakao{kakao_user_info["id"]}'
+        with self._lock:
+            self._social_ids[cache_key] = social_id
+        return social_id
+
+    def _get_user_info(self, token):
+        try:
+            response = self.session.get(f'{self.base_url}/v2/user/me',
+                                        headers={'Authorization': f'Bearer {token}'},
+                                        timeout=self.timeout)
+        except requests.RequestException as e:
+            logging.error(f'kakao-error: {str(e)}')
+            raise BadRequestError(message="카카오 서비스 이상. 다시 요청해주세요.")
+
+        if response.status_code == HTTPStatus.UNAUTHORIZED:
+            raise BadRequestError(message="유효한 토큰이 아닙니다.")
+        if response.status_code != HTTPStatus.OK:
+            raise BadRequestError(message="카카오 서비스 이상. 다시 요청해주세요.")
+
+        return response.json()
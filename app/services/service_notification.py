@@ -0,0 +1,78 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+from app.common.constants import NOTIFICATION_STATUS_SENT, NOTIFICATION_STATUS_FAILED, NOTIFICATION_BATCH_SIZE, \
+    NOTIFICATION_MAX_ATTEMPTS, NOTIFICATION_RETRY_BASE_SECONDS
+from app.entities.entity_notification_outbox import NotificationOutbox
+
+
+class NotificationService:
+    """
+    푸쉬 알림을 바로 보내지 않고 notification_outbox 에 저장한다.
+    저장은 커밋하지 않으므로 호출한 쪽의 비즈니스 변경과 같은 트랜잭션으로 커밋된다.
+    실제 발송은 notification-worker 가 dispatch_pending 으로 수행한다.
+    """
+
+    def __init__(self, notification_outbox_repository, sender):
+        self.notification_outbox_repository = notification_outbox_repository
+        self.sender = sender
+
+    def send_message(self, title, body, token, data=None):
+        # 받는 사람의 FCM 토큰이 없으면 보낼 곳이 없으므로 대기열에 저장하지 않는다.
+        if not token:
+            return None
+        outbox = NotificationOutbox(title=title, body=body, token=token, data=self._serialize_data(data))
+        self.notification_outbox_repository.add(outbox)
+        return outbox
+
+    def dispatch_pending(self, batch_size=NOTIFICATION_BATCH_SIZE):
+        """대기 중인 알림을 한 번에 발송하고 결과를 기록한다. 처리한 알림 수를 반환한다."""
+        now = datetime.utcnow()
+        outboxes = self.notification_outbox_repository.select_pending_for_update(now, batch_size)
+        if not outboxes:
+            self.notification_outbox_repository.commit()
+            return 0
+
+        try:
+            results = self.sender.send_each([
+                (outbox.title, outbox.body, outbox.token, json.loads(outbox.data) if outbox.data else None)
+                for outbox in outboxes
+            ])
+        except Exception as e:
+            logging.error(f'fcm-error: {str(e)}')
+            results = [(False, e)] * len(outboxes)
+
+        for outbox, (success, exception) in zip(outboxes, results):
+            outbox.attempts += 1
+            if success:
+                outbox.status = NOTIFICATION_STATUS_SENT
+                outbox.sent_at = now
+                outbox.last_error = None
+                continue
+
+            outbox.last_error = str(exception)[:255] if exception else None
+            if outbox.attempts >= NOTIFICATION_MAX_ATTEMPTS or self.sender.is_permanent_error(exception):
+                outbox.status = NOTIFICATION_STATUS_FAILED
+            else:
+                # 30초, 1분, 2분, 4분 ... 간격으로 재시도
+                outbox.next_attempt_at = now + timedelta(
+                    seconds=NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (outbox.attempts - 1))
+
+        self.notification_outbox_repository.commit()
+        return len(outboxes)
+
+    @staticmethod
+    def _serialize_data(data):
+        # FCM data 는 문자열 값만 허용하므로 엔티티는 to_dict 결과를 JSON 으로 바꿔 저장한다.
+        if data is None:
+            return None
+
+        payload = {}
+        for key, value in data.items():
+            if hasattr(value, 'to_dict'):
+                value = json.dumps(value.to_dict(), ensure_ascii=False)
+            elif not isinstance(value, str):
+                value = str(value)
+            payload[key] = value
+        return json.dumps(payload, ensure_ascii=False)
@@ -0,0 +1,37 @@
+from app.common.constants import RESOURCE_OWNER_TRAINER, RESOURCE_OWNER_USER
+
+
+class ResourceVersionService:
+    """
+    트레이너/회원별 조회 응답 버전 관리. (app.common.etag 의 조건부 조회에 사용)
+
+    스케쥴, 변경 티켓 목록처럼 폴링되는 조회 결과를 바꾸는 쓰기는 같은 트랜잭션 안에서 bump_* 를 호출해야 한다.
+    호출이 빠지면 클라이언트가 바뀐 결과 대신 304 를 받는다.
+    """
+
+    def __init__(self, resource_version_repository, trainer_user_repository, change_log_repository):
+        self.resource_version_repository = resource_version_repository
+        self.trainer_user_repository = trainer_user_repository
+        self.change_log_repository = change_log_repository
+
+    def get_version(self, owner_type, owner_id):
+        return self.resource_version_repository.select_version(owner_type, owner_id)
+
+    # 수업(trainer_user) 하나의 스케쥴/변경 티켓이 바뀌면 트레이너와 회원 양쪽 조회가 바뀐다.
+    # changes: /sync 로 내려줄 변경 (entity_type, entity_id, operation) 목록.
+    # 버전 행을 먼저 갱신(잠금)한 뒤 변경 기록을 쓰므로 같은 트레이너/회원의 change_id 는 커밋 순서대로 늘어난다.
+    def bump_lesson(self, trainer_id, user_id, changes=()):
+        self.resource_version_repository.bump([(RESOURCE_OWNER_TRAINER, trainer_id), (RESOURCE_OWNER_USER, user_id)])
+        self.change_log_repository.add_changes(trainer_id, user_id, changes)
+
+    # 트레이너 정보(이름, 센터, 수업 시간 등)는 담당 회원의 스케쥴 조회에도 나온다.
+    def bump_trainer(self, trainer_id):
+        user_ids = self.trainer_user_repository.select_user_ids_by_trainer_id(trainer_id)
+        self.resource_version_repository.bump(
+            [(RESOURCE_OWNER_TRAINER, trainer_id)] + [(RESOURCE_OWNER_USER, user_id) for user_id in user_ids])
+
+    # 회원 이름은 담당 트레이너의 변경 티켓 목록에도 나온다.
+    def bump_user(self, user_id):
+        trainer_ids = self.trainer_user_repository.select_trainer_ids_by_user_id(user_id)
+        self.resource_version_repository.bump(
+            [(RESOURCE_OWNER_USER, user_id)] + [(RESOURCE_OWNER_TRAINER, trainer_id) for trainer_id in trainer_ids])
@@ -1,17 +1,52 @@
+from bisect import bisect_right
 from calendar import monthrange
 from datetime import datetime, timedelta
 
 from app.common.constants import DATEFORMAT, SCHEDULE_MODIFIED, SCHEDULE_CANCELLED, SCHEDULE_TYPE_MONTH, \
     SCHEDULE_TYPE_DAY, SCHEDULE_TYPE_WEEK, DATETIMEFORMAT, SCHEDULE_SCHEDULED, \
-    SCHEDULE_MODIFIED_WITHOUT_RANGE_VALIDATION
+    SCHEDULE_MODIFIED_WITHOUT_RANGE_VALIDATION, SYNC_ENTITY_SCHEDULE, SYNC_ENTITY_TRAINER_USER, \
+    SYNC_OPERATION_UPSERT, SYNC_OPERATION_DELETE, SLOT_RANGE_MAX_DAYS, RECURRING_SCHEDULE_MAX_COUNT, \
+    DEFAULT_LESSON_MINUTES
 from app.common.exceptions import BadRequestError, ApplicationError, ResourceNotFound
 from app.entities.entity_schedule import Schedule
+from app.utils.util_serializer import compile_serializer, serialize_rows
+from app.utils.util_slot import compute_day_slots, compute_slot_grids
+from app.utils.util_time import get_month_range, get_recurring_datetimes
+from app.repositories.unit_of_work import transactional
+
+# 목록 응답 행 변환. schedule_start_time 은 응답 인코더가 DATETIMEFORMAT 으로 바꾼다.
+_user_day_schedule = compile_serializer({
+    "schedule_id": "schedule_id",
+    "trainer_id": "trainer_id",
+    "schedule_start_time": "schedule_start_time",
+    "lesson_name": "lesson_name",
+    "trainer_name": "trainer_name",
+    "center_name": "center_name",
+    "center_location": "center_location",
+    "lesson_change_range": "lesson_change_range",
+    "lesson_minutes": "lesson_minutes"
+})
+_trainer_week_schedule = compile_serializer({
+    "user_id": "user_id",
+    "user_name": "user_name",
+    "schedule_start_time": "schedule_start_time"
+})
+_trainer_user_schedule = compile_serializer({
+    "schedule_id": "schedule_id",
+    "schedule_start_time": "schedule_start_time"
+})
+
+
+def _lesson_minutes(lesson_minutes):
+    # lesson_minutes 컬럼은 nullable 이다. 값이 없으면 가입 시 기본값으로 충돌/슬롯을 계산한다.
+    return lesson_minutes or DEFAULT_LESSON_MINUTES
 
 
 class ScheduleService:
 
     def __init__(self, schedule_repository, trainer_availability_repository, trainer_user_repository,
-                 trainer_repository, message_service, trainer_fcm_token_repository, user_repository):
+                 trainer_repository, message_service, trainer_fcm_token_repository, user_repository,
+                 trainer_day_occupancy_repository, resource_version_service):
         self.schedule_repository = schedule_repository
         self.trainer_availability_repository = trainer_availability_repository
         self.trainer_user_repository = trainer_user_repository
@@ -19,6 +54,8 @@ class ScheduleService:
         self.message_service = message_service
         self.trainer_fcm_token_repository = trainer_fcm_token_repository
         self.user_repository = user_repository
+        self.trainer_day_occupancy_repository = trainer_day_occupancy_repository
+        self.resource_version_service = resource_version_service
 
     def handle_get_user_schedule(self, user_id, date_str, schedule_type):
         date_obj = datetime.strptime(date_str, "%Y-%m-%d")
@@ -42,24 +79,9 @@ class ScheduleService:
 
     def get_user_day_schedule(self, user_id, year, month, day):
         results = self.schedule_repository.select_day_schedule_by_user_id(user_id, year, month, day)
+        return {"result": serialize_rows(_user_day_schedule, results)}
 
-        data = []
-        for row in results:
-            item = {
-                "schedule_id": row.schedule_id,
-                "trainer_id": row.trainer_id,
-                "schedule_start_time": row.schedule_start_time.strftime(DATETIMEFORMAT),
-                "lesson_name": row.lesson_name,
-                "trainer_name": row.trainer_name,
-                "center_name": row.center_name,
-                "center_location": row.center_location,
-                "lesson_change_range": row.lesson_change_range,
-                "lesson_minutes": row.lesson_minutes
-            }
-            data.append(item)
-
-        return {"result": data}
-
+    @transactional
     def handle_change_user_schedule(self, schedule_id, start_time, status):
         if status == SCHEDULE_MODIFIED:
             return self._change_schedule(schedule_id, start_time)
@@ -76,16 +98,25 @@ class ScheduleService:
             raise ApplicationError(f"Schedule not found {schedule_id}", 404)
 
         trainer_user = self.trainer_user_repository.get(schedule.trainer_user_id)
-        trainer_id = trainer_user.trainer_id
+        trainer = self.trainer_repository.select_for_update(trainer_user.trainer_id)
 
-        conflict_schedule = self.schedule_repository.select_conflict_trainer_schedule_by_time(trainer_id, start_time)
+        conflict_schedule = self.schedule_repository.select_conflict_schedule_by_trainer_id_and_time(
+            trainer.trainer_id, start_time, _lesson_minutes(trainer.lesson_minutes), for_update=True)
 
         if conflict_schedule:
             # 충돌하는 스케줄이 있는 경우
             raise ApplicationError(f"New schedule conflicts with existing schedules of the trainer", 400)
 
+        if schedule.is_occupying():
+            self.trainer_day_occupancy_repository.update_booked_count(
+                trainer.trainer_id, schedule.schedule_start_time.date(), -1)
+        self.trainer_day_occupancy_repository.update_booked_count(trainer.trainer_id, start_time.date(), 1)
+
         schedule.schedule_status = SCHEDULE_MODIFIED
         schedule.schedule_start_time = start_time
+        self.resource_version_service.bump_lesson(trainer_user.trainer_id, trainer_user.user_id, [
+            (SYNC_ENTITY_SCHEDULE, schedule.schedule_id, SYNC_OPERATION_UPSERT)
+        ])
         self.schedule_repository.update(schedule)
         return {'message': 'Schedule updated successfully'}, 200
 
@@ -104,19 +135,37 @@ class ScheduleService:
         if not schedule:
             raise ApplicationError(f"Schedule not found {schedule_id}", 404)
 
-        schedule.schedule_status = SCHEDULE_CANCELLED
         lesson = schedule.lesson
-        lesson.lesson_current_count += 1
+        if schedule.is_occupying():
+            self.trainer_day_occupancy_repository.update_booked_count(
+                lesson.trainer_id, schedule.schedule_start_time.date(), -1)
+
+        schedule.schedule_status = SCHEDULE_CANCELLED
+        self.trainer_user_repository.increment_lesson_count(lesson.trainer_user_id)
+        # 남은 수업 횟수도 바뀐다.
+        self.resource_version_service.bump_lesson(lesson.trainer_id, lesson.user_id, [
+            (SYNC_ENTITY_SCHEDULE, schedule.schedule_id, SYNC_OPERATION_UPSERT),
+            (SYNC_ENTITY_TRAINER_USER, lesson.trainer_user_id, SYNC_OPERATION_UPSERT)
+        ])
         self.schedule_repository.update(schedule)
         return {'message': 'Schedule cancel successfully'}, 200
 
+    @transactional
     def delete_schedule(self, schedule_id):
         # todo.txt : 스케쥴 변경 가능 범위인지 확인.
         schedule = self.schedule_repository.get(schedule_id)
-        deleted = self.schedule_repository.delete(schedule)
-        if deleted:
-            return {"message": "Schedule deleted successfully."}, 200
-        raise ApplicationError(f"Schedule not found {schedule_id}", 404)
+        if not schedule:
+            raise ApplicationError(f"Schedule not found {schedule_id}", 404)
+
+        if schedule.is_occupying():
+            self.trainer_day_occupancy_repository.update_booked_count(
+                schedule.lesson.trainer_id, schedule.schedule_start_time.date(), -1)
+
+        self.resource_version_service.bump_lesson(schedule.lesson.trainer_id, schedule.lesson.user_id, [
+            (SYNC_ENTITY_SCHEDULE, schedule.schedule_id, SYNC_OPERATION_DELETE)
+        ])
+        self.schedule_repository.delete(schedule)
+        return {"message": "Schedule deleted successfully."}, 200
 
     def handle_get_trainer_schedule(self, trainer_id, date, type):
         if type == SCHEDULE_TYPE_DAY:
@@ -150,8 +199,10 @@ class ScheduleService:
             if candidate_date.weekday() in available_week_days:
                 available_dates.add(candidate_date.strftime(DATEFORMAT))
 
-        # 3단계: 조건을 충족 하는 날짜 조회 및 "근무 가능 날짜"에서 제외
-        full_dates = self.schedule_repository.select_full_date_by_trainer_id_and_year_month(trainer_id, year, month)
+        # 3단계: 예약이 가득 찬 날짜 조회 및 "근무 가능 날짜"에서 제외
+        start_date, end_date = get_month_range(year, month)
+        full_dates = self.trainer_day_occupancy_repository.select_full_dates_by_trainer_id_and_range(
+            trainer_id, start_date.date(), end_date.date())
         for full_date, in full_dates:
             available_dates.discard(full_date.strftime(DATEFORMAT))
 
@@ -168,13 +219,7 @@ class ScheduleService:
         trainer = self.trainer_repository.get(trainer_id)
 
         result = {
-            'result': [
-                {
-                    'user_id': s.user_id,
-                    'user_name': s.user_name,
-                    'schedule_start_time': s.schedule_start_time.strftime(DATETIMEFORMAT)
-                } for s in schedules
-            ],
+            'result': serialize_rows(_trainer_week_schedule, schedules),
             'lesson_minute': trainer.lesson_minutes
         }
 
@@ -186,48 +231,52 @@ class ScheduleService:
         if not trainer_details:
             return {'result': []}
 
-        start_dt = datetime.combine(date, trainer_details.start_time)
-        end_dt = datetime.combine(date, trainer_details.end_time)
-
-        time_slots = []
-        current_time = start_dt
+        schedules = self.schedule_repository.select_day_schedule_by_trainer_id(trainer_id=trainer_id, date=date)
 
-        while current_time + timedelta(minutes=30) <= end_dt:
-            time_slots.append(current_time)
-            current_time += timedelta(minutes=30)
+        result = compute_day_slots(date, trainer_details.start_time, trainer_details.end_time,
+                                   [s.schedule_start_time for s in schedules],
+                                   _lesson_minutes(trainer_details.lesson_minutes))
 
-        schedules = self.schedule_repository.select_day_schedule_by_trainer_id(trainer_id=trainer_id, date=date)
+        return {'result': result}
 
-        scheduled_times = [
-            (s.schedule_start_time, s.schedule_start_time + timedelta(minutes=trainer_details.lesson_minutes))
-            for s in schedules
-        ]
-
-        result = []
-        for slot in time_slots:
-            is_available = not any(
-                s[0] <= slot < s[1] for s in scheduled_times
-            )
-            result.append({
-                'time': slot.strftime('%H:%M'),
-                'possible': is_available
-            })
+    def get_trainer_slots(self, trainer_id, start_date, end_date):
+        """
+        [start_date, end_date] 기간의 날짜별 예약 가능 슬롯. 날짜마다 type=DAY 로 조회한 결과와 같다.
+        근무 시간과 예약된 스케쥴을 기간 전체에 대해 한 번씩만 조회하고, 슬롯은 compute_slot_grids 로 한 번에 계산한다.
+        """
+        if end_date < start_date:
+            raise BadRequestError('from 은 to 보다 늦을 수 없습니다.')
+        day_count = (end_date - start_date).days + 1
+        if day_count > SLOT_RANGE_MAX_DAYS:
+            raise BadRequestError(f'최대 {SLOT_RANGE_MAX_DAYS}일까지 조회할 수 있습니다.')
+
+        dates = [start_date + timedelta(days=i) for i in range(day_count)]
+        result = {date.strftime(DATEFORMAT): [] for date in dates}
+
+        availabilities = self.trainer_repository.select_trainer_availabilities_by_id(trainer_id)
+        if not availabilities:
+            return {'result': result}
+
+        # (trainer_id, week_day) 는 유니크
+        windows_by_week_day = {row.week_day: (row.start_time, row.end_time) for row in availabilities}
+        windows = [(date, *windows_by_week_day[date.weekday()]) for date in dates
+                   if date.weekday() in windows_by_week_day]
+
+        schedules = self.schedule_repository.select_range_schedule_by_trainer_id(trainer_id, start_date, end_date)
+        grids = compute_slot_grids(windows, [s.schedule_start_time for s in schedules],
+                                   _lesson_minutes(availabilities[0].lesson_minutes))
+        for date, slots in grids.items():
+            result[date.strftime(DATEFORMAT)] = slots
 
         return {'result': result}
 
     def get_trainer_user_schedule(self, trainer_id, user_id, date, query_type):
         if query_type == SCHEDULE_TYPE_MONTH:
-            start_date = datetime(date.year, date.month, 1)
-            if date.month == 12:
-                end_date = datetime(date.year + 1, 1, 1)
-            else:
-                end_date = datetime(date.year, date.month + 1, 1)
+            start_date, end_date = get_month_range(date.year, date.month)
 
             schedules = self.schedule_repository.select_month_schedule_by_user_id_and_trainer_id(trainer_id, user_id,
                                                                                                  start_date, end_date)
-            return [{"schedule_id": schedule.schedule_id,
-                     "schedule_start_time": schedule.schedule_start_time.strftime(DATETIMEFORMAT)} for
-                    schedule in schedules]
+            return serialize_rows(_trainer_user_schedule, schedules)
 
         raise BadRequestError
 
@@ -265,6 +314,7 @@ class ScheduleService:
             "center_location": schedule.center_location,
         }
 
+    @transactional
     def create_schedule(self, body):
         trainer_id = body.trainer_id
         user_id = body.user_id
@@ -273,17 +323,20 @@ class ScheduleService:
         if not trainer_user:
             raise BadRequestError("Trainer-User relationship not found")
 
+        # 같은 트레이너의 동시 예약은 트레이너 행 잠금으로 순서대로 처리
+        trainer = self.trainer_repository.select_for_update(trainer_id)
+
         # 스케쥴 충돌 여부
-        conflict_schedule = self.schedule_repository.select_conflict_schedule_by_trainer_id_and_request_time(trainer_id,
-                                                                                                             schedule_start_time)
+        conflict_schedule = self.schedule_repository.select_conflict_schedule_by_trainer_id_and_time(
+            trainer_id, schedule_start_time, _lesson_minutes(trainer.lesson_minutes), for_update=True)
         if conflict_schedule is not None:
             raise BadRequestError("Schedule is already exist")
 
         # 수업 카운트 차감
-        if trainer_user.lesson_current_count < 1:
+        if not self.trainer_user_repository.decrement_lesson_count(trainer_user.trainer_user_id):
             raise BadRequestError("There are no classes left.")
 
-        trainer_user.lesson_current_count -= 1
+        self.trainer_day_occupancy_repository.update_booked_count(trainer_id, schedule_start_time.date(), 1)
 
         schedule = Schedule(
             trainer_user_id=trainer_user.trainer_user_id,
@@ -291,16 +344,81 @@ class ScheduleService:
             schedule_status=SCHEDULE_SCHEDULED
         )
 
-        # 스케쥴 생성
-        self.schedule_repository.create(schedule)
-
-        # 트레이너에게 푸쉬 알람 전송
+        # 트레이너에게 푸쉬 알람 전송 (스케쥴과 같은 트랜잭션으로 발송 대기열에 저장)
         user = self.user_repository.get(user_id)
         trainer_fcm_token = self.trainer_fcm_token_repository.get_by_trainer_id(trainer_id)
         data = {
             'schedule_start_time': body.schedule_start_time
         }
         self.message_service.send_message(title='수업 신청', body=f'{user.user_name}님이 수업을 신청하였습니다.',
-                                          token=trainer_fcm_token.fcm_token, data=data)
+                                          token=trainer_fcm_token.fcm_token if trainer_fcm_token else None, data=data)
+
+        # 스케쥴 생성
+        self.schedule_repository.create(schedule)
+        self.resource_version_service.bump_lesson(trainer_id, user_id, [
+            (SYNC_ENTITY_SCHEDULE, schedule.schedule_id, SYNC_OPERATION_UPSERT),
+            (SYNC_ENTITY_TRAINER_USER, trainer_user.trainer_user_id, SYNC_OPERATION_UPSERT)
+        ])
 
         return {"message": "success"}
+
+    @transactional
+    def create_recurring_schedule(self, body):
+        trainer_id = body.trainer_id
+        user_id = body.user_id
+        end_date = datetime.strptime(body.end_date, DATEFORMAT).date() if body.end_date else None
+        schedule_start_times = get_recurring_datetimes(
+            datetime.strptime(body.schedule_start_time, DATETIMEFORMAT), body.week_days,
+            count=body.count, end_date=end_date, max_count=RECURRING_SCHEDULE_MAX_COUNT)
+        if not schedule_start_times:
+            raise BadRequestError("There are no schedules in the range.")
+
+        trainer_user = self.trainer_user_repository.select_by_trainer_id_and_user_id(trainer_id, user_id)
+        if not trainer_user:
+            raise BadRequestError("Trainer-User relationship not found")
+
+        trainer = self.trainer_repository.select_for_update(trainer_id)
+
+        # 모든 신청 시간의 충돌을 기간 조회 한 번으로 확인
+        lesson_minutes = _lesson_minutes(trainer.lesson_minutes)
+        booked_times = self.schedule_repository.select_conflict_schedule_times_by_trainer_id_and_range(
+            trainer_id, schedule_start_times[0], schedule_start_times[-1], lesson_minutes, for_update=True)
+        lesson_duration = timedelta(minutes=lesson_minutes)
+        for schedule_start_time in schedule_start_times:
+            index = bisect_right(booked_times, schedule_start_time - lesson_duration)
+            if index < len(booked_times) and booked_times[index] < schedule_start_time + lesson_duration:
+                raise BadRequestError(
+                    f"Schedule is already exist: {schedule_start_time.strftime(DATETIMEFORMAT)}")
+
+        # 수업 카운트는 신청한 수업 수만큼 한 번에 차감
+        if not self.trainer_user_repository.decrement_lesson_count(trainer_user.trainer_user_id,
+                                                                   len(schedule_start_times)):
+            raise BadRequestError("There are no classes left.")
+
+        self.trainer_day_occupancy_repository.increment_booked_counts(
+            trainer_id, [schedule_start_time.date() for schedule_start_time in schedule_start_times])
+        self.schedule_repository.insert_schedules(trainer_user.trainer_user_id, schedule_start_times,
+                                                  SCHEDULE_SCHEDULED)
+
+        # 수업마다 보내지 않고 요약 알림 한 건만 보낸다.
+        user = self.user_repository.get(user_id)
+        trainer_fcm_token = self.trainer_fcm_token_repository.get_by_trainer_id(trainer_id)
+        data = {
+            'schedule_start_time': schedule_start_times[0].strftime(DATETIMEFORMAT),
+            'schedule_count': str(len(schedule_start_times))
+        }
+        self.message_service.send_message(
+            title='정기 수업 신청', body=f'{user.user_name}님이 정기 수업 {len(schedule_start_times)}회를 신청하였습니다.',
+            token=trainer_fcm_token.fcm_token if trainer_fcm_token else None, data=data)
+
+        schedule_ids = self.schedule_repository.select_schedule_ids_by_tu_id_and_times(
+            trainer_user.trainer_user_id, schedule_start_times)
+        self.resource_version_service.bump_lesson(trainer_id, user_id, [
+            (SYNC_ENTITY_SCHEDULE, schedule_id, SYNC_OPERATION_UPSERT) for schedule_id in schedule_ids
+        ] + [(SYNC_ENTITY_TRAINER_USER, trainer_user.trainer_user_id, SYNC_OPERATION_UPSERT)])
+
+        return {
+            "message": "success",
+            "schedule_start_times": [schedule_start_time.strftime(DATETIMEFORMAT)
+                                     for schedule_start_time in schedule_start_times]
+        }
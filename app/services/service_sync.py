@@ -0,0 +1,118 @@
+from app.common.constants import SYNC_PAGE_SIZE, SYNC_OPERATION_DELETE, SYNC_ENTITY_SCHEDULE, \
+    SYNC_ENTITY_CHANGE_TICKET, SYNC_ENTITY_TRAINER_USER
+from app.common.exceptions import ApplicationError
+from app.utils.util_serializer import compile_serializer, serialize_rows
+
+_sync_schedule = compile_serializer({
+    'schedule_id': 'schedule_id',
+    'trainer_user_id': 'trainer_user_id',
+    'trainer_id': 'trainer_id',
+    'user_id': 'user_id',
+    'schedule_start_time': 'schedule_start_time',
+    'schedule_status': 'schedule_status',
+    'updated_at': 'updated_at'
+})
+_sync_change_ticket = compile_serializer({
+    'id': 'id',
+    'schedule_id': 'schedule_id',
+    'change_from': 'change_from',
+    'change_type': 'change_type',
+    'status': 'status',
+    'description': 'description',
+    'reject_reason': 'reject_reason',
+    'as_is_date': 'as_is_date',
+    'request_time': 'request_time',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at'
+})
+_sync_trainer_user = compile_serializer({
+    'trainer_user_id': 'trainer_user_id',
+    'trainer_id': 'trainer_id',
+    'user_id': 'user_id',
+    'lesson_total_count': 'lesson_total_count',
+    'lesson_current_count': 'lesson_current_count',
+    'exercise_days': 'exercise_days',
+    'special_notes': 'special_notes',
+    'trainer_user_delete_flag': 'trainer_user_delete_flag',
+    'updated_at': 'updated_at'
+})
+
+# 응답 키: (엔티티 종류, id 컬럼)
+_ENTITIES = {
+    'schedules': (SYNC_ENTITY_SCHEDULE, 'schedule_id'),
+    'change_tickets': (SYNC_ENTITY_CHANGE_TICKET, 'id'),
+    'trainer_users': (SYNC_ENTITY_TRAINER_USER, 'trainer_user_id'),
+}
+
+
+class SyncService:
+    """
+    트레이너/회원별 변경분 조회.
+
+    cursor 없이 요청하면 현재 cursor 만 반환한다. 앱은 cursor 를 먼저 받고, 그 다음 기존 조회 api 로 전체를 받은 뒤
+    이 cursor 부터 이어서 요청한다. 전체 조회를 먼저 하면 그 사이에 커밋된 변경이 cursor 이하의 id 를 가져 누락된다.
+    (cursor 를 먼저 받으면 전체 조회에 이미 반영된 변경이 다시 내려올 수 있지만 현재 값이므로 덮어쓰면 된다)
+    cursor 이후 변경된 행은 현재 값으로, 삭제된 행은 id 만 내려준다. 같은 행이 여러 번 바뀌어도 한 번만 내려준다.
+    """
+
+    def __init__(self, change_log_repository, schedule_repository, change_ticket_repository, trainer_user_repository):
+        self.change_log_repository = change_log_repository
+        self.schedule_repository = schedule_repository
+        self.change_ticket_repository = change_ticket_repository
+        self.trainer_user_repository = trainer_user_repository
+        # 엔티티 종류: (id 목록으로 현재 값 조회, 행 변환)
+        self._loaders = {
+            SYNC_ENTITY_SCHEDULE: (schedule_repository.select_schedules_by_ids, _sync_schedule),
+            SYNC_ENTITY_CHANGE_TICKET: (change_ticket_repository.select_change_tickets_by_ids, _sync_change_ticket),
+            SYNC_ENTITY_TRAINER_USER: (trainer_user_repository.select_trainer_users_by_ids, _sync_trainer_user),
+        }
+
+    def get_changes(self, owner_type, owner_id, cursor=None):
+        # 보관 기간이 지나 지워진 기록 바로 앞까지는 이어서 받을 수 없다.
+        first_change_id = self.change_log_repository.select_first_change_id()
+        min_cursor = first_change_id - 1 if first_change_id is not None else 0
+
+        if cursor is None:
+            # 전체 마지막 id 대신 이 트레이너/회원의 마지막 id 를 쓴다. 아직 커밋되지 않은 이 트레이너/회원의 기록은
+            # 그보다 큰 id 를 가지므로 다음 요청에서 받는다.
+            last_change_id = self.change_log_repository.select_last_change_id(owner_type, owner_id) or 0
+            return self._result(max(last_change_id, min_cursor))
+
+        if cursor < min_cursor:
+            raise ApplicationError('만료된 cursor 입니다. 전체 데이터를 다시 조회해주세요.', 410)
+
+        changes = self.change_log_repository.select_changes(owner_type, owner_id, cursor, SYNC_PAGE_SIZE + 1)
+        has_more = len(changes) > SYNC_PAGE_SIZE
+        changes = changes[:SYNC_PAGE_SIZE]
+        result = self._result(changes[-1].change_id if changes else cursor, has_more)
+
+        # 엔티티별 마지막 작업만 남긴다. (id 는 재사용되지 않으므로 삭제 이후의 변경은 없다)
+        operations = {entity_type: {} for entity_type, _ in _ENTITIES.values()}
+        for change in changes:
+            operations[change.entity_type][change.entity_id] = change.operation
+
+        for key, (entity_type, id_column) in _ENTITIES.items():
+            entity_operations = operations[entity_type]
+            deleted = {entity_id for entity_id, operation in entity_operations.items()
+                       if operation == SYNC_OPERATION_DELETE}
+            changed_ids = [entity_id for entity_id in entity_operations if entity_id not in deleted]
+            if changed_ids:
+                select_rows, serializer = self._loaders[entity_type]
+                rows = select_rows(changed_ids)
+                result[key] = serialize_rows(serializer, rows)
+                # 기록 이후 지워진 행도 삭제로 내려준다.
+                deleted.update(set(changed_ids) - {getattr(row, id_column) for row in rows})
+            result['deleted'][key] = sorted(deleted)
+
+        return result
+
+    @staticmethod
+    def _result(cursor, has_more=False):
+        return {
+            'cursor': cursor,
+            'has_more': has_more,
+            'schedules': [],
+            'change_tickets': [],
+            'trainer_users': [],
+            'deleted': {key: [] for key in _ENTITIES}
+        }
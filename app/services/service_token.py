@@ -1,26 +1,59 @@
-from app.repositories.repository_token import TokenRepository
+import hashlib
 
+from flask_jwt_extended import decode_token
 
-class TokenService:
-    def __init__(self):
-        self.token_repository = TokenRepository()
+from app.repositories.unit_of_work import transactional, after_commit
+from database import db
 
-    def get_user_token(self, user_id):
-        return self.token_repository.select_user_refresh_token_by_user_id(user_id)
 
-    def get_trainer_token(self, trainer_id):
-        return self.token_repository.select_trainer_refresh_token_by_trainer_id(trainer_id)
+def hash_jti(jti):
+    return hashlib.sha256(jti.encode()).hexdigest()
 
-    def insert_user_token(self, user_id, refresh_token):
-        old_token = self.token_repository.select_user_refresh_token_by_user_id(user_id)
-        if old_token is None:
-            return self.token_repository.insert_user_refresh_token(user_id, refresh_token)
 
-        return self.token_repository.update(old_token, refresh_token)
+class TokenService:
+    """
+    refresh token 은 서명으로 검증하고, 교체(rotation) 여부만 subject 별 현재 jti 로 확인한다.
+    jti_hash_cache 는 워커끼리 공유하는 캐시(build_shared_cache_backend)일 때만 쓴다. 교체 후 무효화가 모든 워커에
+    바로 보이므로 캐시 hit 를 그대로 믿어도 된다. 공유 캐시가 없으면(None) 매번 DB 의 현재 jti 와 비교한다.
+    (워커 로컬 캐시를 쓰면 다른 워커에서 교체된 이전 token 이 TTL 동안 통과하므로 쓰지 않는다)
+    """
+
+    def __init__(self, token_repository, jti_hash_cache=None):
+        self.token_repository = token_repository
+        # 'user:<id>' / 'trainer:<id>' -> jti 해시
+        self.jti_hash_cache = jti_hash_cache
+
+    def is_valid_user_token(self, user_id, jti):
+        return self._is_current(f'user:{user_id}', jti, lambda: self.token_repository.select_user_jti_hash(user_id))
+
+    def is_valid_trainer_token(self, trainer_id, jti):
+        return self._is_current(f'trainer:{trainer_id}', jti,
+                                lambda: self.token_repository.select_trainer_jti_hash(trainer_id))
+
+    @transactional
+    def insert_user_token(self, user_id, refresh_token):
+        jti = decode_token(refresh_token)['jti']
+        self.token_repository.upsert_user_jti_hash(user_id, hash_jti(jti))
+        after_commit(db, lambda: self._invalidate(f'user:{user_id}'))
 
+    @transactional
     def insert_trainer_token(self, trainer_id, refresh_token):
-        old_token = self.token_repository.select_trainer_refresh_token_by_trainer_id(trainer_id)
-        if old_token is None:
-            return self.token_repository.insert_trainer_refresh_token(trainer_id, refresh_token)
-
-        return self.token_repository.update(old_token, refresh_token)
\ No newline at end of file
+        jti = decode_token(refresh_token)['jti']
+        self.token_repository.upsert_trainer_jti_hash(trainer_id, hash_jti(jti))
+        after_commit(db, lambda: self._invalidate(f'trainer:{trainer_id}'))
+
+    def _is_current(self, key, jti, load_jti_hash):
+        jti_hash = hash_jti(jti)
+        if self.jti_hash_cache is not None and self.jti_hash_cache.get(key) == jti_hash:
+            return True
+
+        current = load_jti_hash()
+        if current is None:
+            return False
+        if self.jti_hash_cache is not None:
+            self.jti_hash_cache.set(key, current)
+        return current == jti_hash
+
+    def _invalidate(self, key):
+        if self.jti_hash_cache is not None:
+            self.jti_hash_cache.delete(key)
@@ -1,47 +1,82 @@
+from app.common.constants import DEFAULT_LESSON_MINUTES
 from app.entities.entity_trainer import Trainer
 from app.entities.entity_trainer_user import TrainerUser
 from app.common.exceptions import BadRequestError
 from app.entities.entity_trainer_fcm_token import TrainerFcmToken
+from app.repositories.unit_of_work import transactional, after_commit
+from app.utils.util_time import to_date
+from database import db
 
 
 class TrainerService:
     def __init__(self, trainer_repository, trainer_availability_repository, trainer_fcm_repository, image_service,
-                 trainer_user_repository):
+                 trainer_user_repository, trainer_day_occupancy_repository, trainer_profile_cache,
+                 resource_version_service):
         self.trainer_repository = trainer_repository
         self.trainer_availability_repository = trainer_availability_repository
         self.trainer_fcm_repository = trainer_fcm_repository
         self.image_service = image_service
         self.trainer_user_repository = trainer_user_repository
+        self.trainer_day_occupancy_repository = trainer_day_occupancy_repository
+        self.trainer_profile_cache = trainer_profile_cache
+        self.resource_version_service = resource_version_service
 
+    # 회원 앱에서 계속 조회되므로 캐시한다. 프로필이 바뀌는 곳에서는 invalidate_trainer_profile 을 호출해야 한다.
     def get_trainer_by_id(self, trainer_id):
+        trainer = self.trainer_profile_cache.get_or_load(
+            self._profile_cache_key(trainer_id), lambda: self._load_trainer_profile(trainer_id))
+        if trainer is None:
+            raise BadRequestError(message="존재하지 않는 트레이너입니다.")
+        return trainer
+
+    def _load_trainer_profile(self, trainer_id):
         trainer: Trainer = self.trainer_repository.get(trainer_id)
-        trainer = trainer.__dict__
+        if trainer is None:
+            return None
+
+        # 공유 캐시에도 넣을 수 있도록 JSON 으로 표현 가능한 값만 담는다.
+        profile = {column.name: _to_cache_value(getattr(trainer, column.name))
+                   for column in Trainer.__table__.columns if column.name != 'trainer_social_id'}
 
         trainer_availability = self.trainer_availability_repository.get_by_trainer_id(trainer_id)
-        trainer['trainer_availability'] = trainer_availability
+        profile['trainer_availability'] = [
+            {column.name: _to_cache_value(getattr(availability, column.name))
+             for column in availability.__table__.columns}
+            for availability in trainer_availability
+        ]
 
         presigned_url = self.image_service.get_presigned_url(f'trainer/{trainer_id}/profile')
-        trainer['trainer_profile_img_url'] = presigned_url
+        profile['trainer_profile_img_url'] = presigned_url
 
-        return trainer
+        return profile
+
+    def invalidate_trainer_profile(self, trainer_id):
+        # 커밋 전에 지우면 다른 요청이 커밋 전 데이터로 캐시를 다시 채울 수 있으므로 커밋 후에 지운다.
+        after_commit(db, lambda: self.trainer_profile_cache.invalidate(self._profile_cache_key(trainer_id)))
+
+    @staticmethod
+    def _profile_cache_key(trainer_id):
+        return str(trainer_id)
 
     def get_trainer_by_social_id(self, trainer_social_id):
         return self.trainer_repository.select_trainer_by_social_id(trainer_social_id)
 
+    @transactional
     def create_trainer_only_social_id(self, trainer_social_id):
         return self.trainer_repository.insert_trainer_with_social_id(trainer_social_id)
 
+    @transactional
     def create_trainer(self, data):
         trainer = Trainer(
             trainer_social_id=data['trainer_social_id'],
             trainer_name=data.get('trainer_name'),
             trainer_phone_number=data.get('trainer_phone_number'),
             trainer_gender=data.get('trainer_gender'),
-            trainer_birthday=data.get('trainer_birthday'),
+            trainer_birthday=to_date(data.get('trainer_birthday')),
             description=data.get('description'),
             lesson_name=data.get('lesson_name'),
             lesson_price=data.get('lesson_price'),
-            lesson_minutes=60,
+            lesson_minutes=DEFAULT_LESSON_MINUTES,
             lesson_change_range=data.get('lesson_change_range'),
             center_name=data.get('center_name'),
             center_location=data.get('center_location'),
@@ -55,10 +90,12 @@ class TrainerService:
             user_id=1
         ))
         trainer_availabilities = data.get('trainer_availability', [])
-        self.trainer_availability_repository.insert_availabilities(trainer.trainer_id, trainer_availabilities)
+        self.trainer_availability_repository.replace_availabilities(
+            trainer.trainer_id, trainer.lesson_minutes, trainer_availabilities)
 
         return trainer
 
+    @transactional
     def update_trainer(self, trainer_id, data):
         trainer = self.trainer_repository.get(trainer_id)
         if trainer is None:
@@ -67,7 +104,7 @@ class TrainerService:
         trainer.trainer_name = data.get('trainer_name', trainer.trainer_name)
         trainer.trainer_phone_number = data.get('trainer_phone_number', trainer.trainer_phone_number)
         trainer.trainer_gender = data.get('trainer_gender', trainer.trainer_gender)
-        trainer.trainer_birthday = data.get('trainer_birthday', trainer.trainer_birthday)
+        trainer.trainer_birthday = to_date(data.get('trainer_birthday', trainer.trainer_birthday))
         trainer.description = data.get('description', trainer.description)
         trainer.lesson_name = data.get('lesson_name', trainer.lesson_name)
         trainer.lesson_price = data.get('lesson_price', trainer.lesson_price)
@@ -78,15 +115,21 @@ class TrainerService:
         trainer.center_number = data.get('center_number', trainer.center_number)
         trainer.center_type = data.get('center_type', trainer.center_type)
 
-        self.trainer_repository.update(trainer)
         trainer_availability = data.get('trainer_availability')
 
         if trainer_availability is not None:
-            self.trainer_availability_repository.delete_availability_by_trainer(trainer_id)
-            self.trainer_availability_repository.insert_availabilities(trainer_id, trainer_availability)
+            self.trainer_availability_repository.replace_availabilities(
+                trainer_id, trainer.lesson_minutes, trainer_availability)
+            # 요일별 수업 가능 횟수가 바뀌었으므로 예약 현황의 capacity 도 갱신
+            self.trainer_day_occupancy_repository.update_capacity_by_trainer_id(trainer_id)
+
+        self.resource_version_service.bump_trainer(trainer_id)
+        self.trainer_repository.update(trainer)
+        self.invalidate_trainer_profile(trainer_id)
 
         return {"message": "success"}
 
+    @transactional
     def create_trainer_fcm_token(self, trainer_id, body):
         old_token = self.trainer_fcm_repository.get_by_trainer_id(trainer_id=trainer_id)
         if old_token is not None:
@@ -98,3 +141,11 @@ class TrainerService:
         )
 
         self.trainer_fcm_repository.create(trainer_fcm_token)
+        self.invalidate_trainer_profile(trainer_id)
+
+
+def _to_cache_value(value):
+    # date, time 은 응답 모델(fields.String)과 같은 문자열로 바꿔 둔다.
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
@@ -1,18 +1,22 @@
 from datetime import datetime
 
+from app.common.constants import SYNC_ENTITY_TRAINER_USER, SYNC_OPERATION_UPSERT
 from app.common.exceptions import BadRequestError
 from app.entities.entity_trainer_user import TrainerUser
 from app.entities.entity_users import Users
 from app.models.model_trainer_user import UsersRelatedTrainerResponse, CreateTrainerUserRelationRequest, \
     TrainersRelatedUserResponse, UserDetailRelatedTrainerResponse, UpdateTrainerUserRequest
+from app.repositories.unit_of_work import transactional
+from app.utils.util_serializer import serialize_rows
 
 
 class TrainerUserService:
-    def __init__(self, tu_repository, user_repository, trainer_repository, image_service):
+    def __init__(self, tu_repository, user_repository, trainer_repository, image_service, resource_version_service):
         self.tu_repository = tu_repository
         self.user_repository = user_repository
         self.trainer_repository = trainer_repository
         self.image_service = image_service
+        self.resource_version_service = resource_version_service
 
     def get_users_related_trainer(self, trainer_id: int, delete_flag: bool = False):
         trainer = self.trainer_repository.get(trainer_id)
@@ -21,12 +25,12 @@ class TrainerUserService:
 
         entities = self.tu_repository.select_with_users_by_trainer_id(trainer_id, delete_flag)
 
-        results = []
-        for trainer_user, user in entities:
-            user_profile_img_url = self.image_service.get_presigned_url(f'user/{user.user_id}/profile')
-            user.user_profile_img_url = user_profile_img_url
-            results.append(UsersRelatedTrainerResponse.to_dict(trainer_user, user))
-        return results
+        profile_img_urls = self.image_service.get_presigned_urls(
+            [f'user/{user.user_id}/profile' for _, user in entities])
+
+        for _, user in entities:
+            user.user_profile_img_url = profile_img_urls[f'user/{user.user_id}/profile']
+        return serialize_rows(UsersRelatedTrainerResponse.to_dict, entities)
 
     def get_trainers_related_user(self, user_id):
         user = self.user_repository.get(user_id)
@@ -35,10 +39,12 @@ class TrainerUserService:
 
         entities = self.tu_repository.select_with_trainers_by_user_id(user_id)
 
+        profile_img_urls = self.image_service.get_presigned_urls(
+            [f'trainer/{trainer.trainer_id}/profile' for _, trainer in entities])
+
         results = []
         for trainer_user, trainer in entities:
-            trainer_profile_img_url = self.image_service.get_presigned_url(f'trainer/{trainer.trainer_id}/profile')
-            trainer.trainer_profile_img_url = trainer_profile_img_url
+            trainer.trainer_profile_img_url = profile_img_urls[f'trainer/{trainer.trainer_id}/profile']
             results.append(TrainersRelatedUserResponse.to_dict(trainer_user, trainer))
         return results
 
@@ -60,6 +66,7 @@ class TrainerUserService:
 
         return UserDetailRelatedTrainerResponse.to_dict(user, trainer_user)
 
+    @transactional
     def create_trainer_user_relation(self, trainer_id, data: CreateTrainerUserRelationRequest):
         user: Users = self.user_repository.select_by_username_and_phone_number(data.user_name, data.phone_number)
         if not user:
@@ -79,7 +86,11 @@ class TrainerUserService:
         )
 
         self.tu_repository.create(new_trainer_user)
+        self.resource_version_service.bump_lesson(trainer_id, user.user_id, [
+            (SYNC_ENTITY_TRAINER_USER, new_trainer_user.trainer_user_id, SYNC_OPERATION_UPSERT)
+        ])
 
+    @transactional
     def update_trainer_user(self, trainer_id, user_id, data: UpdateTrainerUserRequest):
         user = self.user_repository.get(user_id)
         if not user:
@@ -98,8 +109,12 @@ class TrainerUserService:
         trainer_user.lesson_current_count = data.lesson_current_count
         trainer_user.exercise_days = data.exercise_days
         trainer_user.special_notes = data.special_notice
+        self.resource_version_service.bump_lesson(trainer_id, user_id, [
+            (SYNC_ENTITY_TRAINER_USER, trainer_user.trainer_user_id, SYNC_OPERATION_UPSERT)
+        ])
         self.tu_repository.update(trainer_user)
 
+    @transactional
     def delete_trainer_user(self, trainer_id, user_id):
         trainer_user: TrainerUser = self.tu_repository.select_by_trainer_id_and_user_id(
             trainer_id=trainer_id, user_id=user_id)
@@ -111,4 +126,8 @@ class TrainerUserService:
 
         trainer_user.trainer_user_delete_flag = True
         trainer_user.deleted_at = datetime.utcnow()
+        # 종료된 회원의 스케쥴은 스케쥴 조회에서 빠진다. 수업 행은 남아 있으므로 /sync 에는 변경으로 내려준다.
+        self.resource_version_service.bump_lesson(trainer_id, user_id, [
+            (SYNC_ENTITY_TRAINER_USER, trainer_user.trainer_user_id, SYNC_OPERATION_UPSERT)
+        ])
         self.tu_repository.update(trainer_user)
@@ -3,18 +3,22 @@ from datetime import datetime
 from app.common.constants import DATEFORMAT
 from app.entities.entity_user_fcm_token import UserFcmToken
 from app.entities.entity_users import Users
+from app.repositories.unit_of_work import transactional
+from app.utils.util_time import to_date
 
 from database import db
 
 
 class UserService:
-    def __init__(self, user_repository, user_fcm_repository):
+    def __init__(self, user_repository, user_fcm_repository, resource_version_service):
         self.user_repository = user_repository
         self.user_fcm_repository = user_fcm_repository
+        self.resource_version_service = resource_version_service
 
     def get_user(self, user_id):
         return self.user_repository.get(user_id)
 
+    @transactional
     def create_user(self, data):
         new_user = Users(
             user_social_id=data['user_social_id'],
@@ -23,11 +27,12 @@ class UserService:
             user_gender=data.get('user_gender'),
             user_phone_number=data.get('user_phone_number'),
             user_delete_flag=data.get('user_delete_flag', False),
-            user_birthday=data.get('user_birthday')
+            user_birthday=to_date(data.get('user_birthday'))
         )
         self.user_repository.create(new_user)
         return new_user
 
+    @transactional
     def update_user(self, user, data):
         user.user_email = data.get('user_email', user.user_email)
         user.user_name = data.get('user_name', user.user_name)
@@ -35,13 +40,15 @@ class UserService:
         user.user_phone_number = data.get('user_phone_number', user.user_phone_number)
         user.user_profile_img_url = data.get('user_profile_img_url', user.user_profile_img_url)
         user.user_delete_flag = data.get('user_delete_flag', user.user_delete_flag)
-        user.user_birthday = data.get('user_birthday', user.user_birthday)
+        user.user_birthday = to_date(data.get('user_birthday', user.user_birthday))
 
+        self.resource_version_service.bump_user(user.user_id)
         return self.user_repository.update(user)
 
     def get_user_by_social_id(self, social_id):
         return self.user_repository.select_by_social_id(social_id)
 
+    @transactional
     def create_user_only_social_id(self, social_id):
         new_user = Users(
             user_social_id=social_id
@@ -66,6 +73,7 @@ class UserService:
 
         return None;
 
+    @transactional
     def create_user_fcm_token(self, user_id, body):
         old_token = self.user_fcm_repository.get_by_user_id(user_id=user_id)
         if old_token is not None:
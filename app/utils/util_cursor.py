@@ -0,0 +1,50 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app.common.exceptions import BadRequestError
+
+
+def encode_cursor(created_at, id):
+    # 클라이언트는 내용을 해석하지 않고 그대로 돌려준다.
+    payload = json.dumps([created_at.isoformat(), id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequestError("유효하지 않은 cursor 입니다.")
+
+
+def paginate(query, created_at_column, id_column, cursor=None, page=None, per_page=10):
+    """
+    (created_at, id) 최신순으로 정렬해 한 페이지를 조회한다. 반환값: (rows, next_cursor)
+
+    기본은 keyset 방식으로 cursor 다음 행부터 per_page + 1 개만 읽어 다음 페이지 유무를 판단한다.
+    COUNT(*) 와 OFFSET 이 없어 뒤 페이지도 같은 비용이다.
+    page 를 지정하면 기존 OFFSET 방식으로 조회하고 next_cursor 는 None 이다.
+    """
+    query = query.order_by(created_at_column.desc(), id_column.desc())
+
+    if page is not None:
+        return query.paginate(page=page, per_page=per_page, count=False).items, None
+
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.filter(or_(created_at_column < created_at,
+                                 and_(created_at_column == created_at, id_column < id)))
+
+    rows = query.limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
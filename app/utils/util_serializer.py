@@ -0,0 +1,23 @@
+from operator import attrgetter
+
+
+def compile_serializer(fields):
+    """
+    {응답 키: 속성 경로} 로 행 -> dict 변환 함수를 미리 만든다.
+
+    속성 경로는 attrgetter 형식('schedule_start_time', 'TrainerUser.created_at')이며,
+    값은 변환하지 않는다. datetime 은 응답 인코더(app.common.json_encoder)가 DATETIMEFORMAT 형식으로 바꾼다.
+    """
+    keys = tuple(fields)
+    paths = tuple(fields.values())
+    if len(paths) == 1:
+        getter = attrgetter(paths[0])
+        key = keys[0]
+        return lambda row: {key: getter(row)}
+
+    getter = attrgetter(*paths)
+    return lambda row: dict(zip(keys, getter(row)))
+
+
+def serialize_rows(serializer, rows):
+    return list(map(serializer, rows))
@@ -0,0 +1,57 @@
+from app.common.constants import SLOT_MINUTES
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+# 'HH:MM' 라벨을 미리 만들어 두고 슬롯마다 strftime 을 호출하지 않는다.
+_TIME_LABELS = [f'{minute // 60:02d}:{minute % 60:02d}' for minute in range(24 * 60)]
+
+
+def _to_seconds(dt):
+    # 날짜를 넘나드는 비교를 위해 datetime 을 절대 초 단위 정수로 변환
+    return dt.toordinal() * _SECONDS_PER_DAY + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+def compute_slot_grids(windows, booked_start_times, lesson_minutes, slot_minutes=SLOT_MINUTES):
+    """
+    여러 날짜의 근무 시간을 slot_minutes 단위 슬롯으로 나누고 예약 가능 여부를 계산한다.
+
+    windows: [(date, start_time, end_time), ...] 날짜별 근무 시간. 날짜당 하나.
+    booked_start_times: 기간 내 예약된 스케쥴 시작 시간(datetime) 목록. 수업 길이는 lesson_minutes.
+    슬롯 시작 시간이 어떤 수업의 [시작, 시작 + lesson_minutes) 안에 있으면 예약 불가.
+
+    예약 시간을 한 번 정렬한 뒤 모든 날짜의 슬롯과 함께 한 번만 훑는다(sweep line).
+    반환값: {date: [{'time': 'HH:MM', 'possible': bool}, ...]}
+    """
+    lesson_seconds = lesson_minutes * 60
+    slot_seconds = slot_minutes * 60
+    booked = sorted(_to_seconds(start_time) for start_time in booked_start_times)
+    booked_count = len(booked)
+
+    grids = {}
+    index = 0
+    covered_until = None  # 지금까지 시작한 수업 중 가장 늦게 끝나는 시간
+    for date, start_time, end_time in sorted(windows):
+        day_seconds = date.toordinal() * _SECONDS_PER_DAY
+        slot = day_seconds + start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+        last_slot = day_seconds + end_time.hour * 3600 + end_time.minute * 60 + end_time.second - slot_seconds
+
+        slots = []
+        while slot <= last_slot:
+            while index < booked_count and booked[index] <= slot:
+                lesson_end = booked[index] + lesson_seconds
+                if covered_until is None or covered_until < lesson_end:
+                    covered_until = lesson_end
+                index += 1
+            slots.append({
+                'time': _TIME_LABELS[(slot - day_seconds) // 60 % (24 * 60)],
+                'possible': covered_until is None or covered_until <= slot
+            })
+            slot += slot_seconds
+        grids[date] = slots
+
+    return grids
+
+
+def compute_day_slots(date, start_time, end_time, booked_start_times, lesson_minutes, slot_minutes=SLOT_MINUTES):
+    return compute_slot_grids([(date, start_time, end_time)], booked_start_times, lesson_minutes,
+                              slot_minutes)[date]
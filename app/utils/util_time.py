@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 
 from app.common.constants import DATETIMEFORMAT
 from app.common.exceptions import BadRequestError
@@ -15,8 +15,60 @@ def calculate_lesson_slots(start_time, end_time, lesson_minutes):
     return slots
 
 
+def get_day_range(date):
+    # [당일 00:00, 다음날 00:00) 반열림 구간. 컬럼에 함수를 씌우지 않아야 인덱스를 탈 수 있다.
+    start = datetime(date.year, date.month, date.day)
+    return start, start + timedelta(days=1)
+
+
+def get_month_range(year, month):
+    # [해당 월 1일, 다음 달 1일) 반열림 구간
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
+
+
 def validate_datetime(start_time):
     date_time = datetime.strptime(start_time, DATETIMEFORMAT)
     if date_time < datetime.now():
         raise BadRequestError('datetime must be in the future.')
     return start_time
+
+
+# 요청 본문의 날짜 문자열을 컬럼에 넣을 값으로 바꾼다. MySQL 은 문자열을 그대로 받지만 SQLite 는 date/datetime 만 받는다.
+# 'YYYY-MM-DD HH:MM:SS'(DATETIMEFORMAT) 과 ISO 8601('T' 구분자) 형식을 모두 받는다. 형식이 틀리면 ValueError.
+def to_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def to_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def get_recurring_datetimes(start_time, week_days, count=None, end_date=None, max_count=None):
+    # start_time 날짜부터 week_days(월=0) 요일마다 같은 시각. count 개 또는 end_date 당일까지.
+    week_days = set(week_days)
+    datetimes = []
+    current = start_time
+    while True:
+        if count is not None and len(datetimes) >= count:
+            break
+        if end_date is not None and current.date() > end_date:
+            break
+        if current.weekday() in week_days:
+            datetimes.append(current)
+            if max_count is not None and len(datetimes) > max_count:
+                raise BadRequestError(f'recurring schedule count must be less than or equal to {max_count}.')
+        current += timedelta(days=1)
+    return datetimes
@@ -0,0 +1,437 @@
+"""
+주요 API 벤치마크와 회귀 검사.
+
+    # S 크기 데이터로 측정하고 baseline 으로 저장
+    python -m benchmarks.bench_endpoints --scale S --save-baseline
+
+    # 변경 후 다시 측정해서 baseline 과 비교 (회귀가 있으면 종료 코드 1)
+    python -m benchmarks.bench_endpoints --scale S --tolerance 0.25
+
+BulkDataFactory 로 만든 데이터에 Flask test client 로 요청을 보내고, API 별로
+지연 시간(p50/p95/p99), 요청당 쿼리 수(X-Query-Count), 요청당 메모리 할당(tracemalloc peak)을 기록한다.
+DB 는 TEST_DATABASE_URI 를 사용한다. (기본은 in-memory SQLite)
+
+지연 시간과 할당량은 --tolerance 비율(그리고 지연 시간은 --min-delta-ms 이상)만큼 늘어나면,
+쿼리 수와 에러 수는 하나라도 늘어나면 회귀로 판단한다.
+"""
+import argparse
+from bisect import bisect_right, insort
+import json
+import logging
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import boto3
+from moto import mock_aws
+from sqlalchemy import func
+
+from app import create_app, Trainer, TrainerUser, ChangeTicket, Schedule
+from app.common.constants import DATEFORMAT, DATETIMEFORMAT, CHANGE_TICKET_STATUS_WAITING, \
+    CHANGE_TICKET_STATUS_APPROVED, CHANGE_TICKET_STATUS_REJECTED, CHANGE_TICKET_TYPE_MODIFY, \
+    DEFAULT_LESSON_MINUTES
+from app.common.query_counter import QUERY_COUNT_HEADER
+from app.services.service_factory import ServiceFactory
+from database import db
+from tests.bulk_data_factory import BulkDataFactory, SCALES
+from tests.test_data_factory import TestDataFactory
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_ANCHOR_DATE = date(2024, 6, 1)
+SAMPLE_TRAINER_COUNT = 20
+
+LATENCY_METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+# p99 는 200회 측정으로는 흔들림이 커서 기본 회귀 검사에서 제외한다.
+GATED_LATENCY_METRICS = ('p50_ms', 'p95_ms')
+
+
+class FixturesExhausted(Exception):
+    """쓰기 요청에 쓸 대상(남은 수업 횟수, 대기 중인 티켓)이 떨어졌다."""
+
+
+class BenchmarkFixtures:
+    """
+    요청을 만들 때 쓰는 트레이너/회원/티켓 id 와 인증 헤더. 쓰기 요청은 같은 대상을 다시 쓰지 않으므로
+    데이터 크기에 따라 요청 수가 iterations 보다 적을 수 있다.
+    """
+
+    def __init__(self, trainer_ids, members, bookable_members, waiting_tickets, anchor_date, seed):
+        self.rng = random.Random(seed)
+        self.trainer_ids = trainer_ids
+        self.members = members  # [(trainer_id, user_id)]
+        self.bookable_members = bookable_members  # [(trainer_id, user_id, lesson_current_count)]
+        self.waiting_tickets = waiting_tickets  # [(change_ticket_id, trainer_id, change_from, change_type, request_time)]
+        self.anchor_date = anchor_date
+        # 토큰 생성에는 앱 컨텍스트가 필요하므로 미리 만든다.
+        self._trainer_headers = {trainer_id: TestDataFactory.create_trainer_auth_header(trainer_id)
+                                 for trainer_id in {*trainer_ids, *(ticket[1] for ticket in waiting_tickets)}}
+        self._bookings = self._iter_bookings()
+
+    @classmethod
+    def load(cls, first_trainer_id, anchor_date, seed):
+        """first_trainer_id 이후에 생성된 데이터에서 측정 대상을 고른다."""
+        trainer_ids = [trainer_id for trainer_id, in db.session.query(Trainer.trainer_id).filter(
+            Trainer.trainer_id >= first_trainer_id, Trainer.trainer_delete_flag == False
+        ).order_by(Trainer.trainer_id).limit(SAMPLE_TRAINER_COUNT)]
+
+        trainer_users = db.session.query(
+            TrainerUser.trainer_id, TrainerUser.user_id, TrainerUser.lesson_current_count
+        ).filter(
+            TrainerUser.trainer_id.in_(trainer_ids), TrainerUser.trainer_user_delete_flag == False
+        ).order_by(TrainerUser.trainer_user_id).all()
+
+        waiting_tickets = db.session.query(
+            ChangeTicket.id, TrainerUser.trainer_id, ChangeTicket.change_from, ChangeTicket.change_type,
+            ChangeTicket.request_time
+        ).join(
+            Schedule, Schedule.schedule_id == ChangeTicket.schedule_id
+        ).join(
+            TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id
+        ).filter(
+            TrainerUser.trainer_id >= first_trainer_id, ChangeTicket.status == CHANGE_TICKET_STATUS_WAITING
+        ).order_by(ChangeTicket.id).all()
+
+        return cls(trainer_ids,
+                   [(row.trainer_id, row.user_id) for row in trainer_users],
+                   [tuple(row) for row in trainer_users if row.lesson_current_count > 0],
+                   cls._exclude_conflicting_tickets([tuple(row) for row in waiting_tickets]),
+                   anchor_date, seed)
+
+    @staticmethod
+    def _exclude_conflicting_tickets(tickets):
+        """
+        생성 데이터의 변경 희망 시간(request_time)은 다른 수업과 겹칠 수 있고, 겹치는 MODIFY 승인은 400 이 된다.
+        측정에 에러 응답이 섞이지 않도록 기존 수업이나 앞서 고른 티켓의 변경 희망 시간과 겹치는 MODIFY 티켓은 뺀다.
+        """
+        modify_tickets = [ticket for ticket in tickets if ticket[3] == CHANGE_TICKET_TYPE_MODIFY]
+        if not modify_tickets:
+            return tickets
+
+        trainer_ids = {ticket[1] for ticket in modify_tickets}
+        request_times = [ticket[4] for ticket in modify_tickets]
+        lesson_minutes = dict(db.session.query(Trainer.trainer_id, Trainer.lesson_minutes).filter(
+            Trainer.trainer_id.in_(trainer_ids)))
+        booked = db.session.query(TrainerUser.trainer_id, Schedule.schedule_start_time).join(
+            TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id
+        ).filter(
+            TrainerUser.trainer_id.in_(trainer_ids),
+            Schedule.occupying_condition(),
+            Schedule.schedule_start_time > min(request_times) - timedelta(days=1),
+            Schedule.schedule_start_time < max(request_times) + timedelta(days=1)
+        ).all()
+        booked_times = {}
+        for trainer_id, schedule_start_time in booked:
+            booked_times.setdefault(trainer_id, []).append(schedule_start_time)
+        for start_times in booked_times.values():
+            start_times.sort()
+
+        result = []
+        for ticket in tickets:
+            _, trainer_id, _, change_type, request_time = ticket
+            if change_type == CHANGE_TICKET_TYPE_MODIFY:
+                start_times = booked_times.setdefault(trainer_id, [])
+                lesson_duration = timedelta(minutes=lesson_minutes.get(trainer_id) or DEFAULT_LESSON_MINUTES)
+                index = bisect_right(start_times, request_time - lesson_duration)
+                if index < len(start_times) and start_times[index] < request_time + lesson_duration:
+                    continue
+                insort(start_times, request_time)
+            result.append(ticket)
+        return result
+
+    def trainer(self):
+        trainer_id = self.rng.choice(self.trainer_ids)
+        return trainer_id, self.trainer_headers(trainer_id)
+
+    def trainer_headers(self, trainer_id):
+        return self._trainer_headers[trainer_id]
+
+    def member(self):
+        return self.rng.choice(self.members)
+
+    def date(self, days=60):
+        return (self.anchor_date + timedelta(days=self.rng.randint(-days, days))).strftime(DATEFORMAT)
+
+    # 생성 데이터 기간 이후의 미래 날짜에 회원마다 남은 수업 횟수만큼 겹치지 않게 예약한다.
+    def _iter_bookings(self):
+        start_date = max(date.today(), self.anchor_date + timedelta(days=365)) + timedelta(days=1)
+        start = datetime.combine(start_date, datetime.min.time())
+        days = {}
+        for trainer_id, user_id, lesson_current_count in self.bookable_members:
+            for _ in range(lesson_current_count):
+                day = days[trainer_id] = days.get(trainer_id, -1) + 1
+                yield trainer_id, user_id, start + timedelta(days=day, hours=12)
+
+    def next_booking(self):
+        booking = next(self._bookings, None)
+        if booking is None:
+            raise FixturesExhausted('남은 수업 횟수가 있는 회원이 없습니다.')
+        return booking
+
+    def next_waiting_ticket(self):
+        if not self.waiting_tickets:
+            raise FixturesExhausted('대기 중인 변경 티켓이 없습니다.')
+        return self.waiting_tickets.pop(0)
+
+
+def _get_trainer_schedule(schedule_type):
+    def build(fixtures):
+        trainer_id, headers = fixtures.trainer()
+        return 'GET', f'/schedules/trainer/{trainer_id}?date={fixtures.date()}&type={schedule_type}', headers, None
+    return build
+
+
+def _get_trainer_slots(fixtures):
+    trainer_id, headers = fixtures.trainer()
+    start_date = fixtures.date()
+    end_date = (datetime.strptime(start_date, DATEFORMAT) + timedelta(days=13)).strftime(DATEFORMAT)
+    return 'GET', f'/schedules/trainer/{trainer_id}/slots?from={start_date}&to={end_date}', headers, None
+
+
+def _get_user_schedule(schedule_type):
+    def build(fixtures):
+        _, user_id = fixtures.member()
+        return 'GET', f'/schedules/user/{user_id}?date={fixtures.date()}&type={schedule_type}', None, None
+    return build
+
+
+def _create_schedule(fixtures):
+    trainer_id, user_id, start_time = fixtures.next_booking()
+    body = {'trainer_id': trainer_id, 'user_id': user_id, 'schedule_start_time': start_time.strftime(DATETIMEFORMAT)}
+    return 'POST', '/schedules', None, body
+
+
+def _get_trainer_change_tickets(fixtures):
+    trainer_id, headers = fixtures.trainer()
+    status = f'{CHANGE_TICKET_STATUS_WAITING},{CHANGE_TICKET_STATUS_APPROVED},{CHANGE_TICKET_STATUS_REJECTED}'
+    return 'GET', f'/change-ticket/trainer/{trainer_id}?status={status}', headers, None
+
+
+def _approve_change_ticket(fixtures):
+    change_ticket_id, trainer_id, change_from, change_type, request_time = fixtures.next_waiting_ticket()
+    start_time = request_time if change_type == CHANGE_TICKET_TYPE_MODIFY else None
+    body = {
+        'change_from': change_from,
+        'change_type': change_type,
+        'status': CHANGE_TICKET_STATUS_APPROVED,
+        'change_reason': '',
+        'reject_reason': '',
+        'start_time': start_time.strftime(DATETIMEFORMAT) if start_time else None,
+    }
+    return 'PUT', f'/change-ticket/{change_ticket_id}', fixtures.trainer_headers(trainer_id), body
+
+
+def _get_trainer_users(fixtures):
+    trainer_id, headers = fixtures.trainer()
+    return 'GET', f'/trainer-user/trainer/{trainer_id}/users', headers, None
+
+
+# 이름: 요청을 만드는 함수(fixtures) -> (method, url, headers, json)
+ENDPOINTS = {
+    'schedules_trainer_day': _get_trainer_schedule('DAY'),
+    'schedules_trainer_week': _get_trainer_schedule('WEEK'),
+    'schedules_trainer_month': _get_trainer_schedule('MONTH'),
+    'schedules_trainer_slots': _get_trainer_slots,
+    'schedules_user_day': _get_user_schedule('DAY'),
+    'schedules_user_month': _get_user_schedule('MONTH'),
+    'schedules_create': _create_schedule,
+    'change_tickets_trainer': _get_trainer_change_tickets,
+    'change_ticket_approve': _approve_change_ticket,
+    'trainer_users': _get_trainer_users,
+}
+
+
+def _percentile(sorted_values, percent):
+    index = max(int(round(len(sorted_values) * percent / 100)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def _send(client, fixtures, build):
+    method, url, headers, body = build(fixtures)
+    started_at = time.perf_counter()
+    response = client.open(url, method=method, headers=headers, json=body)
+    elapsed = time.perf_counter() - started_at
+    return response, elapsed
+
+
+def bench_endpoint(client, fixtures, build, iterations, warmup, alloc_samples):
+    """
+    warmup 후 alloc_samples 번은 tracemalloc 을 켜고 할당량만 재고, iterations 번 지연 시간과 쿼리 수를 잰다.
+    tracemalloc 은 요청을 몇 배 느리게 하므로 지연 시간 측정과 따로 잰다.
+    """
+    latencies = []
+    query_counts = []
+    allocations = []
+    errors = 0
+    try:
+        for _ in range(warmup):
+            _send(client, fixtures, build)
+
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_samples):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                _send(client, fixtures, build)
+                allocations.append(tracemalloc.get_traced_memory()[1] - before)
+        finally:
+            tracemalloc.stop()
+
+        for _ in range(iterations):
+            response, elapsed = _send(client, fixtures, build)
+            latencies.append(elapsed * 1000)
+            query_counts.append(int(response.headers.get(QUERY_COUNT_HEADER, 0)))
+            if response.status_code >= 400:
+                errors += 1
+    except FixturesExhausted:
+        # warmup 이나 할당량 측정 중에 떨어지면 이 API 만 빈 결과로 남기고 나머지 API 는 계속 측정한다.
+        pass
+
+    if not latencies:
+        return {'requests': 0, 'errors': errors, 'mean_ms': None, 'p50_ms': None, 'p95_ms': None,
+                'p99_ms': None, 'queries': None, 'alloc_kb': None}
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(_percentile(latencies, 50), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'p99_ms': round(_percentile(latencies, 99), 3),
+        'queries': statistics.median(query_counts),
+        'alloc_kb': round(statistics.median(allocations) / 1024, 1) if allocations else None,
+    }
+
+
+def run_benchmarks(client, fixtures, iterations=200, warmup=20, alloc_samples=20, endpoints=None):
+    results = {}
+    for name in endpoints or ENDPOINTS:
+        results[name] = bench_endpoint(client, fixtures, ENDPOINTS[name], iterations, warmup, alloc_samples)
+    return results
+
+
+def compare(baseline, current, tolerance=0.25, min_delta_ms=1.0, latency_metrics=GATED_LATENCY_METRICS):
+    """
+    baseline 과 current 의 endpoints 결과를 비교해 회귀 목록을 반환한다.
+    반환값: [(endpoint, metric, baseline 값, current 값)]
+    """
+    regressions = []
+    for name, base in baseline['endpoints'].items():
+        result = current['endpoints'].get(name)
+        if result is None:
+            continue
+        # 측정 대상이 떨어져 빈 결과이면 지연 시간/쿼리 수는 비교할 수 없다. 측정하지 못하게 된 것만 회귀로 본다.
+        if not result['requests'] or not base['requests']:
+            if base['requests'] and not result['requests']:
+                regressions.append((name, 'requests', base['requests'], result['requests']))
+            continue
+        for metric in latency_metrics:
+            if result[metric] > base[metric] * (1 + tolerance) and result[metric] - base[metric] >= min_delta_ms:
+                regressions.append((name, metric, base[metric], result[metric]))
+        if base.get('alloc_kb') is not None and result.get('alloc_kb') is not None \
+                and result['alloc_kb'] > base['alloc_kb'] * (1 + tolerance):
+            regressions.append((name, 'alloc_kb', base['alloc_kb'], result['alloc_kb']))
+        for metric in ('queries', 'errors'):
+            if result[metric] > base[metric]:
+                regressions.append((name, metric, base[metric], result[metric]))
+    return regressions
+
+
+def _format_row(label, result):
+    def number(value, width, digits):
+        return f'{"-":>{width}}' if value is None else f'{value:>{width}.{digits}f}'
+
+    return (f'{label:<26}{result["requests"]:>9}{number(result["p50_ms"], 9, 2)}{number(result["p95_ms"], 9, 2)}'
+            f'{number(result["p99_ms"], 9, 2)}{number(result["queries"], 9, 1)}'
+            f'{number(result.get("alloc_kb"), 10, 1)}{result["errors"]:>8}')
+
+
+def print_results(results, baseline=None):
+    print(f'{"endpoint":<26}{"requests":>9}{"p50":>9}{"p95":>9}{"p99":>9}{"queries":>9}{"alloc_kb":>10}{"errors":>8}')
+    for name, result in results['endpoints'].items():
+        print(_format_row(name, result))
+        base = (baseline or {}).get('endpoints', {}).get(name)
+        if base:
+            print(_format_row('  (baseline)', base))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='endpoint benchmark')
+    parser.add_argument('--scale', choices=list(SCALES), default='S')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--alloc-samples', type=int, default=20)
+    parser.add_argument('--endpoint', action='append', choices=list(ENDPOINTS), help='측정할 API (여러 번 지정 가능)')
+    parser.add_argument('--output', help='결과 JSON 경로. 기본은 benchmarks/results/endpoints-<scale>.json')
+    parser.add_argument('--baseline', help='baseline JSON 경로. 기본은 benchmarks/baselines/endpoints-<scale>.json')
+    parser.add_argument('--save-baseline', action='store_true', help='결과를 baseline 으로 저장하고 비교하지 않는다.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='지연 시간/할당량 허용 증가 비율')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='이보다 작은 지연 시간 증가는 무시한다.')
+    parser.add_argument('--latency-metrics', default=','.join(GATED_LATENCY_METRICS),
+                        help=f'회귀 검사할 지연 시간 지표 ({",".join(LATENCY_METRICS)} 중 선택)')
+    args = parser.parse_args()
+
+    output_path = Path(args.output or BENCHMARK_DIR / 'results' / f'endpoints-{args.scale}.json')
+    baseline_path = Path(args.baseline or BENCHMARK_DIR / 'baselines' / f'endpoints-{args.scale}.json')
+
+    app = create_app('test')
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+    # 프로필 이미지 조회(head_object)는 테스트와 같이 moto S3 로 대신한다.
+    mock_s3 = mock_aws()
+    mock_s3.start()
+    s3 = boto3.client('s3', region_name='us-east-1')
+    s3.create_bucket(Bucket='gymming')
+    ServiceFactory.override('s3_client', s3)
+    # 요청마다 새 앱 컨텍스트(세션)가 만들어지도록, 데이터 준비가 끝나면 컨텍스트를 닫는다.
+    with app.app_context():
+        first_trainer_id = (db.session.query(func.max(Trainer.trainer_id)).scalar() or 0) + 1
+        BulkDataFactory(seed=args.seed, anchor_date=DEFAULT_ANCHOR_DATE).generate(args.scale)
+        fixtures = BenchmarkFixtures.load(first_trainer_id, DEFAULT_ANCHOR_DATE, args.seed)
+        dialect = db.engine.dialect.name
+
+    results = {
+        'meta': {
+            'scale': args.scale,
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'dialect': dialect,
+            'python': platform.python_version(),
+            'created_at': datetime.now().strftime(DATETIMEFORMAT),
+        },
+        'endpoints': run_benchmarks(app.test_client(), fixtures, args.iterations, args.warmup,
+                                    args.alloc_samples, args.endpoint),
+    }
+
+    mock_s3.stop()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        print_results(results)
+        print(f'baseline saved: {baseline_path}')
+        return
+
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+    print_results(results, baseline)
+    if baseline is None:
+        print(f'baseline 이 없습니다: {baseline_path} (--save-baseline 으로 저장)')
+        return
+
+    regressions = compare(baseline, results, args.tolerance, args.min_delta_ms, args.latency_metrics.split(','))
+    for name, metric, base, value in regressions:
+        print(f'REGRESSION {name} {metric}: {base} -> {value}')
+    if regressions:
+        raise SystemExit(1)
+    print('no regressions')
+
+
+if __name__ == '__main__':
+    main()
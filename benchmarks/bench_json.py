@@ -0,0 +1,110 @@
+"""
+목록 응답 직렬화 마이크로 벤치마크. (1000행)
+
+    python -m benchmarks.bench_json
+
+기존 방식(행마다 dict + strftime, marshal_list_with, flask-restx 기본 json.dumps)과
+compile_serializer + 응답 인코더(app.common.json_encoder)의 응답 하나당 비용을 비교한다.
+"""
+import json
+import timeit
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from flask_restx import marshal
+
+from app.common.constants import DATETIMEFORMAT, CHANGE_TICKET_TYPE_MODIFY
+from app.common.json_encoder import dumps
+from app.models.model_change_ticket import ChangeTicketResponse
+from app.utils.util_serializer import compile_serializer, serialize_rows
+
+ROW_COUNT = 1000
+
+ScheduleRow = namedtuple('ScheduleRow', ['schedule_id', 'trainer_id', 'schedule_start_time', 'lesson_name',
+                                         'trainer_name', 'center_name', 'center_location', 'lesson_change_range',
+                                         'lesson_minutes'])
+ChangeTicketRow = namedtuple('ChangeTicketRow', ['id', 'user_name', 'change_ticket_type', 'as_is_date', 'to_be_date',
+                                                 'created_at', 'change_ticket_status', 'user_message',
+                                                 'trainer_message'])
+
+schedule_serializer = compile_serializer({field: field for field in ScheduleRow._fields})
+change_ticket_serializer = compile_serializer({field: field for field in ChangeTicketRow._fields})
+
+
+def make_schedule_rows():
+    start = datetime(2024, 1, 1, 9)
+    return [ScheduleRow(i, 1, start + timedelta(hours=i), 'PT', '트레이너', '센터', '서울', 3, 60)
+            for i in range(ROW_COUNT)]
+
+
+def make_change_ticket_rows():
+    start = datetime(2024, 1, 1, 9)
+    return [ChangeTicketRow(i, '회원', CHANGE_TICKET_TYPE_MODIFY, start + timedelta(hours=i),
+                            start + timedelta(hours=i + 1), start, 'WAITING', '변경 부탁드립니다', None)
+            for i in range(ROW_COUNT)]
+
+
+def legacy_schedules(rows):
+    data = []
+    for row in rows:
+        data.append({
+            "schedule_id": row.schedule_id,
+            "trainer_id": row.trainer_id,
+            "schedule_start_time": row.schedule_start_time.strftime(DATETIMEFORMAT),
+            "lesson_name": row.lesson_name,
+            "trainer_name": row.trainer_name,
+            "center_name": row.center_name,
+            "center_location": row.center_location,
+            "lesson_change_range": row.lesson_change_range,
+            "lesson_minutes": row.lesson_minutes
+        })
+    return json.dumps({"result": data})
+
+
+def fast_schedules(rows):
+    return dumps({"result": serialize_rows(schedule_serializer, rows)})
+
+
+def legacy_change_tickets(rows):
+    results = []
+    for ticket in rows:
+        results.append({
+            'id': ticket.id,
+            'user_name': ticket.user_name,
+            'change_ticket_type': ticket.change_ticket_type,
+            'as_is_date': ticket.as_is_date,
+            'to_be_date': ticket.to_be_date if ticket.change_ticket_type == CHANGE_TICKET_TYPE_MODIFY else None,
+            'created_at': ticket.created_at,
+            'change_ticket_status': ticket.change_ticket_status,
+            'user_message': ticket.user_message,
+            'trainer_message': None
+        })
+    return json.dumps(marshal(results, ChangeTicketResponse.trainer_receive_change_ticket_list))
+
+
+def fast_change_tickets(rows):
+    return dumps(serialize_rows(change_ticket_serializer, rows))
+
+
+def bench(label, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f'{label:<45} {seconds * 1_000:10.2f} ms/response')
+    return seconds
+
+
+def main():
+    schedule_rows = make_schedule_rows()
+    assert json.loads(legacy_schedules(schedule_rows)) == json.loads(fast_schedules(schedule_rows))
+    legacy = bench(f'스케쥴 {ROW_COUNT}행 기존', lambda: legacy_schedules(schedule_rows), 20)
+    fast = bench(f'스케쥴 {ROW_COUNT}행 개선', lambda: fast_schedules(schedule_rows), 20)
+    print(f'{"":<45} x{legacy / fast:.1f}')
+
+    change_ticket_rows = make_change_ticket_rows()
+    assert json.loads(legacy_change_tickets(change_ticket_rows)) == json.loads(fast_change_tickets(change_ticket_rows))
+    legacy = bench(f'변경 티켓 {ROW_COUNT}행 기존(marshal)', lambda: legacy_change_tickets(change_ticket_rows), 20)
+    fast = bench(f'변경 티켓 {ROW_COUNT}행 개선', lambda: fast_change_tickets(change_ticket_rows), 20)
+    print(f'{"":<45} x{legacy / fast:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+트레이너 하루 슬롯 계산 마이크로 벤치마크.
+
+    python -m benchmarks.bench_slots
+
+기존 방식(슬롯마다 모든 수업을 any 로 검사 + strftime)과
+정렬 후 한 번 훑는 compute_slot_grids 의 호출당 비용을 비교한다.
+"""
+import random
+import timeit
+from datetime import datetime, time, timedelta
+
+from app.utils.util_slot import compute_day_slots, compute_slot_grids
+
+
+def legacy_day_slots(date, start_time, end_time, booked_start_times, lesson_minutes, slot_minutes):
+    start_dt = datetime.combine(date, start_time)
+    end_dt = datetime.combine(date, end_time)
+
+    time_slots = []
+    current_time = start_dt
+    while current_time + timedelta(minutes=slot_minutes) <= end_dt:
+        time_slots.append(current_time)
+        current_time += timedelta(minutes=slot_minutes)
+
+    scheduled_times = [(s, s + timedelta(minutes=lesson_minutes)) for s in booked_start_times]
+
+    result = []
+    for slot in time_slots:
+        is_available = not any(s[0] <= slot < s[1] for s in scheduled_times)
+        result.append({'time': slot.strftime('%H:%M'), 'possible': is_available})
+    return result
+
+
+def make_bookings(date, start_time, end_time, lesson_minutes, count, rng):
+    start_dt = datetime.combine(date, start_time)
+    minutes = int((datetime.combine(date, end_time) - start_dt).total_seconds() // 60) - lesson_minutes
+    return [start_dt + timedelta(minutes=rng.randrange(0, minutes, 10)) for _ in range(count)]
+
+
+def bench(label, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f'{label:<45} {seconds * 1_000_000:10.1f} us/call')
+    return seconds
+
+
+def main():
+    rng = random.Random(0)
+    date = datetime(2024, 1, 10).date()
+    lesson_minutes = 60
+
+    cases = [
+        ('09:00-18:00, 30분 슬롯, 수업 9개', time(9), time(18), 30, 9),
+        ('06:00-23:00, 30분 슬롯, 수업 17개', time(6), time(23), 30, 17),
+        ('00:00-23:50, 10분 슬롯, 수업 60개', time(0), time(23, 50), 10, 60),
+        ('00:00-23:55, 5분 슬롯, 수업 200개', time(0), time(23, 55), 5, 200),
+    ]
+    for label, start_time, end_time, slot_minutes, lesson_count in cases:
+        bookings = make_bookings(date, start_time, end_time, lesson_minutes, lesson_count, rng)
+        assert legacy_day_slots(date, start_time, end_time, bookings, lesson_minutes, slot_minutes) == \
+               compute_day_slots(date, start_time, end_time, bookings, lesson_minutes, slot_minutes)
+
+        print(label)
+        legacy = bench('  legacy (any per slot)', lambda: legacy_day_slots(
+            date, start_time, end_time, bookings, lesson_minutes, slot_minutes), 200)
+        sweep = bench('  sweep line', lambda: compute_day_slots(
+            date, start_time, end_time, bookings, lesson_minutes, slot_minutes), 200)
+        print(f'  speedup x{legacy / sweep:.1f}')
+
+    # 한 달치 그리드를 한 번에 계산
+    windows = [(date + timedelta(days=i), time(6), time(23)) for i in range(31)]
+    bookings = []
+    for window_date, start_time, end_time in windows:
+        bookings.extend(make_bookings(window_date, start_time, end_time, lesson_minutes, 12, rng))
+    print('31일, 06:00-23:00, 30분 슬롯, 하루 수업 12개')
+    bench('  legacy x 31 days', lambda: [legacy_day_slots(d, s, e, [b for b in bookings if b.date() == d],
+                                                          lesson_minutes, 30) for d, s, e in windows], 20)
+    bench('  compute_slot_grids (one call)', lambda: compute_slot_grids(windows, bookings, lesson_minutes, 30), 20)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+성능 측정용 대량 데이터 생성. (tests.bulk_data_factory.BulkDataFactory)
+
+    # 로컬 SQLite 파일에 M 크기 데이터 생성
+    TEST_DATABASE_URI=sqlite:////tmp/gymming_bench.db python -m benchmarks.generate_data --scale M --seed 42
+
+    # 개발 DB(MySQL)에 생성
+    python -m benchmarks.generate_data --env dev --scale L --seed 42
+
+같은 --seed, --scale, --anchor-date 로 만들면 같은 데이터가 생성된다.
+"""
+import argparse
+import logging
+import time
+from datetime import datetime
+
+from app import create_app
+from app.common.constants import DATEFORMAT
+from tests.bulk_data_factory import BulkDataFactory, SCALES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='bulk data generator')
+    parser.add_argument('--env', default='test', help='create_app 환경. test 는 TEST_DATABASE_URI 를 사용한다.')
+    parser.add_argument('--scale', choices=list(SCALES), default='S')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--anchor-date', help='스케쥴 기간의 기준 날짜(YYYY-MM-DD). 기본은 오늘')
+    parser.add_argument('--trainers', type=int, help='트레이너 수 (scale 값 대신 사용)')
+    parser.add_argument('--members', type=int, help='트레이너당 평균 회원 수 (scale 값 대신 사용)')
+    parser.add_argument('--skip-occupancy', action='store_true', help='trainer_day_occupancy 집계 생략')
+    args = parser.parse_args()
+
+    overrides = {key: value for key, value in (('trainers', args.trainers), ('members', args.members))
+                 if value is not None}
+    anchor_date = datetime.strptime(args.anchor_date, DATEFORMAT).date() if args.anchor_date else None
+
+    app = create_app(args.env)
+    # 데이터 생성 중에는 test 환경의 SQL 로그를 끈다.
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+    with app.app_context():
+        started_at = time.perf_counter()
+        counts = BulkDataFactory(seed=args.seed, anchor_date=anchor_date).generate(
+            args.scale, backfill_occupancy=not args.skip_occupancy, **overrides)
+        duration = time.perf_counter() - started_at
+
+    for table_name, count in counts.items():
+        print(f'{table_name:<25} {count:>12,}')
+    print(f'elapsed {duration:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
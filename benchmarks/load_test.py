@@ -0,0 +1,84 @@
+"""
+간단한 HTTP 부하 테스트. 같은 API 를 개발 서버와 gunicorn 으로 띄워 처리량을 비교한다.
+
+    # 1) 개발 서버
+    python run.py
+    python -m benchmarks.load_test --url http://localhost:5000/trainers/1 --token <access_token>
+
+    # 2) 운영 설정
+    gunicorn -c gunicorn.conf.py wsgi:app
+    python -m benchmarks.load_test --url http://localhost:5000/trainers/1 --token <access_token>
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+
+def run(url, concurrency, total_requests, headers):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    remaining = [total_requests]
+
+    def worker():
+        nonlocal errors
+        session = requests.Session()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, headers=headers, timeout=30).status_code < 500
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'duration': duration,
+        'rps': len(latencies) / duration,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'p99': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP load test')
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--token', help='Authorization: Bearer 토큰')
+    args = parser.parse_args()
+
+    headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+    # 커넥션 풀과 캐시를 채우기 위한 워밍업
+    run(args.url, args.concurrency, args.concurrency * 2, headers)
+    result = run(args.url, args.concurrency, args.requests, headers)
+
+    print(f"requests {result['requests']}  errors {result['errors']}  duration {result['duration']:.2f}s")
+    print(f"throughput {result['rps']:.1f} req/s")
+    print(f"latency p50 {result['p50']:.1f}ms  p95 {result['p95']:.1f}ms  p99 {result['p99']:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+운영 서버 설정.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+개발 서버(run.py)는 debug 모드의 단일 프로세스라 운영에는 사용하지 않는다.
+워커/스레드 수와 DB 커넥션 풀은 환경 변수로 조정한다. (app/common/config.py 참고)
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# I/O(DB, S3) 대기가 대부분이므로 프로세스 + 스레드 조합을 사용
+worker_class = 'gthread'
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# 메모리 누수 대비 일정 요청 수마다 워커 교체
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = 1000
+
+# 앱을 마스터에서 한 번만 로드하고 워커는 fork 로 공유한다.
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # 마스터에서 create_app 중 열린 커넥션을 워커가 공유하지 않도록 풀을 새로 만든다.
+    # boto3 클라이언트도 fork 후 공유하면 안 되므로 서비스 캐시를 비운다.
+    from app.services.service_factory import ServiceFactory
+    from database import db
+    from wsgi import app
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    ServiceFactory.reset()
@@ -0,0 +1,12 @@
+-- /sync 응답에 내려주는 updated_at 컬럼을 추가한다. (schedule, change_ticket, trainer_user)
+-- 적용 여부 확인: SHOW COLUMNS FROM schedule LIKE 'updated_at';
+-- 앱이 이 컬럼을 조회하므로 새 버전을 배포하기 전에 적용해야 한다.
+
+ALTER TABLE schedule ADD COLUMN updated_at DATETIME NULL;
+ALTER TABLE change_ticket ADD COLUMN updated_at DATETIME NULL;
+ALTER TABLE trainer_user ADD COLUMN updated_at DATETIME NULL;
+
+-- 기존 행은 생성 시각(없으면 적용 시각)으로 채운다. 앱은 UTC 로 기록한다.
+UPDATE schedule SET updated_at = UTC_TIMESTAMP() WHERE updated_at IS NULL;
+UPDATE change_ticket SET updated_at = COALESCE(created_at, UTC_TIMESTAMP()) WHERE updated_at IS NULL;
+UPDATE trainer_user SET updated_at = COALESCE(created_at, UTC_TIMESTAMP()) WHERE updated_at IS NULL;
@@ -0,0 +1,56 @@
+-- refresh token 원문 대신 jti 의 sha256 을 저장하고, 사용자/트레이너당 한 행만 두도록 바꾼다.
+-- 적용 여부 확인: SHOW COLUMNS FROM user_refresh_token LIKE 'jti_hash';
+-- 앱은 jti_hash 컬럼에 upsert 하므로 새 버전을 배포하기 전에 적용해야 한다. (MySQL 5.7 이상, JSON 함수 사용)
+-- 기존 로그인은 유지된다. 중복 행은 가장 최근 것만 남기므로, 이전 토큰을 쓰던 기기는 다시 로그인해야 한다.
+
+-- user_refresh_token
+ALTER TABLE user_refresh_token ADD COLUMN jti_hash VARCHAR(64) NULL, ADD COLUMN jwt_payload TEXT NULL;
+
+-- user_id 당 가장 최근 행만 남긴다.
+DELETE t FROM user_refresh_token t
+JOIN (SELECT user_id, MAX(refresh_token_id) AS keep_id FROM user_refresh_token GROUP BY user_id) latest
+  ON latest.user_id = t.user_id AND t.refresh_token_id <> latest.keep_id;
+
+-- JWT 의 payload(base64url) 를 디코딩해 jti 의 sha256 을 채운다. (hashlib.sha256(jti).hexdigest() 와 같은 값)
+UPDATE user_refresh_token
+SET jwt_payload = REPLACE(REPLACE(SUBSTRING_INDEX(SUBSTRING_INDEX(refresh_token, '.', 2), '.', -1), '-', '+'), '_', '/');
+UPDATE user_refresh_token
+SET jwt_payload = CONVERT(FROM_BASE64(RPAD(jwt_payload, CEIL(LENGTH(jwt_payload) / 4) * 4, '=')) USING utf8mb4);
+UPDATE user_refresh_token
+SET jti_hash = SHA2(JSON_UNQUOTE(JSON_EXTRACT(jwt_payload, '$.jti')), 256)
+WHERE JSON_VALID(jwt_payload);
+
+-- jti 를 읽을 수 없는 토큰은 지운다. (해당 사용자는 다시 로그인해야 한다)
+DELETE FROM user_refresh_token WHERE jti_hash IS NULL;
+
+ALTER TABLE user_refresh_token
+  MODIFY jti_hash VARCHAR(64) NOT NULL,
+  ADD UNIQUE KEY uq_user_refresh_token_user_id (user_id),
+  DROP COLUMN jwt_payload,
+  DROP COLUMN refresh_token;
+
+-- trainer_refresh_token
+ALTER TABLE trainer_refresh_token ADD COLUMN jti_hash VARCHAR(64) NULL, ADD COLUMN jwt_payload TEXT NULL;
+
+-- trainer_id 당 가장 최근 행만 남긴다.
+DELETE t FROM trainer_refresh_token t
+JOIN (SELECT trainer_id, MAX(refresh_token_id) AS keep_id FROM trainer_refresh_token GROUP BY trainer_id) latest
+  ON latest.trainer_id = t.trainer_id AND t.refresh_token_id <> latest.keep_id;
+
+-- JWT 의 payload(base64url) 를 디코딩해 jti 의 sha256 을 채운다. (hashlib.sha256(jti).hexdigest() 와 같은 값)
+UPDATE trainer_refresh_token
+SET jwt_payload = REPLACE(REPLACE(SUBSTRING_INDEX(SUBSTRING_INDEX(refresh_token, '.', 2), '.', -1), '-', '+'), '_', '/');
+UPDATE trainer_refresh_token
+SET jwt_payload = CONVERT(FROM_BASE64(RPAD(jwt_payload, CEIL(LENGTH(jwt_payload) / 4) * 4, '=')) USING utf8mb4);
+UPDATE trainer_refresh_token
+SET jti_hash = SHA2(JSON_UNQUOTE(JSON_EXTRACT(jwt_payload, '$.jti')), 256)
+WHERE JSON_VALID(jwt_payload);
+
+-- jti 를 읽을 수 없는 토큰은 지운다. (해당 사용자는 다시 로그인해야 한다)
+DELETE FROM trainer_refresh_token WHERE jti_hash IS NULL;
+
+ALTER TABLE trainer_refresh_token
+  MODIFY jti_hash VARCHAR(64) NOT NULL,
+  ADD UNIQUE KEY uq_trainer_refresh_token_trainer_id (trainer_id),
+  DROP COLUMN jwt_payload,
+  DROP COLUMN refresh_token;
@@ -4,6 +4,7 @@ import boto3
 from moto import mock_aws
 
 from app import create_app
+from app.services.service_factory import ServiceFactory
 from database import db
 
 
@@ -34,6 +35,10 @@ class BaseTestCase(unittest.TestCase):
         cls.s3.create_bucket(Bucket='gymming')
 
     def setUp(self):
+        # 이전 테스트에서 만든 서비스(와 캐시)를 버리고 moto 클라이언트를 주입
+        # 테스트마다 롤백되어 같은 id 가 다시 쓰이므로 캐시가 테스트 사이에 남으면 안 된다.
+        ServiceFactory.reset()
+        ServiceFactory.override('s3_client', self.s3)
         db.session.begin_nested()
 
     def tearDown(self):
@@ -42,3 +47,4 @@ class BaseTestCase(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         cls.mock_s3.stop()
+        ServiceFactory.reset()
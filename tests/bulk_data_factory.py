@@ -0,0 +1,279 @@
+"""
+성능 측정용 대량 데이터 생성기.
+
+TestDataFactory 가 한 건씩 만들고 커밋하는 것과 달리, 시드로 재현 가능한 데이터를 테이블별 bulk insert 로 만든다.
+같은 seed, scale, anchor_date 로 만들면 항상 같은 데이터가 생성된다.
+
+    from tests.bulk_data_factory import BulkDataFactory
+    counts = BulkDataFactory(seed=42).generate('M')
+
+CLI 는 benchmarks/generate_data.py 를 사용한다.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func
+
+from app import db, Trainer, Users, TrainerUser, Schedule, ChangeTicket, TrainerAvailability
+from app.common.constants import SCHEDULE_SCHEDULED, SCHEDULE_CANCELLED, SCHEDULE_MODIFIED, \
+    CHANGE_TICKET_TYPE_CANCEL, CHANGE_TICKET_TYPE_MODIFY, CHANGE_FROM_USER, CHANGE_FROM_TRAINER, \
+    CHANGE_TICKET_STATUS_WAITING, CHANGE_TICKET_STATUS_APPROVED, CHANGE_TICKET_STATUS_REJECTED, \
+    CHANGE_TICKET_STATUS_CANCELED
+from app.entities.entity_trainer_fcm_token import TrainerFcmToken
+from app.entities.entity_user_fcm_token import UserFcmToken
+from app.repositories.repository_trainer_day_occupancy import TrainerDayOccupancyRepository
+
+# trainers: 트레이너 수, members: 트레이너당 평균 회원 수, past_days/future_days: 오늘 기준 스케쥴 기간
+SCALES = {
+    'S': {'trainers': 20, 'members': 30, 'past_days': 90, 'future_days': 30},
+    'M': {'trainers': 200, 'members': 100, 'past_days': 365, 'future_days': 60},
+    'L': {'trainers': 2000, 'members': 200, 'past_days': 730, 'future_days': 90},
+    'XL': {'trainers': 5000, 'members': 300, 'past_days': 1095, 'future_days': 90},
+}
+
+INSERT_BATCH_SIZE = 5000
+
+FAMILY_NAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_NAMES = ['민준', '서연', '도윤', '지우', '하준', '서윤', '은우', '지민', '시우', '수아', '예준', '하은', '주원', '지유']
+CENTER_TYPES = ['필라테스', '헬스', '요가', '크로스핏', '수영']
+CENTER_LOCATIONS = ['서울 강남구', '서울 마포구', '서울 송파구', '경기 성남시', '부산 해운대구', '대구 수성구']
+LESSON_TOTAL_COUNTS = [10, 20, 30, 50]
+# 퇴근 후 저녁 시간대에 예약이 몰린다.
+HOUR_WEIGHTS = {hour: (3 if 18 <= hour <= 21 else 2 if 6 <= hour <= 9 else 1) for hour in range(24)}
+
+
+class BulkDataFactory:
+    """
+    트레이너마다 근무 요일/시간(trainer_availability) 안에서 하루 수업 수를 정하고 회원을 배정해 스케쥴을 만든다.
+    지난 스케쥴 일부는 취소/변경되며, 스케쥴 일부에는 모든 상태의 변경 티켓이 생긴다.
+    PK 는 테이블의 현재 최대값 다음부터 직접 지정하므로 기존 데이터가 있는 DB 에도 추가할 수 있다.
+    """
+
+    def __init__(self, seed=0, anchor_date=None, batch_size=INSERT_BATCH_SIZE):
+        self.rng = random.Random(seed)
+        self.anchor_date = anchor_date or date.today()
+        self.batch_size = batch_size
+        self.counts = {}
+        self._buffers = {}
+
+    def generate(self, scale='S', backfill_occupancy=True, **overrides):
+        """scale(S/M/L/XL) 크기의 데이터를 만들고 테이블별 생성 건수를 반환한다. overrides 로 SCALES 값을 바꿀 수 있다."""
+        if scale not in SCALES:
+            raise ValueError(f'scale 은 {", ".join(SCALES)} 중 하나여야 합니다.')
+        options = {**SCALES[scale], **overrides}
+
+        self._next_ids = {model: self._select_next_id(column) for model, column in (
+            (Trainer, Trainer.trainer_id),
+            (Users, Users.user_id),
+            (TrainerUser, TrainerUser.trainer_user_id),
+            (Schedule, Schedule.schedule_id),
+        )}
+        first_day = self.anchor_date - timedelta(days=options['past_days'])
+        last_day = self.anchor_date + timedelta(days=options['future_days'])
+
+        for _ in range(options['trainers']):
+            self._generate_trainer(options['members'], first_day, last_day)
+        self._flush_all()
+
+        if backfill_occupancy:
+            self.counts['trainer_day_occupancy'] = TrainerDayOccupancyRepository(db=db).backfill()
+        return dict(self.counts)
+
+    def _generate_trainer(self, member_mean, first_day, last_day):
+        rng = self.rng
+        trainer_id = self._allocate_id(Trainer)
+        lesson_minutes = rng.choice([50, 60, 60, 60, 90])
+        self._add(Trainer, {
+            'trainer_id': trainer_id,
+            'trainer_social_id': f'kakao_bulk_trainer_{trainer_id}',
+            'trainer_name': self._name(),
+            'trainer_phone_number': self._phone_number(),
+            'trainer_gender': rng.choice(['M', 'F']),
+            'trainer_birthday': date(rng.randint(1975, 2000), rng.randint(1, 12), rng.randint(1, 28)),
+            'description': 'description',
+            'lesson_name': 'PT',
+            'lesson_price': rng.choice([50000, 60000, 70000, 80000]),
+            'lesson_minutes': lesson_minutes,
+            'lesson_change_range': rng.choice([1, 2, 3, 3, 7]),
+            'trainer_email': f'trainer{trainer_id}@example.com',
+            'trainer_delete_flag': rng.random() < 0.01,
+            'center_name': f'센터 {trainer_id % 500}',
+            'center_location': rng.choice(CENTER_LOCATIONS),
+            'center_number': '02-555-5555',
+            'center_type': rng.choice(CENTER_TYPES),
+        })
+        for _ in range(rng.choice([1, 1, 1, 2])):
+            self._add(TrainerFcmToken, {'trainer_id': trainer_id, 'fcm_token': self._fcm_token()})
+
+        availabilities = self._generate_availabilities(trainer_id, lesson_minutes)
+        members = self._generate_members(trainer_id, member_mean)
+        active_members = [trainer_user_id for trainer_user_id, deleted in members if not deleted]
+        if active_members:
+            self._generate_schedules(active_members, availabilities, lesson_minutes, first_day, last_day)
+
+    # 주 5~6일 근무, 요일마다 시작/종료 시간과 하루 최대 수업 수가 다르다.
+    def _generate_availabilities(self, trainer_id, lesson_minutes):
+        rng = self.rng
+        availabilities = {}
+        for week_day in sorted(rng.sample(range(7), rng.choice([5, 5, 6]))):
+            start_hour = rng.randint(6, 10)
+            end_hour = rng.randint(max(start_hour + 8, 18), 22)
+            slot_count = (end_hour - start_hour) * 60 // lesson_minutes
+            possible_lesson_cnt = min(rng.randint(6, 10), slot_count)
+            availabilities[week_day] = (start_hour, end_hour, possible_lesson_cnt)
+            self._add(TrainerAvailability, {
+                'trainer_id': trainer_id,
+                'week_day': week_day,
+                'start_time': time(start_hour),
+                'end_time': time(end_hour),
+                'possible_lesson_cnt': possible_lesson_cnt,
+            })
+        return availabilities
+
+    # 회원 수는 평균의 절반~1.5배. 약 10% 는 수업이 끝나 삭제된 회원이다.
+    def _generate_members(self, trainer_id, member_mean):
+        rng = self.rng
+        members = []
+        for _ in range(rng.randint(max(member_mean // 2, 1), max(member_mean * 3 // 2, 1))):
+            user_id = self._allocate_id(Users)
+            self._add(Users, {
+                'user_id': user_id,
+                'user_social_id': f'kakao_bulk_user_{user_id}',
+                'user_email': f'user{user_id}@example.com',
+                'user_name': self._name(),
+                'user_gender': rng.choice(['M', 'F']),
+                'user_phone_number': self._phone_number(),
+                'user_delete_flag': False,
+                'user_birthday': date(rng.randint(1960, 2008), rng.randint(1, 12), rng.randint(1, 28)),
+            })
+            # 푸쉬 알림 발송은 토큰이 있다고 가정하므로 회원마다 토큰을 하나 이상 만든다.
+            for _ in range(rng.choice([1, 1, 2])):
+                self._add(UserFcmToken, {'user_id': user_id, 'fcm_token': self._fcm_token()})
+
+            trainer_user_id = self._allocate_id(TrainerUser)
+            deleted = rng.random() < 0.1
+            lesson_total_count = rng.choice(LESSON_TOTAL_COUNTS)
+            created_at = datetime.combine(self.anchor_date, time(12)) - timedelta(days=rng.randint(0, 1095))
+            self._add(TrainerUser, {
+                'trainer_user_id': trainer_user_id,
+                'trainer_id': trainer_id,
+                'user_id': user_id,
+                'lesson_total_count': lesson_total_count,
+                'lesson_current_count': 0 if deleted else rng.randint(1, lesson_total_count),
+                'trainer_user_delete_flag': deleted,
+                'exercise_days': rng.choice([None, '월,수,금', '화,목', '토']),
+                'special_notes': None,
+                'created_at': created_at,
+                'deleted_at': created_at + timedelta(days=rng.randint(30, 365)) if deleted else None,
+                'updated_at': created_at,
+            })
+            members.append((trainer_user_id, deleted))
+        return members
+
+    def _generate_schedules(self, members, availabilities, lesson_minutes, first_day, last_day):
+        rng = self.rng
+        now = datetime.combine(self.anchor_date, time())
+        day = first_day
+        while day <= last_day:
+            availability = availabilities.get(day.weekday())
+            day, current_day = day + timedelta(days=1), day
+            if availability is None:
+                continue
+
+            start_hour, end_hour, possible_lesson_cnt = availability
+            start = datetime.combine(current_day, time(start_hour))
+            slots = [start + timedelta(minutes=minutes)
+                     for minutes in range(0, (end_hour - start_hour) * 60 - lesson_minutes + 1, lesson_minutes)]
+            lesson_count = min(rng.randint(possible_lesson_cnt // 2, possible_lesson_cnt), len(slots))
+            weights = [HOUR_WEIGHTS[slot.hour] for slot in slots]
+            for start_time in sorted(self._weighted_sample(slots, weights, lesson_count)):
+                self._add_schedule(rng.choice(members), start_time, start_time < now)
+
+    def _add_schedule(self, trainer_user_id, start_time, is_past):
+        rng = self.rng
+        schedule_id = self._allocate_id(Schedule)
+        status = SCHEDULE_SCHEDULED
+        if is_past:
+            status = rng.choices([SCHEDULE_SCHEDULED, SCHEDULE_CANCELLED, SCHEDULE_MODIFIED], [87, 8, 5])[0]
+        self._add(Schedule, {
+            'schedule_id': schedule_id,
+            'trainer_user_id': trainer_user_id,
+            'schedule_start_time': start_time,
+            'schedule_status': status,
+            'schedule_delete_flag': False,
+            'updated_at': start_time - timedelta(days=1),
+        })
+
+        # 취소/변경된 스케쥴은 승인된 티켓이 있고, 나머지는 약 8% 에 대기/거절/철회된 티켓이 있다.
+        if status == SCHEDULE_CANCELLED:
+            self._add_change_ticket(schedule_id, start_time, CHANGE_TICKET_TYPE_CANCEL, CHANGE_TICKET_STATUS_APPROVED)
+        elif status == SCHEDULE_MODIFIED:
+            self._add_change_ticket(schedule_id, start_time, CHANGE_TICKET_TYPE_MODIFY, CHANGE_TICKET_STATUS_APPROVED)
+        elif rng.random() < 0.08:
+            if is_past:
+                ticket_status = rng.choice([CHANGE_TICKET_STATUS_REJECTED, CHANGE_TICKET_STATUS_CANCELED])
+            else:
+                ticket_status = rng.choices([CHANGE_TICKET_STATUS_WAITING, CHANGE_TICKET_STATUS_REJECTED,
+                                             CHANGE_TICKET_STATUS_CANCELED], [6, 2, 2])[0]
+            change_type = rng.choice([CHANGE_TICKET_TYPE_MODIFY, CHANGE_TICKET_TYPE_CANCEL])
+            self._add_change_ticket(schedule_id, start_time, change_type, ticket_status)
+
+    def _add_change_ticket(self, schedule_id, start_time, change_type, status):
+        rng = self.rng
+        # as_is_date: 변경 전 수업 시간, request_time: 변경 희망 시간
+        as_is_date = start_time
+        request_time = None
+        if change_type == CHANGE_TICKET_TYPE_MODIFY:
+            request_time = start_time + timedelta(days=rng.randint(1, 3), hours=rng.randint(-2, 2))
+        created_at = start_time - timedelta(days=rng.randint(1, 7), hours=rng.randint(0, 12))
+        self._add(ChangeTicket, {
+            'schedule_id': schedule_id,
+            'change_from': CHANGE_FROM_USER if rng.random() < 0.8 else CHANGE_FROM_TRAINER,
+            'change_type': change_type,
+            'description': '일정 변경 부탁드립니다.',
+            'status': status,
+            'request_time': request_time,
+            'as_is_date': as_is_date,
+            'created_at': created_at,
+            'reject_reason': '해당 시간은 어렵습니다.' if status == CHANGE_TICKET_STATUS_REJECTED else None,
+            'updated_at': created_at,
+        })
+
+    def _weighted_sample(self, population, weights, k):
+        # 가중치를 적용한 비복원 추출 (Efraimidis-Spirakis)
+        keys = [self.rng.random() ** (1 / weight) for weight in weights]
+        return [item for _, item in sorted(zip(keys, population), reverse=True)[:k]]
+
+    def _name(self):
+        return self.rng.choice(FAMILY_NAMES) + self.rng.choice(GIVEN_NAMES)
+
+    def _phone_number(self):
+        return f'010-{self.rng.randint(1000, 9999)}-{self.rng.randint(1000, 9999)}'
+
+    def _fcm_token(self):
+        return f'{self.rng.getrandbits(128):032x}'
+
+    def _select_next_id(self, column):
+        return (db.session.query(func.max(column)).scalar() or 0) + 1
+
+    def _allocate_id(self, model):
+        next_id = self._next_ids[model]
+        self._next_ids[model] = next_id + 1
+        return next_id
+
+    def _add(self, model, row):
+        buffer = self._buffers.setdefault(model, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self._flush_all()
+
+    # FK 순서대로 넣는다. 버퍼 하나가 차면 전체를 비워 부모 행이 먼저 들어가게 한다.
+    def _flush_all(self):
+        for model in (Trainer, Users, TrainerUser, TrainerAvailability, TrainerFcmToken, UserFcmToken,
+                      Schedule, ChangeTicket):
+            rows = self._buffers.pop(model, None)
+            if rows:
+                db.session.execute(model.__table__.insert(), rows)
+                table_name = model.__tablename__
+                self.counts[table_name] = self.counts.get(table_name, 0) + len(rows)
+        db.session.commit()
@@ -0,0 +1,17 @@
+class FakeRedis:
+    """redis.Redis 대신 사용하는 로컬 클라이언트. 값은 문자열로만 저장한다."""
+
+    def __init__(self):
+        self.store = {}
+        self.expires = {}
+
+    def get(self, name):
+        return self.store.get(name)
+
+    def set(self, name, value, ex=None):
+        assert isinstance(value, str)
+        self.store[name] = value
+        self.expires[name] = ex
+
+    def delete(self, name):
+        self.store.pop(name, None)
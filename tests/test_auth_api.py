@@ -1,11 +1,22 @@
-from unittest.mock import patch
+import responses
+from flask_jwt_extended import decode_token
 
+from app.common.query_counter import query_budget
 from app.entities.entity_trainer_refresh_token import TrainerRefreshToken
 from app.entities.entity_user_refresh_token import UserRefreshToken
+from app.common.cache import RemoteCacheBackend
+from app.repositories.repository_token import TokenRepository
+from app.services.service_factory import ServiceFactory
+from app.services.service_token import hash_jti, TokenService
 from tests import BaseTestCase
+from tests.fake_redis import FakeRedis
 from tests.test_data_factory import TestDataFactory
 
 
+def mock_kakao_user(kakao_id):
+    responses.get('https://kapi.kakao.com/v2/user/me', json={'id': kakao_id})
+
+
 class AuthTestCase(BaseTestCase):
     def test_트레이너_토큰으로_인증하면_trainer_id를_리턴한다(self):
         trainer = TestDataFactory.create_trainer()
@@ -29,12 +40,10 @@ class AuthTestCase(BaseTestCase):
         print(data)
         self.assertIn('user_id', data)
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_트레이너_로그인_성공하면_trainer_id와_토큰들을_리턴한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_트레이너_로그인_성공하면_trainer_id와_토큰들을_리턴한다(self):
         kakao_id = 123123214
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         trainer = TestDataFactory.create_trainer(trainer_social_id=f'kakao{kakao_id}')
 
@@ -42,28 +51,24 @@ class AuthTestCase(BaseTestCase):
 
         data = response.get_json()
 
-        # 발급받은 refresh token은 DB에 저장되어야 함.
-        trainer_refresh_token = TrainerRefreshToken.query.filter_by(trainer_id=trainer.trainer_id).first().refresh_token
+        # 발급받은 refresh token의 jti 해시가 DB에 저장되어야 함.
+        trainer_jti_hash = TrainerRefreshToken.query.filter_by(trainer_id=trainer.trainer_id).first().jti_hash
 
         self.assertEqual(data['trainer_id'], trainer.trainer_id)
-        self.assertEqual(data['refresh_token'], trainer_refresh_token)
+        self.assertEqual(hash_jti(decode_token(data['refresh_token'])['jti']), trainer_jti_hash)
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_존재하지_않는_트레이너로_로그인하면_401을_응답한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_존재하지_않는_트레이너로_로그인하면_401을_응답한다(self):
         kakao_id = 123123215
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         response = self.client.get(f'/auth/login/kakao/trainer?kakao_token=ttt')
         self.assertEqual(response.status_code, 401)
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_유저_로그인_성공하면_user_id와_토큰들을_리턴한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_유저_로그인_성공하면_user_id와_토큰들을_리턴한다(self):
         kakao_id = 123123216
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         user = TestDataFactory.create_user(user_social_id=f'kakao{kakao_id}')
 
@@ -71,28 +76,24 @@ class AuthTestCase(BaseTestCase):
 
         data = response.get_json()
 
-        # 발급받은 refresh token은 DB에 저장되어야 함.
-        user_refresh_token = UserRefreshToken.query.filter_by(user_id=user.user_id).first().refresh_token
+        # 발급받은 refresh token의 jti 해시가 DB에 저장되어야 함.
+        user_jti_hash = UserRefreshToken.query.filter_by(user_id=user.user_id).first().jti_hash
 
         self.assertEqual(data['user_id'], user.user_id)
-        self.assertEqual(data['refresh_token'], user_refresh_token)
+        self.assertEqual(hash_jti(decode_token(data['refresh_token'])['jti']), user_jti_hash)
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_존재하지_않는_유저로_로그인하면_401을_응답한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_존재하지_않는_유저로_로그인하면_401을_응답한다(self):
         kakao_id = 123123217
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         response = self.client.get('/auth/login/kakao/user?kakao_token=ttt')
         self.assertEqual(response.status_code, 401)
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_카카오_유저_회원가입이_성공하면_user_id와_토큰들을_응답한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_카카오_유저_회원가입이_성공하면_user_id와_토큰들을_응답한다(self):
         kakao_id = 123123218
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         body = {
             'kakao_token': 'ttt',
@@ -109,12 +110,10 @@ class AuthTestCase(BaseTestCase):
         self.assertIn('access_token', data)
         self.assertIn('refresh_token', data)
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_이미_존재하는_카카오_유저로_회원가입하면_400을_응답한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_이미_존재하는_카카오_유저로_회원가입하면_400을_응답한다(self):
         kakao_id = 123123219
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         TestDataFactory.create_user(user_social_id=f'kakao{kakao_id}')
 
@@ -131,12 +130,10 @@ class AuthTestCase(BaseTestCase):
         print(data)
         self.assertEqual(response.status_code, 400)
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_카카오_트레이너_회원가입이_성공하면_user_id와_토큰들을_응답한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_카카오_트레이너_회원가입이_성공하면_user_id와_토큰들을_응답한다(self):
         kakao_id = 123123220
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         body = {
             'kakao_token': 'ttt',
@@ -180,12 +177,10 @@ class AuthTestCase(BaseTestCase):
         self.assertIn('refresh_token', data)
 
 
-    @patch('app.services.service_auth.AuthService.verify_kakao_token')
-    @patch('app.services.service_auth.AuthService.get_kakao_user_info')
-    def test_이미_존재하는_카카오_트레이너로_회원가입하면_400을_응답한다(self, get_kakao_user_info, verify_kakao_token):
+    @responses.activate
+    def test_이미_존재하는_카카오_트레이너로_회원가입하면_400을_응답한다(self):
         kakao_id = 123123221
-        verify_kakao_token.return_value = True, ""
-        get_kakao_user_info.return_value = {"id": kakao_id}
+        mock_kakao_user(kakao_id)
 
         TestDataFactory.create_trainer(trainer_social_id=f'kakao{kakao_id}')
 
@@ -227,3 +222,87 @@ class AuthTestCase(BaseTestCase):
         data = response.get_json()
         print(data)
         self.assertEqual(response.status_code, 400)
+
+    @responses.activate
+    def test_refresh_token으로_access_token을_재발급한다(self):
+        kakao_id = 123123222
+        mock_kakao_user(kakao_id)
+        user = TestDataFactory.create_user(user_social_id=f'kakao{kakao_id}')
+        user_id = user.user_id
+        refresh_token = self.client.get('/auth/login/kakao/user?kakao_token=ttt').get_json()['refresh_token']
+
+        response = self.client.get('/auth/refresh', headers={'Authorization': f'Bearer {refresh_token}'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode_token(response.get_json()['access_token'])['sub'], {'user_id': user_id})
+        self.assertEqual(UserRefreshToken.query.filter_by(user_id=user_id).count(), 1)
+
+    @responses.activate
+    def test_다시_로그인하면_이전_refresh_token은_거절된다(self):
+        kakao_id = 123123223
+        mock_kakao_user(kakao_id)
+        trainer = TestDataFactory.create_trainer(trainer_social_id=f'kakao{kakao_id}')
+        trainer_id = trainer.trainer_id
+        old_token = self.client.get('/auth/login/kakao/trainer?kakao_token=ttt').get_json()['refresh_token']
+        self.client.get('/auth/refresh', headers={'Authorization': f'Bearer {old_token}'})
+
+        new_token = self.client.get('/auth/login/kakao/trainer?kakao_token=ttt').get_json()['refresh_token']
+
+        old_response = self.client.get('/auth/refresh', headers={'Authorization': f'Bearer {old_token}'})
+        new_response = self.client.get('/auth/refresh', headers={'Authorization': f'Bearer {new_token}'})
+        self.assertEqual(old_response.status_code, 401)
+        self.assertEqual(new_response.status_code, 200)
+        # 교체는 upsert 라 트레이너당 한 행만 남는다.
+        self.assertEqual(TrainerRefreshToken.query.filter_by(trainer_id=trainer_id).count(), 1)
+
+    @responses.activate
+    def test_공유_캐시에_있는_refresh_token은_DB를_조회하지_않는다(self):
+        kakao_id = 123123224
+        mock_kakao_user(kakao_id)
+        TestDataFactory.create_user(user_social_id=f'kakao{kakao_id}')
+        ServiceFactory.override('token_service', TokenService(
+            TokenRepository(), RemoteCacheBackend(FakeRedis(), ttl=300, namespace='refresh_jti')))
+        refresh_token = self.client.get('/auth/login/kakao/user?kakao_token=ttt').get_json()['refresh_token']
+        headers = {'Authorization': f'Bearer {refresh_token}'}
+        self.client.get('/auth/refresh', headers=headers)
+
+        with query_budget(0):
+            response = self.client.get('/auth/refresh', headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+
+    @responses.activate
+    def test_공유_캐시를_쓰면_다른_워커에서도_교체된_refresh_token은_거절된다(self):
+        kakao_id = 123123225
+        mock_kakao_user(kakao_id)
+        user = TestDataFactory.create_user(user_social_id=f'kakao{kakao_id}')
+        client = FakeRedis()
+        # 같은 redis 를 쓰는 두 워커의 TokenService. 요청은 worker_a 가 처리한다.
+        worker_a, worker_b = (TokenService(TokenRepository(), RemoteCacheBackend(client, ttl=300, namespace='refresh_jti'))
+                              for _ in range(2))
+        ServiceFactory.override('token_service', worker_a)
+
+        old_token = self.client.get('/auth/login/kakao/user?kakao_token=ttt').get_json()['refresh_token']
+        old_jti = decode_token(old_token)['jti']
+        self.assertTrue(worker_b.is_valid_user_token(user.user_id, old_jti))
+        self.assertEqual(client.store[f'refresh_jti:user:{user.user_id}'], f'"{hash_jti(old_jti)}"')
+
+        self.client.get('/auth/login/kakao/user?kakao_token=ttt')
+
+        self.assertFalse(worker_b.is_valid_user_token(user.user_id, old_jti))
+
+    @responses.activate
+    def test_공유_캐시가_없으면_다른_워커에서_교체된_refresh_token도_바로_거절된다(self):
+        kakao_id = 123123226
+        mock_kakao_user(kakao_id)
+        user = TestDataFactory.create_user(user_social_id=f'kakao{kakao_id}')
+        # CACHE_REDIS_URL 이 없는 기본 설정. 요청은 다른 워커(ServiceFactory 의 TokenService)가 처리한다.
+        worker = TokenService(TokenRepository())
+
+        old_token = self.client.get('/auth/login/kakao/user?kakao_token=ttt').get_json()['refresh_token']
+        old_jti = decode_token(old_token)['jti']
+        self.assertTrue(worker.is_valid_user_token(user.user_id, old_jti))
+
+        self.client.get('/auth/login/kakao/user?kakao_token=ttt')
+
+        self.assertFalse(worker.is_valid_user_token(user.user_id, old_jti))
@@ -0,0 +1,78 @@
+from datetime import date
+
+from sqlalchemy import func
+
+from app import Trainer
+from app.common.constants import CHANGE_TICKET_TYPE_MODIFY
+from benchmarks.bench_endpoints import BenchmarkFixtures, ENDPOINTS, run_benchmarks, compare, bench_endpoint, \
+    FixturesExhausted
+from database import db
+from tests import BaseTestCase
+from tests.bulk_data_factory import BulkDataFactory
+
+ANCHOR_DATE = date(2024, 6, 1)
+
+
+def _result(p50_ms=2.0, p95_ms=3.0, queries=3, errors=0, alloc_kb=30.0):
+    return {'requests': 100, 'errors': errors, 'mean_ms': p50_ms, 'p50_ms': p50_ms, 'p95_ms': p95_ms,
+            'p99_ms': p95_ms * 2, 'queries': queries, 'alloc_kb': alloc_kb}
+
+
+class BenchEndpointsTestCase(BaseTestCase):
+
+    def test_모든_API를_에러없이_측정한다(self):
+        first_trainer_id = (db.session.query(func.max(Trainer.trainer_id)).scalar() or 0) + 1
+        BulkDataFactory(seed=1, anchor_date=ANCHOR_DATE).generate(
+            'S', trainers=3, members=8, past_days=30, future_days=60)
+        fixtures = BenchmarkFixtures.load(first_trainer_id, ANCHOR_DATE, seed=1)
+
+        results = run_benchmarks(self.client, fixtures, iterations=2, warmup=1, alloc_samples=1)
+
+        self.assertEqual(set(results), set(ENDPOINTS))
+        for name, result in results.items():
+            self.assertEqual(result['requests'], 2, msg=name)
+            self.assertEqual(result['errors'], 0, msg=name)
+            self.assertGreater(result['queries'], 0, msg=name)
+            self.assertGreater(result['alloc_kb'], 0, msg=name)
+
+    def test_대기_중인_변경_티켓은_모두_에러없이_승인된다(self):
+        first_trainer_id = (db.session.query(func.max(Trainer.trainer_id)).scalar() or 0) + 1
+        BulkDataFactory(seed=2, anchor_date=ANCHOR_DATE).generate(
+            'S', trainers=5, members=10, past_days=0, future_days=120)
+        fixtures = BenchmarkFixtures.load(first_trainer_id, ANCHOR_DATE, seed=2)
+        ticket_count = len(fixtures.waiting_tickets)
+        self.assertIn(CHANGE_TICKET_TYPE_MODIFY, {ticket[3] for ticket in fixtures.waiting_tickets})
+
+        result = bench_endpoint(self.client, fixtures, ENDPOINTS['change_ticket_approve'],
+                                iterations=ticket_count, warmup=0, alloc_samples=0)
+
+        self.assertEqual(result['requests'], ticket_count)
+        self.assertEqual(result['errors'], 0)
+
+    def test_측정_대상이_warmup_중에_떨어지면_빈_결과를_남긴다(self):
+        def exhausted(fixtures):
+            raise FixturesExhausted('대기 중인 변경 티켓이 없습니다.')
+
+        result = bench_endpoint(self.client, None, exhausted, iterations=2, warmup=1, alloc_samples=1)
+
+        self.assertEqual(result['requests'], 0)
+        self.assertIsNone(result['p50_ms'])
+        baseline = {'endpoints': {'a': _result()}}
+        self.assertEqual(compare(baseline, {'endpoints': {'a': result}}), [('a', 'requests', 100, 0)])
+
+    def test_허용_범위를_넘는_지연_시간과_늘어난_쿼리_수는_회귀이다(self):
+        baseline = {'endpoints': {'a': _result(), 'b': _result(), 'c': _result()}}
+        current = {'endpoints': {
+            'a': _result(p50_ms=2.4, p95_ms=5.0),  # p50 은 허용 범위 안, p95 는 초과
+            'b': _result(queries=4, errors=1),
+            'c': _result(p50_ms=2.9, alloc_kb=60.0),  # 비율은 넘었지만 1ms 미만 증가
+        }}
+
+        regressions = compare(baseline, current, tolerance=0.25, min_delta_ms=1.0)
+
+        self.assertEqual(sorted(regressions), [
+            ('a', 'p95_ms', 3.0, 5.0),
+            ('b', 'errors', 0, 1),
+            ('b', 'queries', 3, 4),
+            ('c', 'alloc_kb', 30.0, 60.0),
+        ])
@@ -0,0 +1,95 @@
+from collections import Counter
+from datetime import date, datetime
+
+from sqlalchemy import func
+
+from app import Trainer, TrainerUser, Schedule, ChangeTicket, TrainerAvailability
+from app.common.constants import CHANGE_TICKET_STATUS_WAITING, CHANGE_TICKET_STATUS_APPROVED, \
+    CHANGE_TICKET_STATUS_REJECTED, CHANGE_TICKET_STATUS_CANCELED
+from database import db
+from tests import BaseTestCase
+from tests.bulk_data_factory import BulkDataFactory
+
+ANCHOR_DATE = date(2024, 6, 1)
+SMALL = {'trainers': 3, 'members': 6, 'past_days': 60, 'future_days': 30}
+
+
+class BulkDataFactoryTestCase(BaseTestCase):
+
+    def _schedules_of(self, trainer_ids):
+        rows = db.session.query(
+            TrainerUser.trainer_id, Schedule.schedule_start_time, Schedule.schedule_status
+        ).join(
+            TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id
+        ).filter(
+            TrainerUser.trainer_id.in_(trainer_ids)
+        ).order_by(Schedule.schedule_id).all()
+        first_trainer_id = min(trainer_ids)
+        return [(row.trainer_id - first_trainer_id, row.schedule_start_time, row.schedule_status) for row in rows]
+
+    # 생성기는 커밋하므로 다른 테스트의 데이터와 구분하기 위해 생성 전 최대 trainer_id 를 기준으로 삼는다.
+    def _last_trainer_id(self):
+        return db.session.query(func.max(Trainer.trainer_id)).scalar() or 0
+
+    def _trainer_ids_after(self, trainer_id):
+        return [row.trainer_id for row in Trainer.query.filter(Trainer.trainer_id > trainer_id)
+                .order_by(Trainer.trainer_id)]
+
+    def test_생성_건수를_반환하고_모든_테이블에_저장된다(self):
+        before = {model: model.query.count() for model in (Schedule, ChangeTicket, TrainerAvailability)}
+
+        counts = BulkDataFactory(seed=1, anchor_date=ANCHOR_DATE).generate('S', **SMALL)
+
+        self.assertEqual(counts['trainer'], 3)
+        self.assertEqual(counts['users'], counts['trainer_user'])
+        self.assertEqual(counts['schedule'], Schedule.query.count() - before[Schedule])
+        self.assertEqual(counts['change_ticket'], ChangeTicket.query.count() - before[ChangeTicket])
+        self.assertEqual(counts['trainer_availability'],
+                         TrainerAvailability.query.count() - before[TrainerAvailability])
+        self.assertGreater(counts['trainer_day_occupancy'], 0)
+        self.assertGreater(counts['trainer_fcm_token'], 0)
+        self.assertGreater(counts['user_fcm_token'], 0)
+
+    def test_같은_시드는_같은_데이터를_만든다(self):
+        last_trainer_id = self._last_trainer_id()
+        BulkDataFactory(seed=7, anchor_date=ANCHOR_DATE).generate('S', backfill_occupancy=False, **SMALL)
+        first_ids = self._trainer_ids_after(last_trainer_id)
+
+        BulkDataFactory(seed=7, anchor_date=ANCHOR_DATE).generate('S', backfill_occupancy=False, **SMALL)
+        second_ids = self._trainer_ids_after(max(first_ids))
+
+        self.assertEqual(len(second_ids), len(first_ids))
+        self.assertEqual(self._schedules_of(first_ids), self._schedules_of(second_ids))
+
+    def test_스케쥴은_근무시간_안에서_겹치지_않고_변경_티켓은_모든_상태가_있다(self):
+        last_trainer_id = self._last_trainer_id()
+        BulkDataFactory(seed=3, anchor_date=ANCHOR_DATE).generate('S', backfill_occupancy=False,
+                                                                  trainers=5, members=10, past_days=180)
+        trainer_ids = self._trainer_ids_after(last_trainer_id)
+
+        availabilities = {(row.trainer_id - min(trainer_ids), row.week_day): row for row in
+                          TrainerAvailability.query.filter(TrainerAvailability.trainer_id.in_(trainer_ids))}
+        booked = Counter()
+        for trainer_id, start_time, _ in self._schedules_of(trainer_ids):
+            availability = availabilities[(trainer_id, start_time.weekday())]
+            self.assertLessEqual(availability.start_time, start_time.time())
+            self.assertLess(start_time.time(), availability.end_time)
+            booked[(trainer_id, start_time)] += 1
+        self.assertEqual(max(booked.values()), 1)
+
+        tickets = db.session.query(ChangeTicket.status, ChangeTicket.as_is_date).join(
+            Schedule, Schedule.schedule_id == ChangeTicket.schedule_id
+        ).join(
+            TrainerUser, TrainerUser.trainer_user_id == Schedule.trainer_user_id
+        ).filter(TrainerUser.trainer_id.in_(trainer_ids)).all()
+        self.assertEqual({ticket.status for ticket in tickets},
+                         {CHANGE_TICKET_STATUS_WAITING, CHANGE_TICKET_STATUS_APPROVED,
+                          CHANGE_TICKET_STATUS_REJECTED, CHANGE_TICKET_STATUS_CANCELED})
+        waiting_as_is_dates = [ticket.as_is_date for ticket in tickets
+                               if ticket.status == CHANGE_TICKET_STATUS_WAITING]
+        self.assertTrue(all(as_is_date >= datetime.combine(ANCHOR_DATE, datetime.min.time())
+                            for as_is_date in waiting_as_is_dates))
+
+    def test_알수없는_크기는_에러(self):
+        with self.assertRaises(ValueError):
+            BulkDataFactory().generate('XXL')
@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
-from app.common.constants import const, CHANGE_TICKET_STATUS_APPROVED
+from app.common.constants import const, CHANGE_TICKET_STATUS_APPROVED, NEXT_CURSOR_HEADER
+from app.common.query_counter import query_budget
 from app.entities.entity_change_ticket import ChangeTicket
 from app.entities.entity_schedule import Schedule
 from app.entities.entity_trainer_user import TrainerUser
+from app.repositories.repository_change_ticket import ChangeTicketRepository
 from database import db
 from tests import BaseTestCase
 from tests.test_data_factory import TestDataFactory, ChangeTicketBuilder, ScheduleBuilder
@@ -26,7 +28,7 @@ class TestChangeTicketApi(BaseTestCase):
         self.assertIsNotNone(result['user_id'])
         self.assertIsNotNone(result['trainer_id'])
 
-    @patch('app.services.service_fcm.FcmService.send_message')
+    @patch('app.services.service_notification.NotificationService.send_message')
     def test_유저_변경_티켓_생성(self, mock_send_message):
         user = TestDataFactory.create_user()
         trainer = TestDataFactory.create_trainer()
@@ -57,7 +59,7 @@ class TestChangeTicketApi(BaseTestCase):
             data={'change_ticket': change_ticket_from_db}
         )
 
-    @patch('app.services.service_fcm.FcmService.send_message')
+    @patch('app.services.service_notification.NotificationService.send_message')
     def test_유저_취소_티켓_생성(self, mock_send_message):
         user = TestDataFactory.create_user()
         trainer = TestDataFactory.create_trainer()
@@ -217,7 +219,7 @@ class TestChangeTicketApi(BaseTestCase):
 
         self.assertEqual(response.status_code, 400)
 
-    @patch('app.services.service_fcm.FcmService.send_message')
+    @patch('app.services.service_notification.NotificationService.send_message')
     def test_유저의_요청이_거절되는_경우(self, mock_send_message):
         user = TestDataFactory.create_user()
         user_fcm_token = TestDataFactory.create_user_fcm_token(user)
@@ -270,7 +272,7 @@ class TestChangeTicketApi(BaseTestCase):
         response = self.client.post(f'/change-ticket', headers=headers, json=body)
         self.assertEqual(response.status_code, 400)
 
-    @patch('app.services.service_fcm.FcmService.send_message')
+    @patch('app.services.service_notification.NotificationService.send_message')
     def test_취소변경티켓이_승인된_경우(self, mock_send_message):
         user = TestDataFactory.create_user()
         user_fcm_token = TestDataFactory.create_user_fcm_token(user)
@@ -315,7 +317,7 @@ class TestChangeTicketApi(BaseTestCase):
             data={'change_ticket': change_ticket_from_db}
         )
 
-    @patch('app.services.service_fcm.FcmService.send_message')
+    @patch('app.services.service_notification.NotificationService.send_message')
     def test_시간변경티켓이_승인된_경우(self, mock_send_message):
         user = TestDataFactory.create_user()
         user_fcm_token = TestDataFactory.create_user_fcm_token(user)
@@ -349,8 +351,9 @@ class TestChangeTicketApi(BaseTestCase):
 
         change_ticket = ChangeTicket.query.filter_by(id=change_ticket.id).first()
         schedule = Schedule.query.filter_by(schedule_id=schedule.schedule_id).first()
-        new_schedule = Schedule.query.filter_by(trainer_user_id=schedule.trainer_user_id,
-                                                schedule_start_time=start_time).first()
+        new_schedule = Schedule.query.filter_by(
+            trainer_user_id=schedule.trainer_user_id,
+            schedule_start_time=datetime.strptime(start_time, const.DATETIMEFORMAT)).first()
         self.assertEqual(response.status_code, 200)
         self.assertEqual(change_ticket.status, const.CHANGE_TICKET_STATUS_APPROVED)
         self.assertEqual(schedule.schedule_status, const.SCHEDULE_MODIFIED)
@@ -401,7 +404,7 @@ class TestChangeTicketApi(BaseTestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.get_json()['message'], f'이미 처리된 Change Ticket 입니다. {change_ticket.id}')
 
-    @patch('app.services.service_fcm.FcmService.send_message')
+    @patch('app.services.service_notification.NotificationService.send_message')
     def test_변경티켓_시간에_이미_스케쥴이_있는데_수락하는_경우(self, mock_send_message):
         # Given
         user = TestDataFactory.create_user()
@@ -465,3 +468,124 @@ class TestChangeTicketApi(BaseTestCase):
         response = self.client.delete(f'/change-ticket/{change_ticket.id}', headers=headers)
         print(response.get_json())
         self.assertEqual(response.status_code, 400)
+
+    def test_트레이너_변경티켓_리스트는_cursor_로_이어서_조회한다(self):
+        trainer = TestDataFactory.create_trainer()
+        ticket_count = 23
+        tickets = [ChangeTicketBuilder().with_trainer(trainer).with_status(const.CHANGE_TICKET_STATUS_WAITING).build()
+                   for _ in range(ticket_count)]
+        # 같은 created_at 이어도 id 로 순서가 정해진다.
+        same_time = datetime(2024, 5, 1, 12)
+        for ticket in tickets[:5]:
+            ticket.created_at = same_time
+        db.session.commit()
+
+        headers = TestDataFactory.create_trainer_auth_header(trainer.trainer_id)
+        url = f'/change-ticket/trainer/{trainer.trainer_id}?status={const.CHANGE_TICKET_STATUS_WAITING}'
+        received = []
+        cursor = None
+        for _ in range(ticket_count):
+            response = self.client.get(url + (f'&cursor={cursor}' if cursor else ''), headers=headers)
+            self.assertEqual(response.status_code, 200)
+            received.extend(ticket['id'] for ticket in response.get_json())
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if cursor is None:
+                break
+
+        expected = sorted(tickets, key=lambda ticket: (ticket.created_at, ticket.id), reverse=True)
+        self.assertEqual(received, [ticket.id for ticket in expected])
+
+    def test_page_를_지정하면_offset_방식으로_조회한다(self):
+        trainer = TestDataFactory.create_trainer()
+        for _ in range(12):
+            ChangeTicketBuilder().with_trainer(trainer).with_status(const.CHANGE_TICKET_STATUS_WAITING).build()
+
+        headers = TestDataFactory.create_trainer_auth_header(trainer.trainer_id)
+        response = self.client.get(
+            f'/change-ticket/trainer/{trainer.trainer_id}?status={const.CHANGE_TICKET_STATUS_WAITING}&page=2',
+            headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+        self.assertNotIn(NEXT_CURSOR_HEADER, response.headers)
+
+    def test_유효하지_않은_cursor_로_조회하면_400을_응답한다(self):
+        trainer = TestDataFactory.create_trainer()
+
+        headers = TestDataFactory.create_trainer_auth_header(trainer.trainer_id)
+        response = self.client.get(
+            f'/change-ticket/trainer/{trainer.trainer_id}?status={const.CHANGE_TICKET_STATUS_WAITING}&cursor=abc',
+            headers=headers)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_변경티켓_상세조회는_한번의_쿼리로_조회한다(self):
+        user = TestDataFactory.create_user()
+        change_ticket_id = ChangeTicketBuilder().with_user(user).build().id
+        headers = TestDataFactory.create_user_auth_header(user.user_id)
+        db.session.expire_all()
+
+        with query_budget(1):
+            response = self.client.get(f'/change-ticket/{change_ticket_id}', headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['user_id'], user.user_id)
+
+    @patch('app.services.service_notification.NotificationService.send_message')
+    def test_변경티켓_거절시_연관_엔티티를_다시_조회하지_않는다(self, mock_send_message):
+        user = TestDataFactory.create_user()
+        user_fcm_token = TestDataFactory.create_user_fcm_token(user).fcm_token
+        change_ticket_id = (ChangeTicketBuilder()
+                            .with_user(user)
+                            .with_status(const.CHANGE_TICKET_STATUS_WAITING)
+                            .build()).id
+        headers = TestDataFactory.create_user_auth_header(user.user_id)
+        body = {
+            "change_from": const.CHANGE_FROM_USER,
+            "change_type": const.CHANGE_TICKET_TYPE_MODIFY,
+            "status": const.CHANGE_TICKET_STATUS_REJECTED,
+            "change_reason": "reason",
+            "reject_reason": "busy",
+            "start_time": "2024-05-26T12:00:00"
+        }
+        db.session.expire_all()
+
+        # 상세 조회 1 + UPDATE 1 + 조회 버전 갱신 1 + 변경 기록 1. 작업 단위로 한 번만 커밋하고 refresh 하지 않는다.
+        with query_budget(4):
+            response = self.client.put(f'/change-ticket/{change_ticket_id}', headers=headers, json=body)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_send_message.call_args.kwargs['token'], user_fcm_token)
+
+    @patch('app.services.service_notification.NotificationService.send_message')
+    def test_FCM_토큰이_여러개여도_변경티켓은_한_행으로_조회하고_최근_토큰으로_알린다(self, mock_send_message):
+        user = TestDataFactory.create_user()
+        trainer = TestDataFactory.create_trainer()
+        for i in range(3):
+            TestDataFactory.create_user_fcm_token(user, fcm_token=f'user-token-{i}')
+            TestDataFactory.create_trainer_fcm_token(trainer, fcm_token=f'trainer-token-{i}')
+        change_ticket_id = (ChangeTicketBuilder()
+                            .with_user(user)
+                            .with_trainer(trainer)
+                            .with_status(const.CHANGE_TICKET_STATUS_WAITING)
+                            .build()).id
+
+        with query_budget(1):
+            row = ChangeTicketRepository(db=db).select_change_ticket_with_lesson_by_id(change_ticket_id)
+
+        self.assertEqual(row.ChangeTicket.id, change_ticket_id)
+        self.assertEqual(row.trainer_fcm_token, 'trainer-token-2')
+        self.assertEqual(row.user_fcm_token, 'user-token-2')
+
+        headers = TestDataFactory.create_trainer_auth_header(trainer.trainer_id)
+        response = self.client.put(f'/change-ticket/{change_ticket_id}', headers=headers, json={
+            "change_from": const.CHANGE_FROM_TRAINER,
+            "change_type": const.CHANGE_TICKET_TYPE_MODIFY,
+            "status": const.CHANGE_TICKET_STATUS_REJECTED,
+            "change_reason": "reason",
+            "reject_reason": "busy",
+            "start_time": "2024-05-26T12:00:00"
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_send_message.call_args.kwargs['token'], 'user-token-2')
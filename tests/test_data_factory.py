@@ -161,8 +161,8 @@ class TestDataFactory:
         trainer_availability = TrainerAvailability(
             trainer_id=trainer.trainer_id,
             week_day=kwargs.get('week_day', 1),
-            start_time=kwargs.get('start_time', datetime.now()),
-            end_time=kwargs.get('end_time', datetime.now()),
+            start_time=kwargs.get('start_time', datetime.now().time()),
+            end_time=kwargs.get('end_time', datetime.now().time()),
             possible_lesson_cnt=kwargs.get('possible_lesson_cnt', 10)
         )
         db.session.add(trainer_availability)
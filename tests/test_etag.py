@@ -0,0 +1,119 @@
+import hashlib
+from datetime import datetime
+
+from app.common.constants import SCHEDULE_CANCELLED, DATETIMEFORMAT, CHANGE_TICKET_STATUS_WAITING
+from app.common.query_counter import query_budget
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory, ScheduleBuilder
+
+
+class ConditionalGetTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = TestDataFactory.create_user()
+        self.trainer = TestDataFactory.create_trainer()
+        self.trainer_user = TestDataFactory.create_trainer_user(trainer=self.trainer, user=self.user)
+        self.schedule = (ScheduleBuilder()
+                         .with_trainer_user(self.trainer_user)
+                         .with_start_time(datetime(2024, 1, 21, 10))
+                         .build())
+        self.user_schedule_url = f'/schedules/user/{self.user.user_id}?date=2024-01-21&type=day'
+
+    def test_버전이_같으면_조회를_실행하지_않고_304를_응답한다(self):
+        first = self.client.get(self.user_schedule_url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNotNone(first.headers.get('ETag'))
+        self.assertEqual(first.headers['Cache-Control'], 'private, no-cache')
+
+        # 버전 조회 1
+        with query_budget(1):
+            second = self.client.get(self.user_schedule_url, headers={'If-None-Match': first.headers['ETag']})
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(second.data, b'')
+
+    def test_조회_조건이_다르면_ETag_가_다르다(self):
+        day = self.client.get(self.user_schedule_url)
+
+        next_day = self.client.get(f'/schedules/user/{self.user.user_id}?date=2024-01-22&type=day',
+                                   headers={'If-None-Match': day.headers['ETag']})
+
+        self.assertEqual(next_day.status_code, 200)
+        self.assertNotEqual(next_day.headers['ETag'], day.headers['ETag'])
+
+    def test_스케쥴이_바뀌면_이전_ETag_로_조회해도_새_결과를_응답한다(self):
+        first = self.client.get(self.user_schedule_url)
+        self.assertEqual(len(first.get_json()['result']), 1)
+
+        body = {
+            "start_time": self.schedule.schedule_start_time.strftime(DATETIMEFORMAT),
+            "status": SCHEDULE_CANCELLED
+        }
+        headers = TestDataFactory.create_user_auth_header(self.user.user_id)
+        response = self.client.put(f'/schedules/{self.schedule.schedule_id}', headers=headers, json=body)
+        self.assertEqual(response.status_code, 200)
+
+        second = self.client.get(self.user_schedule_url, headers={'If-None-Match': first.headers['ETag']})
+
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second.headers['ETag'], first.headers['ETag'])
+
+    def test_트레이너_정보가_바뀌면_담당_회원의_스케쥴_ETag_도_바뀐다(self):
+        first = self.client.get(self.user_schedule_url)
+
+        headers = TestDataFactory.create_trainer_auth_header(self.trainer.trainer_id)
+        response = self.client.put(f'/trainers/{self.trainer.trainer_id}', headers=headers,
+                                   json={'center_name': '새 센터'})
+        self.assertEqual(response.status_code, 200)
+
+        second = self.client.get(self.user_schedule_url, headers={'If-None-Match': first.headers['ETag']})
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.get_json()['result'][0]['center_name'], '새 센터')
+
+    def test_변경_티켓이_생기면_트레이너_목록_ETag_가_바뀐다(self):
+        trainer_id = self.trainer.trainer_id
+        url = f'/change-ticket/trainer/{trainer_id}?status={CHANGE_TICKET_STATUS_WAITING}'
+        headers = TestDataFactory.create_trainer_auth_header(trainer_id)
+        first = self.client.get(url, headers=headers)
+        self.assertEqual(first.get_json(), [])
+
+        self.assertEqual(self.client.get(url, headers=dict(headers, **{'If-None-Match': first.headers['ETag']}))
+                         .status_code, 304)
+
+        ticket = TestDataFactory.create_change_ticket(self.schedule, status=CHANGE_TICKET_STATUS_WAITING)
+        delete_response = self.client.delete(f'/change-ticket/{ticket.id}', headers=headers)
+        self.assertEqual(delete_response.status_code, 200)
+
+        second = self.client.get(url, headers=dict(headers, **{'If-None-Match': first.headers['ETag']}))
+        self.assertEqual(second.status_code, 200)
+
+    def test_다른_사용자의_토큰으로는_ETag_가_맞지_않는다(self):
+        url = f'/change-ticket/user/{self.user.user_id}'
+        first = self.client.get(url, headers=TestDataFactory.create_user_auth_header(self.user.user_id))
+
+        other = self.client.get(url, headers={
+            **TestDataFactory.create_trainer_auth_header(self.trainer.trainer_id),
+            'If-None-Match': first.headers['ETag']
+        })
+
+        self.assertEqual(other.status_code, 200)
+
+    def test_다른_트레이너는_ETag_를_추측해_버전을_알아낼_수_없다(self):
+        url = f'/change-ticket/trainer/{self.trainer.trainer_id}?status={CHANGE_TICKET_STATUS_WAITING}'
+        other_trainer = TestDataFactory.create_trainer()
+        identity = {'trainer_id': other_trainer.trainer_id}
+        full_path = f'/change-ticket/trainer/{self.trainer.trainer_id}?status={CHANGE_TICKET_STATUS_WAITING}'
+        # 비밀키 없이 만들 수 있는 digest(경로와 identity 만의 해시)로 버전을 하나씩 대입한다.
+        digest = hashlib.sha256(f'{full_path}|{identity}'.encode()).hexdigest()[:16]
+        guesses = ', '.join(f'"trainer-{self.trainer.trainer_id}-{version}-{digest}"' for version in range(10))
+
+        response = self.client.get(url, headers={
+            **TestDataFactory.create_trainer_auth_header(other_trainer.trainer_id),
+            'If-None-Match': guesses
+        })
+
+        # 304 가 아니라 라우트 본문의 소유자 확인까지 실행된다.
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,80 @@
+import io
+from unittest.mock import patch
+
+from app.common.exceptions import ApplicationError
+from app.services.service_image import ImageService
+from tests import BaseTestCase
+
+
+class ImageServiceTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.image_service = ImageService(s3=self.s3, bucket='gymming')
+
+    def _put(self, s3_key):
+        self.s3.put_object(Bucket='gymming', Key=s3_key, Body=b'image')
+
+    def test_같은_키는_두번째_조회부터_head_object_를_호출하지_않는다(self):
+        self._put('user/1/profile')
+
+        with patch.object(self.s3, 'head_object', wraps=self.s3.head_object) as head_object:
+            first = self.image_service.get_presigned_url('user/1/profile')
+            second = self.image_service.get_presigned_url('user/1/profile')
+
+        self.assertIsNotNone(first)
+        self.assertEqual(first, second)
+        self.assertEqual(head_object.call_count, 1)
+
+    def test_업로드한_이미지는_존재_확인_없이_url_을_만든다(self):
+        s3_key = self.image_service.upload_image('trainer', 1, io.BytesIO(b'image'), 'profile')
+
+        with patch.object(self.s3, 'head_object', wraps=self.s3.head_object) as head_object:
+            url = self.image_service.get_presigned_url(s3_key)
+
+        self.assertIn('trainer/1/profile', url)
+        head_object.assert_not_called()
+
+    def test_삭제한_이미지는_None_을_반환한다(self):
+        s3_key = self.image_service.upload_image('trainer', 2, io.BytesIO(b'image'), 'profile')
+        self.assertIsNotNone(self.image_service.get_presigned_url(s3_key))
+
+        self.image_service.delete_image(s3_key=s3_key)
+
+        with patch.object(self.s3, 'head_object', wraps=self.s3.head_object) as head_object:
+            self.assertIsNone(self.image_service.get_presigned_url(s3_key))
+        head_object.assert_not_called()
+
+    def test_여러_키를_한번에_조회한다(self):
+        keys = [f'user/{user_id}/profile' for user_id in range(10, 20)]
+        for s3_key in keys[:5]:
+            self._put(s3_key)
+
+        with patch.object(self.s3, 'head_object', wraps=self.s3.head_object) as head_object:
+            urls = self.image_service.get_presigned_urls(keys + keys[:2])
+            again = self.image_service.get_presigned_urls(keys)
+
+        self.assertEqual(set(urls), set(keys))
+        self.assertTrue(all(urls[s3_key] for s3_key in keys[:5]))
+        self.assertTrue(all(urls[s3_key] is None for s3_key in keys[5:]))
+        self.assertEqual(urls, again)
+        self.assertEqual(head_object.call_count, len(keys))
+
+    def test_업로드에_실패하면_예외를_던진다(self):
+        with patch.object(self.s3, 'upload_fileobj', side_effect=Exception('unavailable')):
+            with self.assertRaises(ApplicationError) as context:
+                self.image_service.upload_image('trainer', 3, io.BytesIO(b'image'), 'profile')
+
+        self.assertEqual(context.exception.status_code, 500)
+
+    def test_업로드에_실패하면_API_는_500_을_응답한다(self):
+        with patch.object(self.s3, 'upload_fileobj', side_effect=Exception('unavailable')):
+            response = self.client.post('/images', data={
+                'entity': 'trainer',
+                'entity_id': '4',
+                'category': 'profile',
+                'file': (io.BytesIO(b'image'), 'profile.png')
+            }, content_type='multipart/form-data')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json(), {'error': 'File upload failed'})
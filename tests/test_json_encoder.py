@@ -0,0 +1,77 @@
+import json
+from collections import namedtuple
+from datetime import datetime, date, time
+from decimal import Decimal
+
+from app.common.constants import DATETIMEFORMAT, CHANGE_TICKET_TYPE_CANCEL, CHANGE_TICKET_TYPE_MODIFY
+from app.common.json_encoder import dumps
+from app.utils.util_serializer import compile_serializer, serialize_rows
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory
+
+
+class JsonEncoderTestCase(BaseTestCase):
+
+    def test_날짜와_시간은_기존_응답_형식으로_인코딩된다(self):
+        value = {
+            'datetime': datetime(2024, 5, 12, 9, 30, 0, 123456),
+            'date': date(2024, 5, 12),
+            'time': time(9, 30),
+            'decimal': Decimal('1.5'),
+            'name': '트레이너'
+        }
+
+        decoded = json.loads(dumps(value))
+
+        self.assertEqual(decoded, {
+            'datetime': '2024-05-12 09:30:00',
+            'date': '2024-05-12',
+            'time': '09:30:00',
+            'decimal': 1.5,
+            'name': '트레이너'
+        })
+        self.assertEqual(datetime.strptime(decoded['datetime'], DATETIMEFORMAT), datetime(2024, 5, 12, 9, 30))
+
+    def test_컴파일된_행_변환기는_키_이름을_바꾸고_값은_그대로_둔다(self):
+        Row = namedtuple('Row', ['change_type', 'request_time'])
+        serializer = compile_serializer({'change_ticket_type': 'change_type', 'to_be_date': 'request_time'})
+        single = compile_serializer({'id': 'change_type'})
+
+        rows = [Row('MODIFY', datetime(2024, 5, 12, 9)), Row('CANCEL', None)]
+
+        self.assertEqual(serialize_rows(serializer, rows), [
+            {'change_ticket_type': 'MODIFY', 'to_be_date': datetime(2024, 5, 12, 9)},
+            {'change_ticket_type': 'CANCEL', 'to_be_date': None}
+        ])
+        self.assertEqual(single(rows[0]), {'id': 'MODIFY'})
+
+    def test_Flask가_직접_만드는_에러_응답도_JSON으로_인코딩된다(self):
+        response = self.client.get('/auth/token-type-check')
+
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertIsInstance(response.get_json(), dict)
+
+    def test_변경_티켓_목록의_날짜는_DATETIMEFORMAT_이고_취소_요청은_변경_희망_날짜가_없다(self):
+        trainer = TestDataFactory.create_trainer()
+        trainer_user = TestDataFactory.create_trainer_user(trainer=trainer)
+        TestDataFactory.create_change_ticket(TestDataFactory.create_schedule(trainer_user=trainer_user),
+                                             status='WAITING', change_type=CHANGE_TICKET_TYPE_MODIFY)
+        cancel_ticket = TestDataFactory.create_change_ticket(TestDataFactory.create_schedule(trainer_user=trainer_user),
+                                                             status='WAITING', change_type=CHANGE_TICKET_TYPE_CANCEL)
+        trainer_id = trainer.trainer_id
+        cancel_ticket_id = cancel_ticket.id
+        headers = TestDataFactory.create_trainer_auth_header(trainer_id)
+
+        response = self.client.get(f'/change-ticket/trainer/{trainer_id}?status=WAITING', headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        tickets = response.get_json()
+        self.assertEqual(len(tickets), 2)
+        for ticket in tickets:
+            datetime.strptime(ticket['as_is_date'], DATETIMEFORMAT)
+            datetime.strptime(ticket['created_at'], DATETIMEFORMAT)
+            if ticket['id'] == cancel_ticket_id:
+                self.assertIsNone(ticket['to_be_date'])
+            else:
+                self.assertEqual(ticket['change_ticket_type'], CHANGE_TICKET_TYPE_MODIFY)
+                datetime.strptime(ticket['to_be_date'], DATETIMEFORMAT)
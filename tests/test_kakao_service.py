@@ -0,0 +1,73 @@
+import unittest
+
+import requests
+import responses
+
+from app.common.constants import KAKAO_CONNECT_TIMEOUT_SECONDS, KAKAO_READ_TIMEOUT_SECONDS
+from app.common.exceptions import BadRequestError
+from app.services.service_kakao import KakaoService
+
+USER_ME_URL = 'https://kapi.kakao.com/v2/user/me'
+
+
+class KakaoServiceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.kakao_service = KakaoService()
+
+    @responses.activate
+    def test_토큰_검증과_사용자_조회를_한번의_요청으로_처리한다(self):
+        responses.get(USER_ME_URL, json={'id': 1234})
+
+        social_id = self.kakao_service.get_social_id('token')
+
+        self.assertEqual(social_id, 'kakao1234')
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(responses.calls[0].request.headers['Authorization'], 'Bearer token')
+
+    @responses.activate
+    def test_검증된_토큰은_다시_카카오를_호출하지_않는다(self):
+        responses.get(USER_ME_URL, json={'id': 1234})
+
+        self.kakao_service.get_social_id('token')
+        social_id = self.kakao_service.get_social_id('token')
+
+        self.assertEqual(social_id, 'kakao1234')
+        self.assertEqual(len(responses.calls), 1)
+        # 토큰 원문은 캐시에 남기지 않는다.
+        self.assertNotIn('token', self.kakao_service._social_ids)
+
+    @responses.activate
+    def test_유효하지_않은_토큰은_400_에러이고_캐시하지_않는다(self):
+        responses.get(USER_ME_URL, status=401, json={'code': -401})
+
+        for _ in range(2):
+            with self.assertRaises(BadRequestError) as context:
+                self.kakao_service.get_social_id('expired')
+            self.assertEqual(context.exception.message, "유효한 토큰이 아닙니다.")
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_카카오_서버_오류나_타임아웃은_재요청_안내_에러를_반환한다(self):
+        responses.get(USER_ME_URL, status=500)
+        with self.assertRaises(BadRequestError) as context:
+            self.kakao_service.get_social_id('token')
+        self.assertEqual(context.exception.message, "카카오 서비스 이상. 다시 요청해주세요.")
+
+        responses.replace(responses.GET, USER_ME_URL, body=requests.exceptions.ReadTimeout())
+        with self.assertRaises(BadRequestError) as context:
+            self.kakao_service.get_social_id('token')
+        self.assertEqual(context.exception.message, "카카오 서비스 이상. 다시 요청해주세요.")
+
+    @responses.activate
+    def test_요청에_타임아웃을_지정하고_세션을_재사용한다(self):
+        responses.get(USER_ME_URL, json={'id': 1234})
+        session = self.kakao_service.session
+
+        self.kakao_service.get_social_id('token-1')
+        self.kakao_service.get_social_id('token-2')
+
+        self.assertIs(self.kakao_service.session, session)
+        self.assertEqual(responses.calls[0].request.req_kwargs['timeout'],
+                         (KAKAO_CONNECT_TIMEOUT_SECONDS, KAKAO_READ_TIMEOUT_SECONDS))
@@ -0,0 +1,154 @@
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.common.constants import DATETIMEFORMAT, NOTIFICATION_STATUS_PENDING, NOTIFICATION_STATUS_SENT, \
+    NOTIFICATION_STATUS_FAILED, NOTIFICATION_MAX_ATTEMPTS
+from app.entities.entity_notification_outbox import NotificationOutbox
+from app.repositories.repository_notification_outbox import NotificationOutboxRepository
+from app.services.service_fcm import FcmService
+from app.services.service_notification import NotificationService
+from database import db
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory
+
+
+class UnregisteredError(Exception):
+    pass
+
+
+class FakeMessaging:
+    """firebase_admin.messaging 대신 사용하는 로컬 모듈. 토큰별로 실패를 지정할 수 있다."""
+    UnregisteredError = UnregisteredError
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.sent_batches = []
+
+    @staticmethod
+    def Notification(title, body):
+        return SimpleNamespace(title=title, body=body)
+
+    @staticmethod
+    def Message(notification, token):
+        return SimpleNamespace(notification=notification, token=token, data=None)
+
+    def send_each(self, messages):
+        self.sent_batches.append(messages)
+        responses = []
+        for message in messages:
+            exception = self.failures.get(message.token)
+            responses.append(SimpleNamespace(success=exception is None, exception=exception))
+        return SimpleNamespace(responses=responses)
+
+
+class NotificationOutboxTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.messaging = FakeMessaging()
+        self.notification_service = NotificationService(
+            notification_outbox_repository=NotificationOutboxRepository(db=db),
+            sender=FcmService(messaging_module=self.messaging)
+        )
+
+    def _enqueue(self, token, data=None):
+        outbox = self.notification_service.send_message(title='title', body='body', token=token, data=data)
+        db.session.commit()
+        return outbox
+
+    def test_스케쥴_생성시_알림은_발송되지_않고_대기열에_저장된다(self):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        trainer_fcm_token = TestDataFactory.create_trainer_fcm_token(trainer)
+        TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=1)
+        schedule_start_time = (datetime.now() + timedelta(days=1)).strftime(DATETIMEFORMAT)
+
+        response = self.client.post('/schedules', json={
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': schedule_start_time
+        })
+
+        self.assertEqual(response.status_code, 200)
+        outbox = NotificationOutbox.query.filter_by(token=trainer_fcm_token.fcm_token).one()
+        self.assertEqual(outbox.status, NOTIFICATION_STATUS_PENDING)
+        self.assertEqual(outbox.title, '수업 신청')
+        self.assertEqual(json.loads(outbox.data), {'schedule_start_time': schedule_start_time})
+
+    def test_FCM_토큰이_없는_트레이너에게는_알림을_저장하지_않고_스케쥴은_생성된다(self):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=1)
+        last_outbox_id = db.session.query(db.func.max(NotificationOutbox.notification_outbox_id)).scalar() or 0
+
+        response = self.client.post('/schedules', json={
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': (datetime.now() + timedelta(days=1)).strftime(DATETIMEFORMAT)
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(NotificationOutbox.query.filter(
+            NotificationOutbox.notification_outbox_id > last_outbox_id).count(), 0)
+
+    def test_빈_토큰은_대기열에_저장하지_않는다(self):
+        self.assertIsNone(self.notification_service.send_message(title='title', body='body', token=None))
+        self.assertIsNone(self.notification_service.send_message(title='title', body='body', token=''))
+
+    def test_FCM_토큰_최대_길이도_그대로_저장한다(self):
+        token = 't' * 500
+
+        outbox = self.notification_service.send_message(title='title', body='body', token=token)
+        db.session.flush()
+
+        self.assertEqual(outbox.token, token)
+        self.assertEqual(NotificationOutbox.token.type.length, 500)
+
+    def test_대기중인_알림을_한번에_발송한다(self):
+        outboxes = [self._enqueue(f'token-{i}', data={'schedule_id': i}) for i in range(3)]
+
+        processed = self.notification_service.dispatch_pending()
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(len(self.messaging.sent_batches), 1)
+        self.assertEqual(self.messaging.sent_batches[0][0].data, {'schedule_id': '0'})
+        for outbox in outboxes:
+            self.assertEqual(outbox.status, NOTIFICATION_STATUS_SENT)
+            self.assertEqual(outbox.attempts, 1)
+            self.assertIsNotNone(outbox.sent_at)
+        self.assertEqual(self.notification_service.dispatch_pending(), 0)
+
+    def test_발송에_실패하면_지연_후_재시도한다(self):
+        self.messaging.failures['token-retry'] = Exception('unavailable')
+        outbox = self._enqueue('token-retry')
+
+        self.notification_service.dispatch_pending()
+
+        self.assertEqual(outbox.status, NOTIFICATION_STATUS_PENDING)
+        self.assertEqual(outbox.attempts, 1)
+        self.assertGreater(outbox.next_attempt_at, datetime.utcnow())
+        # 재시도 시간 전에는 다시 발송하지 않는다.
+        self.assertEqual(self.notification_service.dispatch_pending(), 0)
+
+    def test_최대_재시도_횟수를_넘으면_실패_처리한다(self):
+        self.messaging.failures['token-fail'] = Exception('unavailable')
+        outbox = self._enqueue('token-fail')
+
+        for _ in range(NOTIFICATION_MAX_ATTEMPTS):
+            outbox.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+            self.notification_service.dispatch_pending()
+
+        self.assertEqual(outbox.status, NOTIFICATION_STATUS_FAILED)
+        self.assertEqual(outbox.attempts, NOTIFICATION_MAX_ATTEMPTS)
+        self.assertEqual(outbox.last_error, 'unavailable')
+
+    def test_삭제된_토큰은_재시도하지_않는다(self):
+        self.messaging.failures['token-unregistered'] = UnregisteredError('unregistered')
+        outbox = self._enqueue('token-unregistered')
+
+        self.notification_service.dispatch_pending()
+
+        self.assertEqual(outbox.status, NOTIFICATION_STATUS_FAILED)
+        self.assertEqual(outbox.attempts, 1)
@@ -0,0 +1,50 @@
+from app.common.query_counter import QUERY_COUNT_HEADER, QUERY_MAX_REPEAT_HEADER, QueryBudgetExceeded, \
+    fingerprint, query_budget
+from app.entities.entity_users import Users
+from database import db
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory
+
+
+class QueryCounterTestCase(BaseTestCase):
+
+    def test_요청의_쿼리_수를_응답_헤더로_내려준다(self):
+        user_id = TestDataFactory.create_user().user_id
+        headers = TestDataFactory.create_user_auth_header(user_id)
+        db.session.expire_all()
+
+        response = self.client.get(f'/users/{user_id}', headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response.headers[QUERY_COUNT_HEADER]), 0)
+        self.assertIn(QUERY_MAX_REPEAT_HEADER, response.headers)
+
+    def test_쿼리_예산을_넘으면_실패한다(self):
+        user_ids = [TestDataFactory.create_user().user_id for _ in range(3)]
+
+        with query_budget(3) as stats:
+            for user_id in user_ids:
+                Users.query.filter_by(user_id=user_id).first()
+        self.assertEqual(stats.count, 3)
+
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(2):
+                for user_id in user_ids:
+                    Users.query.filter_by(user_id=user_id).first()
+
+    def test_같은_쿼리가_반복되면_N_플러스_1_경고를_남긴다(self):
+        user_id = TestDataFactory.create_user().user_id
+        headers = TestDataFactory.create_user_auth_header(user_id)
+        db.session.expire_all()
+        self.app.config['QUERY_REPEAT_WARN_THRESHOLD'] = 1
+        try:
+            with self.assertLogs('app.common.query_counter', level='WARNING') as logs:
+                self.client.get(f'/users/{user_id}', headers=headers)
+        finally:
+            self.app.config['QUERY_REPEAT_WARN_THRESHOLD'] = 5
+
+        self.assertIn('possible N+1 query', logs.output[0])
+
+    def test_파라미터와_IN_목록이_달라도_같은_fingerprint_이다(self):
+        self.assertEqual(fingerprint('SELECT * FROM users WHERE user_id IN (%s, %s) AND age > 10'),
+                         fingerprint('SELECT *\n FROM users WHERE user_id IN (%s) AND age > 20'))
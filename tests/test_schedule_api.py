@@ -1,10 +1,15 @@
 import unittest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time
 from unittest.mock import patch
 
-from app import create_app, Users, Schedule, Trainer, TrainerUser, register_error_handlers
-from app.common.constants import SCHEDULE_CANCELLED, SCHEDULE_SCHEDULED, DATETIMEFORMAT, SCHEDULE_MODIFIED
+from sqlalchemy import func
+
+from app import create_app, Users, Schedule, Trainer, TrainerUser, register_error_handlers, TrainerDayOccupancy, \
+    NotificationOutbox
+from app.common.constants import SCHEDULE_CANCELLED, SCHEDULE_SCHEDULED, DATETIMEFORMAT, SCHEDULE_MODIFIED, \
+    DATEFORMAT
 from app.common.exceptions import BadRequestError
+from app.common.query_counter import query_budget
 from app.repositories.repository_trainer_user import TrainerUserRepository
 from database import db
 from tests import BaseTestCase
@@ -190,7 +195,7 @@ class ScheduleTestCase(BaseTestCase):
         self.assertIn("center_name", data)
         self.assertIn("center_location", data)
 
-    @patch('app.services.service_fcm.FcmService.send_message')
+    @patch('app.services.service_notification.NotificationService.send_message')
     def test_create_schedule_success(self, mock_send_message):
         # 준비
         trainer = TestDataFactory.create_trainer()
@@ -279,6 +284,99 @@ class ScheduleTestCase(BaseTestCase):
         self.assertEqual(response.status_code, 400)
         self.assertIn("Schedule is already exist", response.json['message'])
 
+    def test_변경된_스케쥴도_충돌로_확인한다(self):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        trainer_user = TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=1)
+
+        # 예약 현황(trainer_day_occupancy)에 집계되는 스케쥴은 충돌 검사에서도 시간을 차지한다.
+        modified_schedule_time = datetime.now() + timedelta(days=1)
+        modified_schedule = (ScheduleBuilder().with_trainer_user(trainer_user).with_start_time(modified_schedule_time)
+                             .with_status(SCHEDULE_MODIFIED).build())
+        self.assertTrue(modified_schedule.is_occupying())
+
+        response = self.client.post('/schedules', json={
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': modified_schedule_time.strftime(DATETIMEFORMAT)
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Schedule is already exist", response.json['message'])
+
+    @patch('app.services.service_notification.NotificationService.send_message')
+    def test_취소된_스케쥴_시간에는_다시_예약할_수_있다(self, mock_send_message):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        trainer_user = TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=1)
+
+        cancelled_schedule_time = datetime.now() + timedelta(days=1)
+        cancelled_schedule = (ScheduleBuilder().with_trainer_user(trainer_user)
+                              .with_start_time(cancelled_schedule_time).with_status(SCHEDULE_CANCELLED).build())
+        self.assertFalse(cancelled_schedule.is_occupying())
+
+        response = self.client.post('/schedules', json={
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': cancelled_schedule_time.strftime(DATETIMEFORMAT)
+        })
+
+        self.assertEqual(response.status_code, 200)
+
+    @patch('app.services.service_notification.NotificationService.send_message')
+    def test_수업시간_만큼_떨어진_스케쥴은_충돌하지_않는다(self, mock_send_message):
+        trainer = TestDataFactory.create_trainer(lesson_minutes=60)
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_fcm_token(trainer)
+        trainer_user = TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=2)
+
+        existing_schedule_time = (datetime.now() + timedelta(days=1)).replace(microsecond=0)
+        ScheduleBuilder().with_trainer_user(trainer_user).with_start_time(existing_schedule_time).build()
+
+        for request_time in [existing_schedule_time - timedelta(minutes=60),
+                             existing_schedule_time + timedelta(minutes=60)]:
+            data = {
+                'trainer_id': trainer.trainer_id,
+                'user_id': user.user_id,
+                'schedule_start_time': request_time.strftime(DATETIMEFORMAT)
+            }
+            response = self.client.post('/schedules', json=data)
+            self.assertEqual(response.status_code, 200)
+
+    @patch('app.services.service_notification.NotificationService.send_message')
+    def test_예약이_가득_찬_날짜는_트레이너_한달_스케쥴에서_제외된다(self, mock_send_message):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_fcm_token(trainer)
+        TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=1)
+
+        schedule_start_time = (datetime.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+        TestDataFactory.create_trainer_availability(trainer, week_day=schedule_start_time.weekday(),
+                                                    start_time=time(9, 0), end_time=time(11, 0),
+                                                    possible_lesson_cnt=1)
+        schedule_date = schedule_start_time.strftime(DATEFORMAT)
+        headers = TestDataFactory.create_trainer_auth_header(trainer.trainer_id)
+        month_url = f'/schedules/trainer/{trainer.trainer_id}?date={schedule_date}&type=month'
+
+        self.assertIn(schedule_date, self.client.get(month_url, headers=headers).get_json()['result'])
+
+        data = {
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': schedule_start_time.strftime(DATETIMEFORMAT)
+        }
+        self.assertEqual(self.client.post('/schedules', json=data).status_code, 200)
+        self.assertNotIn(schedule_date, self.client.get(month_url, headers=headers).get_json()['result'])
+
+        schedule = Schedule.query.filter_by(schedule_start_time=schedule_start_time).first()
+        body = {
+            "start_time": schedule_start_time.strftime(DATETIMEFORMAT),
+            "status": SCHEDULE_CANCELLED
+        }
+        response = self.client.put(f'/schedules/{schedule.schedule_id}', headers=headers, json=body)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(schedule_date, self.client.get(month_url, headers=headers).get_json()['result'])
+
     def test_create_schedule_no_lessons_left(self):
         # 준비
         trainer = TestDataFactory.create_trainer()
@@ -299,3 +397,167 @@ class ScheduleTestCase(BaseTestCase):
         # 검증
         self.assertEqual(response.status_code, 400)
         self.assertIn("There are no classes left", response.json['message'])
+
+    def _recurring_start_time(self, days=1):
+        return (datetime.now() + timedelta(days=days)).replace(hour=10, minute=0, second=0, microsecond=0)
+
+    def test_정기_수업을_한번에_신청한다(self):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        trainer_fcm_token = TestDataFactory.create_trainer_fcm_token(trainer)
+        trainer_user = TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=10)
+        start_time = self._recurring_start_time()
+        week_days = [start_time.weekday(), (start_time.weekday() + 3) % 7]
+
+        data = {
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': start_time.strftime(DATETIMEFORMAT),
+            'week_days': week_days,
+            'count': 4
+        }
+        last_outbox_id = db.session.query(func.max(NotificationOutbox.notification_outbox_id)).scalar() or 0
+        with query_budget(12):
+            response = self.client.post('/schedules/recurring', json=data)
+
+        self.assertEqual(response.status_code, 200)
+        expected_times = [start_time, start_time + timedelta(days=3),
+                          start_time + timedelta(days=7), start_time + timedelta(days=10)]
+        self.assertEqual(response.get_json()['schedule_start_times'],
+                         [expected_time.strftime(DATETIMEFORMAT) for expected_time in expected_times])
+
+        schedules = Schedule.query.filter_by(trainer_user_id=trainer_user.trainer_user_id) \
+            .order_by(Schedule.schedule_start_time).all()
+        self.assertEqual([schedule.schedule_start_time for schedule in schedules], expected_times)
+        self.assertTrue(all(schedule.schedule_status == SCHEDULE_SCHEDULED for schedule in schedules))
+        self.assertEqual(TrainerUserRepository(db=db).get(trainer_user.trainer_user_id).lesson_current_count, 6)
+
+        occupancies = TrainerDayOccupancy.query.filter_by(trainer_id=trainer.trainer_id).all()
+        self.assertEqual({occupancy.date: occupancy.booked_count for occupancy in occupancies},
+                         {expected_time.date(): 1 for expected_time in expected_times})
+
+        outboxes = NotificationOutbox.query.filter(
+            NotificationOutbox.notification_outbox_id > last_outbox_id).all()
+        self.assertEqual(len(outboxes), 1)
+        self.assertEqual(outboxes[0].title, '정기 수업 신청')
+        self.assertEqual(outboxes[0].body, f'{user.user_name}님이 정기 수업 4회를 신청하였습니다.')
+        self.assertEqual(outboxes[0].token, trainer_fcm_token.fcm_token)
+
+    def test_정기_수업은_종료일까지_신청되고_쿼리_수는_수업_수와_무관하다(self):
+        trainer = TestDataFactory.create_trainer()
+        TestDataFactory.create_trainer_fcm_token(trainer)
+        start_time = self._recurring_start_time()
+        query_counts = []
+        for weeks in (1, 8):
+            user = TestDataFactory.create_user()
+            trainer_user = TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=10)
+            # 회원마다 다른 시간으로 신청해 서로 충돌하지 않게 한다.
+            member_start_time = start_time + timedelta(hours=weeks)
+            data = {
+                'trainer_id': trainer.trainer_id,
+                'user_id': user.user_id,
+                'schedule_start_time': member_start_time.strftime(DATETIMEFORMAT),
+                'week_days': [member_start_time.weekday()],
+                'end_date': (member_start_time + timedelta(weeks=weeks - 1)).strftime(DATEFORMAT)
+            }
+            with query_budget(100) as stats:
+                response = self.client.post('/schedules/recurring', json=data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(Schedule.query.filter_by(trainer_user_id=trainer_user.trainer_user_id).count(), weeks)
+            query_counts.append(stats.count)
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_정기_수업_중_하나라도_충돌하면_아무것도_신청되지_않는다(self):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_fcm_token(trainer)
+        trainer_user = TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=10)
+        start_time = self._recurring_start_time()
+        other_user = TestDataFactory.create_user()
+        conflict_time = start_time + timedelta(weeks=2, minutes=30)
+        ScheduleBuilder().with_trainer(trainer).with_user(other_user).with_start_time(conflict_time).build()
+
+        data = {
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': start_time.strftime(DATETIMEFORMAT),
+            'week_days': [start_time.weekday()],
+            'count': 4
+        }
+        response = self.client.post('/schedules/recurring', json=data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Schedule is already exist", response.json['message'])
+        self.assertEqual(Schedule.query.filter_by(trainer_user_id=trainer_user.trainer_user_id).count(), 0)
+        self.assertEqual(TrainerUserRepository(db=db).get(trainer_user.trainer_user_id).lesson_current_count, 10)
+
+    def test_남은_수업보다_많은_정기_수업은_신청할_수_없다(self):
+        trainer = TestDataFactory.create_trainer()
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_fcm_token(trainer)
+        trainer_user = TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=3)
+        start_time = self._recurring_start_time()
+
+        data = {
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': start_time.strftime(DATETIMEFORMAT),
+            'week_days': [start_time.weekday()],
+            'count': 4
+        }
+        response = self.client.post('/schedules/recurring', json=data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("There are no classes left", response.json['message'])
+        self.assertEqual(Schedule.query.filter_by(trainer_user_id=trainer_user.trainer_user_id).count(), 0)
+
+    def test_정기_수업은_횟수와_종료일_중_하나만_지정한다(self):
+        start_time = self._recurring_start_time()
+        data = {
+            'trainer_id': 1,
+            'user_id': 1,
+            'schedule_start_time': start_time.strftime(DATETIMEFORMAT),
+            'week_days': [start_time.weekday()],
+        }
+        for extra in ({}, {'count': 2, 'end_date': start_time.strftime(DATEFORMAT)}, {'count': 53},
+                      {'count': 2, 'week_days': [7]}):
+            response = self.client.post('/schedules/recurring', json={**data, **extra})
+            self.assertEqual(response.status_code, 400, msg=extra)
+
+    def test_수업_시간이_없는_트레이너는_기본_수업_시간으로_충돌을_확인한다(self):
+        trainer = TestDataFactory.create_trainer(lesson_minutes=None)
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_fcm_token(trainer)
+        TestDataFactory.create_trainer_user(trainer, user, lesson_current_count=10)
+        start_time = self._recurring_start_time(days=5)
+
+        def post_schedule(schedule_start_time):
+            return self.client.post('/schedules', json={
+                'trainer_id': trainer.trainer_id,
+                'user_id': user.user_id,
+                'schedule_start_time': schedule_start_time.strftime(DATETIMEFORMAT)
+            })
+
+        self.assertEqual(post_schedule(start_time).status_code, 200)
+        # DEFAULT_LESSON_MINUTES(60분) 안은 충돌, 그 이후는 신청된다.
+        self.assertEqual(post_schedule(start_time + timedelta(minutes=30)).status_code, 400)
+        self.assertEqual(post_schedule(start_time + timedelta(minutes=60)).status_code, 200)
+
+        response = self.client.post('/schedules/recurring', json={
+            'trainer_id': trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': (start_time + timedelta(hours=3)).strftime(DATETIMEFORMAT),
+            'week_days': [start_time.weekday()],
+            'count': 2
+        })
+        self.assertEqual(response.status_code, 200)
+
+        schedule = Schedule.query.filter_by(schedule_start_time=start_time).first()
+        headers = TestDataFactory.create_user_auth_header(user.user_id)
+        response = self.client.put(f'/schedules/{schedule.schedule_id}', headers=headers, json={
+            'start_time': (start_time + timedelta(minutes=90)).strftime(DATETIMEFORMAT),
+            'status': SCHEDULE_MODIFIED
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('conflicts', response.get_json()['message'])
@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import event
+
+from app.common.config import get_test_database_uri
+from app.common.constants import DATETIMEFORMAT, SCHEDULE_SCHEDULED
+from app.entities.entity_schedule import Schedule
+from app.entities.entity_trainer_user import TrainerUser
+from database import db
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory
+
+
+def _begin_immediate(engine):
+    """
+    SQLite 는 SELECT ... FOR UPDATE 를 지원하지 않으므로 트랜잭션 시작부터 쓰기 잠금을 잡게 한다.
+    행 잠금보다 범위는 넓지만 "조회 - 검사 - 차감/생성" 이 한 트랜잭션 안에서 직렬화되는지는 똑같이 확인된다.
+    """
+    @event.listens_for(engine, 'connect')
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        # pysqlite 가 자체적으로 BEGIN 을 보내지 않게 하고 아래 begin 이벤트에서 직접 시작한다.
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def _emit_begin_immediate(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    # create_all 에서 이미 열린 커넥션은 위 설정이 없으므로 버린다.
+    engine.dispose()
+
+
+class ScheduleConcurrencyTestCase(BaseTestCase):
+    """
+    여러 스레드에서 동시에 예약해도 수업 횟수가 초과 차감되거나 같은 시간이 중복 예약되지 않는지 확인한다.
+    각 요청은 별도 커넥션/트랜잭션에서 실행된다.
+    MySQL 에서는 행 잠금으로, 기본 SQLite 에서는 파일 DB 와 BEGIN IMMEDIATE 로 실행한다.
+    """
+    THREAD_COUNT = 20
+    database_dir = None
+
+    @classmethod
+    def setUpClass(cls):
+        if not get_test_database_uri().startswith('sqlite'):
+            super().setUpClass()
+            return
+
+        # in-memory DB 는 모든 스레드가 커넥션 하나를 공유하므로 동시성을 확인할 수 없다.
+        cls.database_dir = tempfile.mkdtemp()
+        database_uri = 'sqlite:///' + os.path.join(cls.database_dir, 'concurrency.db')
+        with mock.patch('app.get_test_database_uri', return_value=database_uri):
+            super().setUpClass()
+        _begin_immediate(db.engine)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.database_dir:
+            db.engine.dispose()
+            cls.app_context.pop()
+            shutil.rmtree(cls.database_dir, ignore_errors=True)
+
+    def setUp(self):
+        super().setUp()
+        self.trainer = TestDataFactory.create_trainer()
+        TestDataFactory.create_trainer_fcm_token(self.trainer)
+
+    def _book_concurrently(self, bodies):
+        barrier = threading.Barrier(len(bodies))
+        status_codes = []
+        lock = threading.Lock()
+
+        def book(body):
+            client = self.app.test_client()
+            barrier.wait()
+            response = client.post('/schedules', json=body)
+            with lock:
+                status_codes.append(response.status_code)
+
+        # 테스트 세션이 트랜잭션을 잡고 있으면 요청 스레드가 잠금을 기다리게 되므로 먼저 끝낸다.
+        db.session.commit()
+        threads = [threading.Thread(target=book, args=(body,)) for body in bodies]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db.session.expire_all()
+        return status_codes
+
+    def test_남은_수업_횟수보다_많이_동시에_예약해도_초과_차감되지_않는다(self):
+        lesson_current_count = 5
+        user = TestDataFactory.create_user()
+        trainer_user = TestDataFactory.create_trainer_user(self.trainer, user,
+                                                           lesson_current_count=lesson_current_count)
+        base_time = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        bodies = [{
+            'trainer_id': self.trainer.trainer_id,
+            'user_id': user.user_id,
+            'schedule_start_time': (base_time + timedelta(hours=2 * i)).strftime(DATETIMEFORMAT)
+        } for i in range(self.THREAD_COUNT)]
+
+        status_codes = self._book_concurrently(bodies)
+
+        self.assertEqual(status_codes.count(200), lesson_current_count)
+        self.assertEqual(db.session.get(TrainerUser, trainer_user.trainer_user_id).lesson_current_count, 0)
+        self.assertEqual(Schedule.query.filter_by(trainer_user_id=trainer_user.trainer_user_id).count(),
+                         lesson_current_count)
+
+    def test_같은_시간에_동시에_예약하면_하나만_성공한다(self):
+        trainer_users = [TestDataFactory.create_trainer_user(self.trainer, TestDataFactory.create_user(),
+                                                             lesson_current_count=10)
+                         for _ in range(self.THREAD_COUNT)]
+        schedule_start_time = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=2)
+        bodies = [{
+            'trainer_id': self.trainer.trainer_id,
+            'user_id': trainer_user.user_id,
+            'schedule_start_time': schedule_start_time.strftime(DATETIMEFORMAT)
+        } for trainer_user in trainer_users]
+
+        status_codes = self._book_concurrently(bodies)
+
+        self.assertEqual(status_codes.count(200), 1)
+        self.assertEqual(Schedule.query.filter(
+            Schedule.trainer_user_id.in_([trainer_user.trainer_user_id for trainer_user in trainer_users]),
+            Schedule.schedule_status == SCHEDULE_SCHEDULED
+        ).count(), 1)
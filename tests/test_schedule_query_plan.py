@@ -0,0 +1,120 @@
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.entities.entity_schedule import Schedule
+from app.repositories.repository_schedule import ScheduleRepository
+from database import db
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory
+
+
+class ScheduleQueryPlanTestCase(BaseTestCase):
+    """
+    캘린더 조회 쿼리가 schedule 테이블을 풀스캔 하지 않는지 EXPLAIN 으로 확인한다.
+    schedule_start_time 에 함수를 씌우면 인덱스를 탈 수 없어 이 테스트가 실패한다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.repository = ScheduleRepository(db=db)
+        self.trainer = TestDataFactory.create_trainer()
+        self.user = TestDataFactory.create_user()
+        self.trainer_user = TestDataFactory.create_trainer_user(self.trainer, self.user)
+
+        # 옵티마이저가 인덱스를 선택할 만큼의 데이터를 만든다.
+        other_trainer_users = [TestDataFactory.create_trainer_user() for _ in range(5)]
+        start_time = datetime(2023, 1, 1, 9)
+        schedules = []
+        for trainer_user in [self.trainer_user] + other_trainer_users:
+            schedules.extend(Schedule(trainer_user_id=trainer_user.trainer_user_id,
+                                      schedule_start_time=start_time + timedelta(days=i, hours=i % 8),
+                                      schedule_status='SCHEDULED')
+                             for i in range(100))
+        db.session.add_all(schedules)
+        db.session.commit()
+        if db.engine.dialect.name == 'mysql':
+            db.session.execute(db.text('ANALYZE TABLE schedule, trainer_user'))
+        else:
+            db.session.execute(db.text('ANALYZE'))
+
+    def _capture_select_statements(self, query_fn):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            # 커밋 후 만료된 self.trainer 등을 다시 읽는 조회는 schedule 과 무관하므로 제외한다.
+            if statement.lstrip().upper().startswith('SELECT') and re.search(r'\bschedule\b', statement):
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            query_fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return statements
+
+    def assertScheduleNotFullScanned(self, query_fn):
+        statements = self._capture_select_statements(query_fn)
+        self.assertTrue(statements)
+
+        connection = db.session.connection()
+        for statement, parameters in statements:
+            if db.engine.dialect.name == 'sqlite':
+                self._assert_sqlite_plan(connection, statement, parameters)
+            else:
+                self._assert_mysql_plan(connection, statement, parameters)
+
+    def _assert_mysql_plan(self, connection, statement, parameters):
+        plan = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings().all()
+        schedule_rows = [row for row in plan if row['table'] == 'schedule']
+        self.assertTrue(schedule_rows, msg=f'schedule 테이블이 실행 계획에 없습니다. {statement}')
+        for row in schedule_rows:
+            self.assertNotEqual(row['type'], 'ALL', msg=f'schedule 풀스캔 발생: {statement}')
+            self.assertIsNotNone(row['key'], msg=f'schedule 인덱스 미사용: {statement}')
+
+    def _assert_sqlite_plan(self, connection, statement, parameters):
+        # detail 예: 'SEARCH schedule USING INDEX ix_... (trainer_user_id=? AND ...)', 풀스캔은 'SCAN schedule'
+        plan = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).mappings().all()
+        schedule_rows = [row['detail'] for row in plan if row['detail'].split(' ')[1:2] == ['schedule']]
+        self.assertTrue(schedule_rows, msg=f'schedule 테이블이 실행 계획에 없습니다. {statement}')
+        for detail in schedule_rows:
+            self.assertTrue(detail.startswith('SEARCH'), msg=f'schedule 풀스캔 발생: {statement}')
+            self.assertIn('INDEX', detail, msg=f'schedule 인덱스 미사용: {statement}')
+
+    def test_유저_하루_스케쥴_조회는_인덱스를_사용한다(self):
+        self.assertScheduleNotFullScanned(
+            lambda: self.repository.select_day_schedule_by_user_id(self.user.user_id, 2023, 1, 10))
+
+    def test_유저_한달_스케쥴_날짜_조회는_인덱스를_사용한다(self):
+        self.assertScheduleNotFullScanned(
+            lambda: self.repository.select_month_schedule_time_by_user_id(self.user.user_id, 2023, 2))
+
+    def test_트레이너_하루_스케쥴_조회는_인덱스를_사용한다(self):
+        self.assertScheduleNotFullScanned(
+            lambda: self.repository.select_day_schedule_by_trainer_id(self.trainer.trainer_id,
+                                                                      datetime(2023, 1, 10).date()))
+
+    def test_트레이너_기간_스케쥴_조회는_인덱스를_사용한다(self):
+        self.assertScheduleNotFullScanned(
+            lambda: self.repository.select_range_schedule_by_trainer_id(self.trainer.trainer_id,
+                                                                        datetime(2023, 1, 8).date(),
+                                                                        datetime(2023, 1, 21).date()))
+
+    def test_트레이너_일주일_스케쥴_조회는_인덱스를_사용한다(self):
+        self.assertScheduleNotFullScanned(
+            lambda: self.repository.select_week_schedule_by_trainer_id(self.trainer.trainer_id,
+                                                                       datetime(2023, 1, 8).date(),
+                                                                       datetime(2023, 1, 14).date()))
+
+    def test_트레이너_회원_한달_스케쥴_조회는_인덱스를_사용한다(self):
+        self.assertScheduleNotFullScanned(
+            lambda: self.repository.select_month_schedule_by_user_id_and_trainer_id(self.trainer.trainer_id,
+                                                                                    self.user.user_id,
+                                                                                    datetime(2023, 2, 1),
+                                                                                    datetime(2023, 3, 1)))
+
+    def test_스케쥴_충돌_조회는_인덱스를_사용한다(self):
+        self.assertScheduleNotFullScanned(
+            lambda: self.repository.select_conflict_schedule_by_trainer_id_and_time(self.trainer.trainer_id,
+                                                                                   datetime(2023, 1, 10, 10), 60))
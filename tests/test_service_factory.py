@@ -0,0 +1,41 @@
+import threading
+
+from app.services.service_factory import ServiceFactory
+from tests import BaseTestCase
+
+
+class ServiceFactoryTestCase(BaseTestCase):
+
+    def test_서비스는_워커당_한번만_생성된다(self):
+        self.assertIs(ServiceFactory.schedule_service(), ServiceFactory.schedule_service())
+        self.assertIs(ServiceFactory.change_ticket_service().schedule_service, ServiceFactory.schedule_service())
+        self.assertIs(ServiceFactory.trainer_service().image_service, ServiceFactory.image_service())
+
+    def test_s3_클라이언트는_override_한_인스턴스를_사용한다(self):
+        self.assertIs(ServiceFactory.image_service().s3, self.s3)
+
+    def test_동시에_요청해도_같은_인스턴스를_받는다(self):
+        ServiceFactory.reset()
+        ServiceFactory.override('s3_client', self.s3)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(ServiceFactory.trainer_user_service())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(len({id(service) for service in results}), 1)
+
+    def test_reset_후에는_새로운_인스턴스를_생성한다(self):
+        before = ServiceFactory.user_service()
+        ServiceFactory.reset()
+        ServiceFactory.override('s3_client', self.s3)
+
+        self.assertIsNot(before, ServiceFactory.user_service())
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.common.constants import DATETIMEFORMAT, SCHEDULE_CANCELLED, DATEFORMAT
+from app.entities.entity_change_log import ChangeLog
+from app.repositories.repository_change_log import ChangeLogRepository
+from database import db
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory
+
+
+@patch('app.services.service_notification.NotificationService.send_message')
+class SyncApiTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.trainer = TestDataFactory.create_trainer()
+        self.user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_fcm_token(self.trainer)
+        self.trainer_user = TestDataFactory.create_trainer_user(self.trainer, self.user, lesson_current_count=3)
+        self.trainer_headers = TestDataFactory.create_trainer_auth_header(self.trainer.trainer_id)
+        self.user_headers = TestDataFactory.create_user_auth_header(self.user.user_id)
+        self.trainer_sync_url = f'/sync/trainer/{self.trainer.trainer_id}'
+        self.user_sync_url = f'/sync/user/{self.user.user_id}'
+
+    def _create_schedule(self, days=1):
+        response = self.client.post('/schedules', json={
+            'trainer_id': self.trainer.trainer_id,
+            'user_id': self.user.user_id,
+            'schedule_start_time': (datetime.now() + timedelta(days=days)).strftime(DATETIMEFORMAT)
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def _sync(self, url, headers, cursor=None):
+        query = '' if cursor is None else f'?cursor={cursor}'
+        return self.client.get(f'{url}{query}', headers=headers)
+
+    def test_cursor_없이_요청하면_현재_cursor_만_반환한다(self, mock_send_message):
+        self._create_schedule()
+
+        response = self._sync(self.trainer_sync_url, self.trainer_headers)
+
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()
+        self.assertEqual(result['cursor'], db.session.query(db.func.max(ChangeLog.change_id)).scalar())
+        self.assertEqual(result['schedules'], [])
+        self.assertFalse(result['has_more'])
+
+    def test_cursor_이후_생성된_스케쥴과_남은_수업_횟수를_트레이너와_회원에게_내려준다(self, mock_send_message):
+        cursor = self._sync(self.trainer_sync_url, self.trainer_headers).get_json()['cursor']
+
+        self._create_schedule()
+
+        for url, headers in [(self.trainer_sync_url, self.trainer_headers), (self.user_sync_url, self.user_headers)]:
+            result = self._sync(url, headers, cursor).get_json()
+            self.assertEqual(len(result['schedules']), 1)
+            self.assertEqual(result['schedules'][0]['user_id'], self.user.user_id)
+            datetime.strptime(result['schedules'][0]['updated_at'], DATETIMEFORMAT)
+            self.assertEqual(result['trainer_users'][0]['lesson_current_count'], 2)
+            self.assertGreater(result['cursor'], cursor)
+
+            # 받은 cursor 로 다시 요청하면 변경이 없다.
+            again = self._sync(url, headers, result['cursor']).get_json()
+            self.assertEqual(again['schedules'], [])
+            self.assertEqual(again['cursor'], result['cursor'])
+
+    def test_cursor_를_받은_뒤_전체_조회_전에_생긴_변경도_이어서_받는다(self, mock_send_message):
+        # 문서의 순서: cursor 발급 -> (다른 요청의 쓰기) -> 전체 조회 -> cursor 부터 동기화
+        cursor = self._sync(self.user_sync_url, self.user_headers).get_json()['cursor']
+        self._create_schedule()
+        schedule_date = (datetime.now() + timedelta(days=1)).strftime(DATEFORMAT)
+        full = self.client.get(f'/schedules/user/{self.user.user_id}?date={schedule_date}&type=day',
+                               headers=self.user_headers).get_json()['result']
+        self._create_schedule(days=2)
+
+        result = self._sync(self.user_sync_url, self.user_headers, cursor).get_json()
+
+        # 전체 조회에 이미 있던 스케쥴도 다시 내려오고(현재 값이므로 무해), 그 뒤의 변경도 빠지지 않는다.
+        self.assertEqual(len(full), 1)
+        self.assertEqual(len(result['schedules']), 2)
+        self.assertIn(full[0]['schedule_id'], [schedule['schedule_id'] for schedule in result['schedules']])
+
+    def test_여러번_바뀐_스케쥴은_한번만_내려주고_삭제된_스케쥴은_id_만_내려준다(self, mock_send_message):
+        cursor = self._sync(self.user_sync_url, self.user_headers).get_json()['cursor']
+        self._create_schedule(days=1)
+        self._create_schedule(days=2)
+        cancelled_id, deleted_id = sorted(
+            schedule.schedule_id for schedule in db.session.get(type(self.trainer_user),
+                                                                self.trainer_user.trainer_user_id).schedules)
+
+        response = self.client.put(f'/schedules/{cancelled_id}', headers=self.user_headers, json={
+            'start_time': datetime.now().strftime(DATETIMEFORMAT), 'status': SCHEDULE_CANCELLED})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.delete(f'/schedules/{deleted_id}').status_code, 200)
+
+        result = self._sync(self.user_sync_url, self.user_headers, cursor).get_json()
+
+        self.assertEqual([schedule['schedule_id'] for schedule in result['schedules']], [cancelled_id])
+        self.assertEqual(result['schedules'][0]['schedule_status'], SCHEDULE_CANCELLED)
+        self.assertEqual(result['deleted']['schedules'], [deleted_id])
+        self.assertEqual(len(result['trainer_users']), 1)
+
+    def test_한번에_내려주는_변경_수를_넘으면_has_more_로_이어서_받는다(self, mock_send_message):
+        cursor = self._sync(self.trainer_sync_url, self.trainer_headers).get_json()['cursor']
+        self._create_schedule(days=1)
+        self._create_schedule(days=2)
+
+        schedule_ids = []
+        with patch('app.services.service_sync.SYNC_PAGE_SIZE', 2):
+            while True:
+                result = self._sync(self.trainer_sync_url, self.trainer_headers, cursor).get_json()
+                schedule_ids.extend(schedule['schedule_id'] for schedule in result['schedules'])
+                cursor = result['cursor']
+                if not result['has_more']:
+                    break
+
+        self.assertEqual(len(set(schedule_ids)), 2)
+
+    def test_다른_트레이너의_변경은_조회할_수_없다(self, mock_send_message):
+        other_headers = TestDataFactory.create_trainer_auth_header(self.trainer.trainer_id + 1000)
+
+        response = self._sync(self.trainer_sync_url, other_headers, 0)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_보관_기간이_지나_지워진_cursor_로_요청하면_410을_응답한다(self, mock_send_message):
+        cursor = self._sync(self.trainer_sync_url, self.trainer_headers).get_json()['cursor']
+        self._create_schedule(days=1)
+        self._create_schedule(days=2)
+
+        ChangeLogRepository(db=db).delete_before(datetime.utcnow() + timedelta(days=1))
+
+        response = self._sync(self.trainer_sync_url, self.trainer_headers, cursor)
+        self.assertEqual(response.status_code, 410)
+        # 마지막 기록은 남으므로 새로 받은 cursor 로는 이어서 받을 수 있다.
+        cursor = self._sync(self.trainer_sync_url, self.trainer_headers).get_json()['cursor']
+        self.assertEqual(self._sync(self.trainer_sync_url, self.trainer_headers, cursor).status_code, 200)
+
+    def test_운영_설정에서도_410과_401을_그대로_응답한다(self, mock_send_message):
+        # BaseTestCase 는 app.testing 을 켜서 예외를 에러 핸들러로 넘긴다. 운영처럼 끄고 확인한다.
+        self.app.testing = False
+        self.addCleanup(setattr, self.app, 'testing', True)
+        cursor = self._sync(self.trainer_sync_url, self.trainer_headers).get_json()['cursor']
+        self._create_schedule(days=1)
+        self._create_schedule(days=2)
+        ChangeLogRepository(db=db).delete_before(datetime.utcnow() + timedelta(days=1))
+
+        expired = self._sync(self.trainer_sync_url, self.trainer_headers, cursor)
+        other_owner = self._sync(self.user_sync_url, TestDataFactory.create_user_auth_header(self.user.user_id + 1000))
+
+        self.assertEqual(expired.status_code, 410)
+        self.assertIn('cursor', expired.get_json()['message'])
+        self.assertEqual(other_owner.status_code, 401)
@@ -1,5 +1,9 @@
 import requests
+from datetime import time
 
+from app.common.exceptions import BadRequestError
+from app.entities.entity_trainer_availability import TrainerAvailability
+from app.services.service_factory import ServiceFactory
 from tests import BaseTestCase
 from tests.test_data_factory import TestDataFactory
 
@@ -64,3 +68,40 @@ class TrainerTestCase(BaseTestCase):
         self.assertEqual(response.status_code, 200)
         file_data = requests.get(data['trainer_profile_img_url']).content
         self.assertEqual(file_data, b'trainer image file data')
+
+    def test_근무_요일_수정시_기존_요일은_모두_교체된다(self):
+        trainer = TestDataFactory.create_trainer()
+        TestDataFactory.create_trainer_availability(trainer=trainer, week_day=0, start_time=time(9),
+                                                    end_time=time(12), possible_lesson_cnt=3)
+        trainer_id = trainer.trainer_id
+        data = {
+            'trainer_availability': [
+                {'week_day': 1, 'start_time': '09:00', 'end_time': '18:00'},
+                {'week_day': 2, 'start_time': '12:30', 'end_time': '21:00'}
+            ]
+        }
+
+        ServiceFactory.trainer_service().update_trainer(trainer_id, data)
+
+        availabilities = TrainerAvailability.query.filter_by(trainer_id=trainer_id) \
+            .order_by(TrainerAvailability.week_day).all()
+        self.assertEqual([(a.week_day, a.start_time, a.end_time, a.possible_lesson_cnt) for a in availabilities],
+                         [(1, time(9), time(18), 9), (2, time(12, 30), time(21), 8)])
+
+    def test_근무_요일이_중복되면_기존_요일을_유지하고_에러를_반환한다(self):
+        trainer = TestDataFactory.create_trainer()
+        TestDataFactory.create_trainer_availability(trainer=trainer, week_day=0, start_time=time(9),
+                                                    end_time=time(12), possible_lesson_cnt=3)
+        trainer_id = trainer.trainer_id
+        data = {
+            'trainer_availability': [
+                {'week_day': 1, 'start_time': '09:00', 'end_time': '18:00'},
+                {'week_day': 1, 'start_time': '12:00', 'end_time': '21:00'}
+            ]
+        }
+
+        with self.assertRaises(BadRequestError):
+            ServiceFactory.trainer_service().update_trainer(trainer_id, data)
+
+        week_days = [a.week_day for a in TrainerAvailability.query.filter_by(trainer_id=trainer_id).all()]
+        self.assertEqual(week_days, [0])
@@ -0,0 +1,114 @@
+from datetime import time
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.common.cache import ReadThroughCache, RemoteCacheBackend, LocalCacheBackend
+from app.common.query_counter import query_budget
+from app.services.service_factory import ServiceFactory
+from tests import BaseTestCase
+from tests.fake_redis import FakeRedis
+from tests.test_data_factory import TestDataFactory
+
+
+class TrainerProfileCacheTestCase(BaseTestCase):
+
+    def test_트레이너_프로필은_두번째_조회부터_DB와_S3를_조회하지_않는다(self):
+        trainer = TestDataFactory.create_trainer()
+        trainer_id = trainer.trainer_id
+        trainer_service = ServiceFactory.trainer_service()
+
+        first = trainer_service.get_trainer_by_id(trainer_id)
+        with query_budget(0), \
+                patch.object(trainer_service.image_service, 'get_presigned_url') as get_presigned_url:
+            second = trainer_service.get_trainer_by_id(trainer_id)
+
+        get_presigned_url.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(trainer_service.trainer_profile_cache.stats()['hits'], 1)
+        self.assertEqual(trainer_service.trainer_profile_cache.stats()['misses'], 1)
+
+    def test_트레이너_정보를_수정하면_캐시가_무효화된다(self):
+        trainer = TestDataFactory.create_trainer(trainer_name='before')
+        trainer_id = trainer.trainer_id
+        trainer_service = ServiceFactory.trainer_service()
+        trainer_service.get_trainer_by_id(trainer_id)
+
+        trainer_service.update_trainer(trainer_id, {
+            'trainer_name': 'after',
+            'trainer_availability': [{'week_day': 1, 'start_time': '09:00', 'end_time': '12:00'}]
+        })
+        profile = trainer_service.get_trainer_by_id(trainer_id)
+
+        self.assertEqual(profile['trainer_name'], 'after')
+        self.assertEqual([(a['week_day'], a['start_time'], a['possible_lesson_cnt'])
+                          for a in profile['trainer_availability']], [(1, '09:00:00', 3)])
+        self.assertEqual(trainer_service.trainer_profile_cache.stats()['misses'], 2)
+
+    def test_트레이너_fcm_토큰을_등록하면_캐시가_무효화된다(self):
+        trainer = TestDataFactory.create_trainer()
+        trainer_id = trainer.trainer_id
+        trainer_service = ServiceFactory.trainer_service()
+        trainer_service.get_trainer_by_id(trainer_id)
+
+        trainer_service.create_trainer_fcm_token(trainer_id, SimpleNamespace(fcm_token='token'))
+        trainer_service.get_trainer_by_id(trainer_id)
+
+        self.assertEqual(trainer_service.trainer_profile_cache.stats()['misses'], 2)
+
+    def test_프로필_이미지를_올리면_캐시가_무효화된다(self):
+        trainer = TestDataFactory.create_trainer()
+        trainer_id = trainer.trainer_id
+        headers = TestDataFactory.create_trainer_auth_header(trainer_id)
+        before = self.client.get(f'/trainers/{trainer_id}', headers=headers).get_json()
+        self.client.post('/images', content_type='multipart/form-data', data={
+            'entity': 'trainer', 'entity_id': str(trainer_id), 'category': 'profile',
+            'file': (BytesIO(b'image'), 'profile.png')
+        })
+
+        after = self.client.get(f'/trainers/{trainer_id}', headers=headers).get_json()
+
+        self.assertIsNone(before['trainer_profile_img_url'])
+        self.assertIsNotNone(after['trainer_profile_img_url'])
+
+    def test_존재하지_않는_트레이너는_캐시하지_않는다(self):
+        cache = ReadThroughCache(LocalCacheBackend(maxsize=10, ttl=60))
+
+        self.assertIsNone(cache.get_or_load('1', lambda: None))
+        self.assertEqual(cache.get_or_load('1', lambda: {'trainer_id': 1}), {'trainer_id': 1})
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 2, 'hit_ratio': 0.0})
+
+    def test_캐시_통계를_주기적으로_로그에_남긴다(self):
+        cache = ReadThroughCache(LocalCacheBackend(maxsize=10, ttl=60), name='trainer_profile', stats_log_interval=0)
+
+        with self.assertLogs('app.common.cache', level='INFO') as logs:
+            cache.get_or_load('1', lambda: {'trainer_id': 1})
+            cache.get_or_load('1', lambda: {'trainer_id': 1})
+
+        self.assertIn('cache stats trainer_profile', logs.output[-1])
+        self.assertIn('hits=1 misses=1 hit_ratio=0.500', logs.output[-1])
+
+    def test_통계_로그_주기가_없으면_로그를_남기지_않는다(self):
+        cache = ReadThroughCache(LocalCacheBackend(maxsize=10, ttl=60), stats_log_interval=None)
+
+        with self.assertNoLogs('app.common.cache', level='INFO'):
+            cache.get_or_load('1', lambda: {'trainer_id': 1})
+
+    def test_공유_캐시_백엔드는_JSON으로_저장하고_TTL을_지정한다(self):
+        trainer = TestDataFactory.create_trainer()
+        TestDataFactory.create_trainer_availability(trainer=trainer, start_time=time(9), end_time=time(12))
+        trainer_id = trainer.trainer_id
+        client = FakeRedis()
+        ServiceFactory.override('trainer_profile_cache', ReadThroughCache(
+            RemoteCacheBackend(client, ttl=300, namespace='trainer_profile')))
+        trainer_service = ServiceFactory.trainer_service()
+
+        first = trainer_service.get_trainer_by_id(trainer_id)
+        with query_budget(0):
+            second = trainer_service.get_trainer_by_id(trainer_id)
+
+        self.assertEqual(first, second)
+        self.assertEqual(client.expires[f'trainer_profile:{trainer_id}'], 300)
+
+        trainer_service.invalidate_trainer_profile(trainer_id)
+        self.assertNotIn(f'trainer_profile:{trainer_id}', client.store)
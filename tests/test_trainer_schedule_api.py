@@ -1,9 +1,13 @@
 import unittest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, time
 
 from app import create_app, Trainer, TrainerUser, Users, Schedule, TrainerAvailability
-from app.common.constants import DATETIMEFORMAT
+from app.common.constants import DATETIMEFORMAT, DATEFORMAT
+from app.common.query_counter import query_budget
+from app.repositories.repository_trainer_day_occupancy import TrainerDayOccupancyRepository
+from app.services.service_factory import ServiceFactory
 from database import db
+from tests.test_data_factory import TestDataFactory, ScheduleBuilder
 
 
 class TrainerScheduleTestCase(unittest.TestCase):
@@ -21,7 +25,7 @@ class TrainerScheduleTestCase(unittest.TestCase):
         cls.client = cls.app.test_client()
 
         # Trainer 레코드 추가
-        trainer = Trainer(trainer_name='Test Trainer', trainer_email='test@example.com',
+        trainer = Trainer(trainer_social_id='kakao_trainer', trainer_name='Test Trainer', trainer_email='test@example.com',
                           trainer_gender='M', trainer_phone_number='010-0000-0000', lesson_minutes=60,
                           lesson_change_range=3)
         db.session.add(trainer)
@@ -31,8 +35,8 @@ class TrainerScheduleTestCase(unittest.TestCase):
 
         # Users, TrainingUser, Schedule 레코드 추가
         for i in range(1, 4):
-            user = Users(user_name=f'Test User {i}', user_phone_number=f'010-1020-101{i}',
-                         user_email=f'user{i}@example.com', user_login_platform='platform')  # 필드는 Users 모델에 맞게 조정
+            user = Users(user_social_id=f'kakao_user_{i}', user_name=f'Test User {i}',
+                         user_phone_number=f'010-1020-101{i}', user_email=f'user{i}@example.com')
             db.session.add(user)
             db.session.commit()
             trainer_user = TrainerUser(trainer_id=trainer.trainer_id, user_id=user.user_id)
@@ -57,12 +61,16 @@ class TrainerScheduleTestCase(unittest.TestCase):
 
         db.session.commit()
 
+        # 스케쥴을 직접 insert 했으므로 예약 현황을 다시 집계
+        TrainerDayOccupancyRepository(db=db).backfill()
+        cls.headers = TestDataFactory.create_trainer_auth_header(trainer.trainer_id)
+
     @classmethod
     def tearDownClass(cls):
         db.session.remove()
 
     def test_트레이너_한달_스케쥴_정상(self):
-        response = self.client.get('/schedules/trainer/1?date=2024-01-01&type=month')  # 예시 URL
+        response = self.client.get('/schedules/trainer/1?date=2024-01-01&type=month', headers=self.headers)  # 예시 URL
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json(),
                          {
@@ -81,7 +89,7 @@ class TrainerScheduleTestCase(unittest.TestCase):
 
     def test_트레이너_하루_스케쥴(self):
         trainer_id = 1
-        response = self.client.get(f'/schedules/trainer/{trainer_id}?date=2024-01-10&type=day')
+        response = self.client.get(f'/schedules/trainer/{trainer_id}?date=2024-01-10&type=day', headers=self.headers)
         self.assertEqual(response.get_json(),
                          {
                              'result': [
@@ -104,11 +112,62 @@ class TrainerScheduleTestCase(unittest.TestCase):
                              ]
                          })
 
+    def test_수업_시간이_없는_트레이너의_슬롯은_기본_수업_시간으로_계산한다(self):
+        trainer = TestDataFactory.create_trainer(lesson_minutes=None)
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_trainer_availability(trainer, week_day=date(2024, 1, 10).weekday(),
+                                                    start_time=time(10, 0), end_time=time(12, 0))
+        ScheduleBuilder().with_trainer(trainer).with_user(user).with_start_time(datetime(2024, 1, 10, 10, 0)).build()
+        headers = TestDataFactory.create_trainer_auth_header(trainer.trainer_id)
+
+        response = self.client.get(f'/schedules/trainer/{trainer.trainer_id}/slots?from=2024-01-10&to=2024-01-10',
+                                   headers=headers)
+        day_response = self.client.get(f'/schedules/trainer/{trainer.trainer_id}?date=2024-01-10&type=day',
+                                       headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(day_response.status_code, 200)
+        slots = {slot['time']: slot['possible'] for slot in response.get_json()['result']['2024-01-10']}
+        self.assertEqual(response.get_json()['result']['2024-01-10'], day_response.get_json()['result'])
+        # DEFAULT_LESSON_MINUTES(60분) 동안 예약 불가
+        self.assertFalse(slots['10:30'])
+        self.assertTrue(slots['11:00'])
+
     def test_트레이너_일주일_스케쥴(self):
         trainer_id = 1
-        response = self.client.get(f'/schedules/trainer/{trainer_id}?date=2024-01-07&type=week')
+        response = self.client.get(f'/schedules/trainer/{trainer_id}?date=2024-01-07&type=week', headers=self.headers)
         data = response.get_json()
         for schedule in data['result']:
             schedule_start_time = datetime.strptime(schedule['schedule_start_time'], DATETIMEFORMAT)
             self.assertTrue(datetime(2024, 1, 7) <= schedule_start_time < datetime(2024, 1, 14),
                             msg="schedule_start_time이 지정된 날짜 범위 내에 없습니다.")
+
+    def test_트레이너_기간_슬롯은_날짜별_하루_스케쥴과_같다(self):
+        trainer_id = 1
+        response = self.client.get(f'/schedules/trainer/{trainer_id}/slots?from=2024-01-07&to=2024-01-20',
+                                   headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()['result']
+        self.assertEqual(len(result), 14)
+        for i in range(14):
+            date = (datetime(2024, 1, 7) + timedelta(days=i)).strftime(DATEFORMAT)
+            day_response = self.client.get(f'/schedules/trainer/{trainer_id}?date={date}&type=day',
+                                           headers=self.headers)
+            self.assertEqual(result[date], day_response.get_json()['result'], msg=date)
+        # 근무 요일(화~목)만 슬롯이 있다.
+        self.assertEqual(result['2024-01-07'], [])
+        self.assertTrue(result['2024-01-10'])
+
+    def test_트레이너_기간_슬롯은_기간과_무관하게_쿼리_두번으로_계산한다(self):
+        schedule_service = ServiceFactory.schedule_service()
+        with query_budget(2):
+            schedule_service.get_trainer_slots(1, date(2024, 1, 7), date(2024, 1, 7))
+        with query_budget(2):
+            schedule_service.get_trainer_slots(1, date(2024, 1, 1), date(2024, 1, 31))
+
+    def test_트레이너_기간_슬롯_기간이_잘못되면_400(self):
+        for query in ['from=2024-01-10&to=2024-01-09', 'from=2024-01-01&to=2024-03-01', 'from=2024-01-01',
+                      'from=2024/01/01&to=2024-01-02']:
+            response = self.client.get(f'/schedules/trainer/1/slots?{query}', headers=self.headers)
+            self.assertEqual(response.status_code, 400, msg=query)
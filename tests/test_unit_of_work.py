@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.entities.entity_user_fcm_token import UserFcmToken
+from app.entities.entity_users import Users
+from app.repositories.repository_users import UserRepository
+from app.repositories.unit_of_work import UnitOfWork, after_commit, in_unit_of_work, transactional
+from app.services.service_factory import ServiceFactory
+from database import db
+from tests import BaseTestCase
+from tests.test_data_factory import TestDataFactory
+
+
+class UnitOfWorkTestCase(BaseTestCase):
+
+    def test_서비스_메서드는_여러번_저장해도_한번만_커밋한다(self):
+        user = TestDataFactory.create_user()
+        TestDataFactory.create_user_fcm_token(user=user, fcm_token='old-token')
+        user_id = user.user_id
+
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            ServiceFactory.user_service().create_user_fcm_token(user_id, SimpleNamespace(fcm_token='new-token'))
+
+        # 기존 토큰 삭제 + 새 토큰 생성이 하나의 커밋으로 처리된다.
+        self.assertEqual(commit.call_count, 1)
+        tokens = UserFcmToken.query.filter_by(user_id=user_id).all()
+        self.assertEqual([token.fcm_token for token in tokens], ['new-token'])
+
+    def test_예외가_발생하면_작업_단위의_변경사항은_모두_롤백된다(self):
+        repository = UserRepository(db=db)
+
+        with self.assertRaises(RuntimeError):
+            with UnitOfWork(db):
+                repository.create(Users(user_social_id='rollback', user_name='rollback'))
+                raise RuntimeError('boom')
+
+        self.assertIsNone(Users.query.filter_by(user_name='rollback').first())
+        self.assertFalse(in_unit_of_work(db))
+
+    def test_중첩된_작업_단위는_가장_바깥에서_한번만_커밋한다(self):
+        repository = UserRepository(db=db)
+
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            with UnitOfWork(db):
+                with UnitOfWork(db):
+                    repository.create(Users(user_social_id='nested', user_name='nested'))
+                self.assertEqual(commit.call_count, 0)
+                self.assertTrue(in_unit_of_work(db))
+
+        self.assertEqual(commit.call_count, 1)
+        self.assertIsNotNone(Users.query.filter_by(user_name='nested').first())
+
+    def test_after_commit_콜백은_커밋이_성공한_뒤에만_실행된다(self):
+        called = []
+
+        with UnitOfWork(db):
+            after_commit(db, lambda: called.append('committed'))
+            self.assertEqual(called, [])
+        self.assertEqual(called, ['committed'])
+
+        with self.assertRaises(RuntimeError):
+            with UnitOfWork(db):
+                after_commit(db, lambda: called.append('rolled back'))
+                raise RuntimeError('boom')
+        self.assertEqual(called, ['committed'])
+
+    def test_커밋이_실패하면_롤백하고_after_commit_콜백은_실행하지_않는다(self):
+        repository = UserRepository(db=db)
+        called = []
+
+        with patch.object(db.session, 'commit', side_effect=RuntimeError('deadlock')), \
+                patch.object(db.session, 'rollback', wraps=db.session.rollback) as rollback:
+            with self.assertRaises(RuntimeError):
+                with UnitOfWork(db):
+                    repository.create(Users(user_social_id='commit-failed', user_name='commit-failed'))
+                    after_commit(db, lambda: called.append('committed'))
+
+        self.assertEqual(rollback.call_count, 1)
+        self.assertEqual(called, [])
+        self.assertFalse(in_unit_of_work(db))
+        # 롤백되었으므로 세션을 그대로 다시 쓸 수 있다.
+        self.assertIsNone(Users.query.filter_by(user_name='commit-failed').first())
+
+    def test_작업_단위_밖에서는_after_commit_콜백이_바로_실행된다(self):
+        called = []
+        after_commit(db, lambda: called.append('now'))
+        self.assertEqual(called, ['now'])
+
+    def test_transactional_은_반환값을_그대로_돌려준다(self):
+        @transactional
+        def work():
+            self.assertTrue(in_unit_of_work(db))
+            return 'result'
+
+        self.assertEqual(work(), 'result')
+        self.assertFalse(in_unit_of_work(db))
@@ -0,0 +1,34 @@
+import unittest
+from datetime import datetime, time, timedelta
+
+from app.utils.util_slot import compute_day_slots, compute_slot_grids
+
+
+class SlotUtilTestCase(unittest.TestCase):
+
+    def test_수업_시간과_겹치는_슬롯은_예약_불가하다(self):
+        date = datetime(2024, 1, 10).date()
+        booked = [datetime(2024, 1, 10, 10), datetime(2024, 1, 10, 13, 30)]
+
+        slots = compute_day_slots(date, time(9), time(15), booked, 60, 30)
+
+        unavailable = [slot['time'] for slot in slots if not slot['possible']]
+        self.assertEqual(unavailable, ['10:00', '10:30', '13:30', '14:00'])
+        self.assertEqual(slots[0]['time'], '09:00')
+        self.assertEqual(slots[-1]['time'], '14:30')
+
+    def test_전날_늦게_시작한_수업은_다음날_슬롯을_막는다(self):
+        day1 = datetime(2024, 1, 10).date()
+        day2 = day1 + timedelta(days=1)
+        booked = [datetime(2024, 1, 10, 23, 30)]
+
+        grids = compute_slot_grids([(day2, time(0), time(2)), (day1, time(22), time(23, 59))], booked, 60, 30)
+
+        self.assertEqual([slot['possible'] for slot in grids[day1]], [True, True, True])
+        self.assertEqual([slot['possible'] for slot in grids[day2]], [False, True, True, True])
+
+    def test_예약이_없으면_모든_슬롯이_가능하다(self):
+        slots = compute_day_slots(datetime(2024, 1, 10).date(), time(9), time(10, 10), [], 60, 10)
+
+        self.assertEqual(len(slots), 7)
+        self.assertTrue(all(slot['possible'] for slot in slots))
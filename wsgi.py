@@ -0,0 +1,6 @@
+import os
+
+from app import create_app
+
+# 운영 진입점. gunicorn -c gunicorn.conf.py wsgi:app
+app = create_app(os.environ.get('env', 'prod'))